@@ -0,0 +1,614 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import videospeeder
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "videospeeder.py")
+
+# Tone bursts ("speech") and silences, in seconds, repeated to fill the clip. Every silence is longer
+# than the default --duration (2 s), so silence-based detection should recover the layout exactly.
+DENSITIES = {
+    "sparse": [(8.0, 12.0), (15.0, 6.0), (5.0, 20.0)],
+    "dense": [(3.0, 2.5), (5.0, 3.0), (2.0, 2.5), (4.0, 4.0)],
+}
+RESOLUTIONS = {
+    "360p": (640, 360),
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+}
+SUITES = {
+    "quick": {"durations": [60], "resolutions": ["360p"], "densities": ["sparse", "dense"], "parallel": [1, 2]},
+    "full": {
+        "durations": [60, 600],
+        "resolutions": ["360p", "1080p"],
+        "densities": ["sparse", "dense"],
+        "parallel": [1, 2, 4],
+    },
+}
+INTERVAL_SIZES = "10,100,1000,10000,100000,1000000"
+CASES = ("detect-vad", "detect-silence", "render-vad-json", "render-no-vad", "folder")
+RESULTS_VERSION = 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark VideoSpeeder end to end on synthetic media with a known speech layout, "
+            "and compare result files to catch regressions."
+        )
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Generate test media (if needed), run the cases and write a results file.")
+    run.add_argument("--suite", choices=sorted(SUITES), default="quick", help="Media/parallelism matrix (default: quick).")
+    run.add_argument("--durations", default=None, help="Comma-separated clip durations in seconds (overrides the suite).")
+    run.add_argument(
+        "--resolutions", default=None,
+        help=f"Comma-separated resolutions from {', '.join(RESOLUTIONS)} (overrides the suite).",
+    )
+    run.add_argument(
+        "--densities", default=None,
+        help=f"Comma-separated speech layouts from {', '.join(DENSITIES)} (overrides the suite).",
+    )
+    run.add_argument("--parallel", default=None, help="Comma-separated --parallel values for folder mode (overrides the suite).")
+    run.add_argument(
+        "--cases", default=",".join(CASES),
+        help=f"Comma-separated cases to run (default: all of {', '.join(CASES)}).",
+    )
+    run.add_argument(
+        "--vad-backend", choices=videospeeder.VAD_BACKENDS, default="torch",
+        help="VAD backend for the detect-vad case (default: torch).",
+    )
+    run.add_argument("--angles", type=int, default=4, help="Videos per folder-mode run (default: 4).")
+    run.add_argument("--repeat", type=int, default=1, help="Runs per case; the median is reported (default: 1).")
+    run.add_argument(
+        "--media-dir", default=None,
+        help="Where generated media is kept between runs (default: <videospeeder cache>/benchmark-media).",
+    )
+    run.add_argument("--out", default="benchmark-results.json", help="Results file (default: benchmark-results.json).")
+
+    compare = sub.add_parser("compare", help="Flag regressions of a results file against a baseline.")
+    compare.add_argument("baseline", help="Baseline results file.")
+    compare.add_argument("results", help="New results file.")
+    compare.add_argument(
+        "--throughput-tolerance", type=float, default=0.10,
+        help="Flag a case whose realtime factor drops by more than this fraction (default: 0.10).",
+    )
+    compare.add_argument(
+        "--memory-tolerance", type=float, default=0.20,
+        help="Flag a case whose peak RSS grows by more than this fraction (default: 0.20).",
+    )
+
+    intervals = sub.add_parser(
+        "intervals",
+        help="Check the vectorized interval functions against the loop versions and time both.",
+    )
+    intervals.add_argument(
+        "--checks", type=int, default=300,
+        help="Random inputs per function for the equivalence check (default: 300; 0 skips it).",
+    )
+    intervals.add_argument(
+        "--sizes", default=INTERVAL_SIZES,
+        help=f"Comma-separated interval counts to time (default: {INTERVAL_SIZES}; empty skips timing).",
+    )
+    intervals.add_argument("--repeat", type=int, default=3, help="Timed runs per size; the best is reported (default: 3).")
+    intervals.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    return parser.parse_args()
+
+
+def _csv(value, convert=str):
+    return [convert(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def speech_layout(density, duration):
+    """Known speech spans [(start, end), ...] of a generated clip."""
+    spans = []
+    t = 0.0
+    while t < duration:
+        for on, off in DENSITIES[density]:
+            if t >= duration:
+                break
+            spans.append((t, min(t + on, duration)))
+            t += on + off
+    return spans
+
+
+def _audio_expression(density):
+    """aevalsrc expression for one period of the layout: a 220 Hz tone with 4 Hz syllable modulation."""
+    period = sum(on + off for on, off in DENSITIES[density])
+    gates = []
+    t = 0.0
+    for on, off in DENSITIES[density]:
+        gates.append(f"between(mod(t\\,{period:g})\\,{t:g}\\,{t + on:g})")
+        t += on + off
+    # Amplitude stays above -30 dBFS while "speaking" (0.4 * 0.2 at the modulation trough).
+    return f"0.4*(0.6+0.4*sin(2*PI*4*t))*sin(2*PI*220*t)*({'+'.join(gates)})"
+
+
+def generate_media(media_dir, duration, resolution, density):
+    """Generate (once) a clip with the given layout; returns (path, layout)."""
+    width, height = RESOLUTIONS[resolution]
+    path = os.path.join(media_dir, f"bench_{duration}s_{resolution}_{density}.mp4")
+    layout = speech_layout(density, duration)
+    if os.path.isfile(path):
+        return path, layout
+    os.makedirs(media_dir, exist_ok=True)
+    tmp_path = path + ".partial.mp4"
+    cmd = [
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc2=size={width}x{height}:rate=30:duration={duration}",
+        "-f", "lavfi", "-i", f"aevalsrc={_audio_expression(density)}:s=48000:d={duration}",
+        "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p", "-g", "60",
+        "-c:a", "aac", "-b:a", "128k",
+        "-shortest", tmp_path,
+    ]
+    print(f"Generating {os.path.basename(path)} ...", file=sys.stderr)
+    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"FFmpeg media generation failed:\n{result.stderr}".rstrip())
+    os.replace(tmp_path, path)
+    return path, layout
+
+
+def layout_agreement(layout, silence_intervals, duration):
+    """Fraction of the clip on which detected silence agrees with the known layout."""
+    detected_speech = videospeeder.silence_intervals_to_speech_segments(silence_intervals, duration)
+    boundaries = sorted({0.0, float(duration)} | {t for span in layout + detected_speech for t in span})
+
+    def _is_speech(spans, t):
+        return any(s <= t < e for s, e in spans)
+
+    agreed = 0.0
+    for a, b in zip(boundaries, boundaries[1:]):
+        mid = (a + b) / 2.0
+        if _is_speech(layout, mid) == _is_speech(detected_speech, mid):
+            agreed += b - a
+    return agreed / duration if duration > 0 else 1.0
+
+
+def run_videospeeder(args, workdir):
+    """
+    Run videospeeder.py once with --metrics-json. Returns a dict with status, wall time, the
+    rusage of the whole process tree (peak RSS is the largest single process) and the metrics report.
+    """
+    metrics_path = os.path.join(workdir, "metrics.json")
+    cmd = [sys.executable, SCRIPT] + list(args) + ["--quiet", "--metrics-json", metrics_path]
+    started = time.monotonic()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    stderr = proc.stderr.read()
+    proc.stderr.close()
+    usage = None
+    if hasattr(os, "wait4"):
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    else:
+        proc.wait()
+    run = {
+        "status": "ok" if proc.returncode == 0 else "error",
+        "wall_seconds": time.monotonic() - started,
+        "peak_rss_mb": videospeeder._maxrss_mb(usage.ru_maxrss) if usage else None,
+        "user_seconds": usage.ru_utime if usage else None,
+        "system_seconds": usage.ru_stime if usage else None,
+    }
+    if proc.returncode != 0:
+        run["error"] = "\n".join(stderr.strip().splitlines()[-5:])
+    if os.path.isfile(metrics_path):
+        with open(metrics_path) as f:
+            run["metrics"] = json.load(f)
+        os.unlink(metrics_path)
+    return run
+
+
+def _stage_seconds(metrics):
+    """Wall seconds per stage, summed over the run's scopes."""
+    totals = {}
+    for scope in (metrics or {}).get("scopes", {}).values():
+        for stage, entry in scope["stages"].items():
+            totals[stage] = totals.get(stage, 0.0) + entry["wall_seconds"]
+    return totals
+
+
+def run_case(name, argv, input_seconds, repeat, workdir, prepare=None):
+    """Run one case `repeat` times and summarize it (median wall time, max peak RSS)."""
+    runs = []
+    for _ in range(repeat):
+        if prepare is not None:
+            prepare()
+        runs.append(run_videospeeder(argv, workdir))
+        if runs[-1]["status"] != "ok":
+            break
+    ok_runs = [run for run in runs if run["status"] == "ok"]
+    case = {"name": name, "input_seconds": input_seconds, "runs": len(runs)}
+    if len(ok_runs) < len(runs):
+        case.update(status="error", error=runs[-1].get("error", ""))
+        return case
+    wall = statistics.median(run["wall_seconds"] for run in ok_runs)
+    peaks = [run["peak_rss_mb"] for run in ok_runs if run["peak_rss_mb"] is not None]
+    case.update(
+        status="ok",
+        wall_seconds=wall,
+        wall_seconds_all=[run["wall_seconds"] for run in ok_runs],
+        realtime_factor=input_seconds / wall if wall > 0 else None,
+        peak_rss_mb=max(peaks) if peaks else None,
+        user_seconds=statistics.median(run["user_seconds"] for run in ok_runs) if peaks else None,
+        system_seconds=statistics.median(run["system_seconds"] for run in ok_runs) if peaks else None,
+        stages=_stage_seconds(ok_runs[-1].get("metrics")),
+    )
+    return case
+
+
+def _environment():
+    try:
+        ffmpeg_version = subprocess.run(
+            ["ffmpeg", "-version"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+        ).stdout.splitlines()[0]
+    except (OSError, IndexError):
+        ffmpeg_version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(SCRIPT),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": videospeeder.available_cpu_count(),
+        "ffmpeg": ffmpeg_version,
+        "commit": commit,
+    }
+
+
+def command_run(args):
+    suite = SUITES[args.suite]
+    durations = _csv(args.durations, int) if args.durations else suite["durations"]
+    resolutions = _csv(args.resolutions) if args.resolutions else suite["resolutions"]
+    densities = _csv(args.densities) if args.densities else suite["densities"]
+    parallel_values = _csv(args.parallel, int) if args.parallel else suite["parallel"]
+    cases = _csv(args.cases)
+    for value, known, label in ((resolutions, RESOLUTIONS, "resolution"), (densities, DENSITIES, "density"),
+                                (cases, CASES, "case")):
+        unknown = [item for item in value if item not in known]
+        if unknown:
+            print(f"Error: unknown {label}: {', '.join(unknown)}", file=sys.stderr)
+            sys.exit(2)
+    if args.repeat < 1 or args.angles < 1:
+        print("Error: --repeat and --angles must be >= 1.", file=sys.stderr)
+        sys.exit(2)
+    media_dir = args.media_dir or os.path.join(videospeeder.videospeeder_cache_dir(), "benchmark-media")
+
+    results = {
+        "version": RESULTS_VERSION,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": _environment(),
+        "cases": [],
+    }
+    for duration in durations:
+        for resolution in resolutions:
+            for density in densities:
+                try:
+                    media, layout = generate_media(media_dir, duration, resolution, density)
+                except RuntimeError as e:
+                    print(str(e), file=sys.stderr)
+                    sys.exit(1)
+                label = f"{duration}s-{resolution}-{density}"
+                with tempfile.TemporaryDirectory(prefix="vs_bench_") as workdir:
+                    for case in _run_media_cases(media, layout, duration, label, cases, parallel_values, args, workdir):
+                        results["cases"].append(case)
+                        _print_case(case)
+
+    tmp_path = args.out + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, args.out)
+    print(f"Wrote: {args.out} ({len(results['cases'])} cases)")
+
+
+def _run_media_cases(media, layout, duration, label, cases, parallel_values, args, workdir):
+    """Yield the results of every selected case on one clip."""
+    # Each clip gets its own sidecar (written next to a copy so the media cache stays clean).
+    clip = os.path.join(workdir, os.path.basename(media))
+    shutil.copyfile(media, clip)
+    sidecar = os.path.splitext(clip)[0] + ".vad.json"
+    output = os.path.join(workdir, "output.mp4")
+    layout_info = {"media": label, "speech_spans": len(layout)}
+
+    def _with_accuracy(case):
+        if case["status"] == "ok" and os.path.isfile(sidecar):
+            silence_intervals, analyzed = videospeeder.load_vad_metadata(sidecar)
+            case["layout_agreement"] = layout_agreement(layout, silence_intervals, analyzed)
+        return case
+
+    def _remove_output():
+        if os.path.exists(output):
+            os.unlink(output)
+
+    if "detect-vad" in cases:
+        # Silero doesn't classify synthetic tones as speech: this case measures throughput only.
+        yield {**layout_info, **run_case(
+            f"{label}/detect-vad", ["-i", clip, "--detect", "--vad-backend", args.vad_backend],
+            duration, args.repeat, workdir,
+        )}
+    if "detect-silence" in cases or "render-vad-json" in cases or "folder" in cases:
+        case = run_case(f"{label}/detect-silence", ["-i", clip, "--detect", "--no-vad"], duration, args.repeat, workdir)
+        if "detect-silence" in cases:
+            yield {**layout_info, **_with_accuracy(case)}
+    if "render-vad-json" in cases:
+        yield {**layout_info, **run_case(
+            f"{label}/render-vad-json", ["-i", clip, "-o", output, "--vad-json", sidecar],
+            duration, args.repeat, workdir, prepare=_remove_output,
+        )}
+    if "render-no-vad" in cases:
+        yield {**layout_info, **run_case(
+            f"{label}/render-no-vad", ["-i", clip, "-o", output, "--no-vad"],
+            duration, args.repeat, workdir, prepare=_remove_output,
+        )}
+    if "folder" in cases:
+        folder = os.path.join(workdir, "angles")
+        folder_out = os.path.join(workdir, "angles-out")
+        os.makedirs(folder, exist_ok=True)
+        for idx in range(args.angles):
+            angle = os.path.join(folder, f"angle{idx + 1:02d}.mp4")
+            try:
+                os.link(clip, angle)
+            except OSError:
+                shutil.copyfile(clip, angle)
+        for parallel in parallel_values:
+            yield {**layout_info, "angles": args.angles, **run_case(
+                f"{label}/folder-p{parallel}",
+                ["--folder", folder, "-o", folder_out, "--vad-json", sidecar,
+                 "--parallel", str(parallel), "--overwrite"],
+                duration * args.angles, args.repeat, workdir,
+            )}
+
+
+def _print_case(case):
+    if case["status"] != "ok":
+        last_line = (case.get("error") or "").strip().splitlines()[-1:] or [""]
+        print(f"  {case['name']}: ERROR {last_line[0]}".rstrip())
+        return
+    accuracy = f", layout {case['layout_agreement'] * 100:.1f}%" if "layout_agreement" in case else ""
+    peak = "" if case["peak_rss_mb"] is None else f", peak RSS {case['peak_rss_mb']:.0f} MiB"
+    print(f"  {case['name']}: {case['wall_seconds']:.2f}s, {case['realtime_factor']:.1f}x realtime{peak}{accuracy}")
+
+
+def compare_results(baseline, results, throughput_tolerance, memory_tolerance):
+    """
+    Per-case comparison rows: (name, baseline realtime factor, new realtime factor, baseline peak RSS,
+    new peak RSS, flags). A case is flagged when it slowed down or grew beyond the tolerances,
+    started failing, or lost layout accuracy.
+    """
+    previous = {case["name"]: case for case in baseline["cases"]}
+    rows = []
+    for case in results["cases"]:
+        base = previous.get(case["name"])
+        if base is None:
+            continue
+        flags = []
+        if case["status"] != "ok":
+            if base["status"] == "ok":
+                flags.append("now failing")
+            rows.append((case["name"], base.get("realtime_factor"), None, base.get("peak_rss_mb"), None, flags))
+            continue
+        if base["status"] != "ok":
+            rows.append((case["name"], None, case["realtime_factor"], None, case["peak_rss_mb"], flags))
+            continue
+        if case["realtime_factor"] < base["realtime_factor"] * (1 - throughput_tolerance):
+            flags.append(f"throughput -{(1 - case['realtime_factor'] / base['realtime_factor']) * 100:.0f}%")
+        if (case["peak_rss_mb"] is not None and base["peak_rss_mb"]
+                and case["peak_rss_mb"] > base["peak_rss_mb"] * (1 + memory_tolerance)):
+            flags.append(f"peak RSS +{(case['peak_rss_mb'] / base['peak_rss_mb'] - 1) * 100:.0f}%")
+        if case.get("layout_agreement", 1.0) < base.get("layout_agreement", 1.0) - 0.001:
+            flags.append(f"layout agreement {base['layout_agreement'] * 100:.1f}% -> {case['layout_agreement'] * 100:.1f}%")
+        rows.append((case["name"], base["realtime_factor"], case["realtime_factor"],
+                     base["peak_rss_mb"], case["peak_rss_mb"], flags))
+    return rows
+
+
+def command_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.results) as f:
+        results = json.load(f)
+    rows = compare_results(baseline, results, args.throughput_tolerance, args.memory_tolerance)
+
+    def _fmt(value, suffix):
+        return "-" if value is None else f"{value:.1f}{suffix}"
+
+    regressions = 0
+    for name, base_rt, new_rt, base_rss, new_rss, flags in rows:
+        regressions += bool(flags)
+        print(f"{'REGRESSION' if flags else 'ok':10s} {name}: {_fmt(base_rt, 'x')} -> {_fmt(new_rt, 'x')} realtime, "
+              f"peak RSS {_fmt(base_rss, ' MiB')} -> {_fmt(new_rss, ' MiB')}"
+              f"{'  [' + '; '.join(flags) + ']' if flags else ''}")
+    unmatched = len(results["cases"]) - len(rows)
+    if unmatched:
+        print(f"[info] {unmatched} case(s) have no baseline entry.", file=sys.stderr)
+    for side, data in (("baseline", baseline), ("results", results)):
+        env = data.get("environment", {})
+        print(f"{side}: commit {env.get('commit')}, {env.get('cpus')} CPUs, {env.get('ffmpeg')}", file=sys.stderr)
+    print(f"{regressions} regression(s) in {len(rows)} compared case(s).")
+    sys.exit(1 if regressions else 0)
+
+
+def random_speech(rng, count, total):
+    """
+    Detector-style speech segments: unsorted and overlapping, with some empty, reversed and
+    out-of-range ones. Bounds are rounded to 10 ms so that touching and tied segments occur.
+    """
+    segments = []
+    for _ in range(count):
+        start = rng.uniform(-1.0, total + 1.0)
+        kind = rng.random()
+        if kind < 0.05:
+            end = start
+        elif kind < 0.1:
+            end = start - rng.uniform(0.0, 1.0)
+        else:
+            end = start + rng.expovariate(1 / 1.5)
+        segments.append((round(start, 2), round(end, 2)))
+    return segments
+
+
+def random_silences(rng, count, total, invalid=False):
+    """
+    Sorted, disjoint silence intervals within [0, total] (some touching, some shorter than the
+    render buffer). With `invalid`, one interval is broken the way validate_silence_intervals checks for.
+    """
+    cuts = sorted(round(rng.uniform(0.0, total), 2) for _ in range(2 * count))
+    silences = list(zip(cuts[0::2], cuts[1::2]))
+    if silences and rng.random() < 0.3:
+        silences[-1] = (silences[-1][0], total)
+    if invalid and silences:
+        i = rng.randrange(len(silences))
+        start, end = silences[i]
+        silences[i] = rng.choice([
+            (end, start - 0.5),
+            (-0.5, end),
+            (start, total + 1.0),
+            (max(0.0, start - 5.0), end),
+        ])
+    return silences
+
+
+def _validation_error(silences, total):
+    try:
+        videospeeder.validate_silence_intervals(silences, total)
+    except ValueError as e:
+        return str(e)
+    return None
+
+
+def interval_operations(total, rng=None):
+    """
+    name -> (input generator, function) for each interval function that has a vectorized path.
+    With `rng`, the tuning parameters (merge gap, padding, tolerance, buffer) are randomized and
+    half of the silence inputs are invalid.
+    """
+    def speech(generator, count):
+        return random_speech(generator, count, total)
+
+    def silences(generator, count):
+        return random_silences(generator, count, total, invalid=rng is not None and generator.random() < 0.5)
+
+    def param(default, high):
+        return default if rng is None else rng.choice([0.0, default, round(rng.uniform(0.0, high), 2)])
+
+    merge_gap, pad, tolerance, buffer = param(0.3, 1.0), param(0.05, 0.5), param(0.1, 1.0), param(2.0, 4.0)
+    return {
+        "normalize_speech_segments": (speech, lambda items: videospeeder.normalize_speech_segments(
+            items, total, merge_gap_seconds=merge_gap, pad_seconds=pad, merge_tolerance_seconds=tolerance)),
+        "speech_segments_to_silence_intervals": (
+            speech, lambda items: videospeeder.speech_segments_to_silence_intervals(items, total)),
+        "silence_intervals_to_speech_segments": (
+            silences, lambda items: videospeeder.silence_intervals_to_speech_segments(items, total)),
+        "truncate_intervals_to_duration": (
+            silences, lambda items: videospeeder.truncate_intervals_to_duration(items, total * 0.8)),
+        "validate_silence_intervals": (silences, lambda items: _validation_error(items, total)),
+        "calculate_segments": (silences, lambda items: videospeeder.calculate_segments(items, total, buffer)),
+    }
+
+
+@contextlib.contextmanager
+def interval_path(vectorized):
+    """Force the vectorized (or the loop) path of the interval functions regardless of input size."""
+    saved = videospeeder.INTERVAL_VECTOR_MIN
+    videospeeder.INTERVAL_VECTOR_MIN = 0 if vectorized else float("inf")
+    try:
+        yield
+    finally:
+        videospeeder.INTERVAL_VECTOR_MIN = saved
+
+
+def check_interval_equivalence(checks, seed):
+    """Run every interval function on random inputs through both paths; returns a list of mismatches."""
+    mismatches = []
+    for name in interval_operations(0.0):
+        rng = random.Random(f"{seed}:{name}")
+        for check in range(checks):
+            count = rng.choice([0, 1, 2, 3, rng.randrange(4, 50), rng.randrange(50, 600)])
+            total = round(count * rng.uniform(1.0, 5.0) + rng.uniform(0.0, 5.0), 2)
+            generate, function = interval_operations(total, rng)[name]
+            items = generate(rng, count)
+            with interval_path(False):
+                expected = function(items)
+            with interval_path(True):
+                actual = function(items)
+            if actual != expected:
+                mismatches.append((name, check, count, total))
+    return mismatches
+
+
+def time_intervals(sizes, repeat, seed):
+    """Rows of (function, size, loop seconds, vectorized seconds), best of `repeat` runs each."""
+    rows = []
+    for size in sizes:
+        total = size * 3.0
+        rng = random.Random(f"{seed}:{size}")
+        for name, (generate, function) in interval_operations(total).items():
+            items = generate(rng, size)
+            timings = []
+            for vectorized in (False, True):
+                best = None
+                with interval_path(vectorized):
+                    for _ in range(max(1, repeat)):
+                        started = time.perf_counter()
+                        function(items)
+                        elapsed = time.perf_counter() - started
+                        best = elapsed if best is None else min(best, elapsed)
+                timings.append(best)
+            rows.append((name, size, timings[0], timings[1]))
+    return rows
+
+
+def command_intervals(args):
+    try:
+        videospeeder.import_numpy()
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    if args.checks > 0:
+        mismatches = check_interval_equivalence(args.checks, args.seed)
+        for name, check, count, total in mismatches[:20]:
+            print(f"MISMATCH {name}: check {check} ({count} intervals, total {total}, seed {args.seed})")
+        print(f"Equivalence: {len(mismatches)} mismatch(es) in {args.checks} random input(s) per function.")
+        if mismatches:
+            sys.exit(1)
+
+    sizes = _csv(args.sizes, int)
+    if sizes:
+        print(f"{'function':38s} {'intervals':>9s} {'loop':>10s} {'vectorized':>10s} {'speedup':>8s}")
+    for name, size, loop_seconds, vector_seconds in time_intervals(sizes, args.repeat, args.seed):
+        print(f"{name:38s} {size:9d} {loop_seconds * 1000:8.2f}ms {vector_seconds * 1000:8.2f}ms "
+              f"{loop_seconds / max(vector_seconds, 1e-9):7.1f}x")
+    if sizes:
+        print(f"The interval functions vectorize inputs of {videospeeder.INTERVAL_VECTOR_MIN}+ intervals "
+              "(videospeeder.INTERVAL_VECTOR_MIN).")
+
+
+def main():
+    args = parse_args()
+    if args.command == "run":
+        command_run(args)
+    elif args.command == "intervals":
+        command_intervals(args)
+    else:
+        command_compare(args)
+
+
+if __name__ == "__main__":
+    main()
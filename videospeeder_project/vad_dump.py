@@ -3,6 +3,7 @@
 import argparse
 import json
 import sys
+import time
 
 import videospeeder
 
@@ -27,6 +28,47 @@ def parse_args():
         default=None,
         help="Duration to analyze in seconds (default: entire file from offset).",
     )
+    parser.add_argument(
+        "--vad-workers",
+        type=int,
+        default=1,
+        help="Score audio chunks in N worker processes (default: 1).",
+    )
+    parser.add_argument(
+        "--vad-backend",
+        choices=videospeeder.VAD_BACKENDS,
+        default="torch",
+        help="VAD inference backend (default: torch).",
+    )
+    parser.add_argument(
+        "--compare-backend",
+        choices=videospeeder.VAD_BACKENDS,
+        default=None,
+        help="Also run this backend in-process and report how its speech segments agree with --vad-backend.",
+    )
+    parser.add_argument(
+        "--vad-energy-floor",
+        type=float,
+        default=None,
+        metavar="DB",
+        help="Skip inference on audio quieter than DB dBFS RMS (default: off).",
+    )
+    parser.add_argument(
+        "--compare-energy-floor",
+        type=float,
+        default=None,
+        metavar="DB",
+        help=(
+            "Also run --vad-backend in-process with an energy gate at DB dBFS and report its agreement "
+            "with full inference through silero_vad's own get_speech_timestamps (torch backend), "
+            "the fraction of audio inferred and the speedup over ungated --vad-backend."
+        ),
+    )
+    parser.add_argument(
+        "--no-vad-server",
+        action="store_true",
+        help="Run VAD in-process even if a warm VAD worker (vad_server.py) is listening.",
+    )
     parser.add_argument(
         "--format",
         choices=["json", "text"],
@@ -55,6 +97,38 @@ def _write(text, out_path):
         sys.stdout.write(text)
 
 
+def _speech_agreement(reference, candidate, total_duration):
+    """
+    Compare two normalized speech segment lists.
+    Returns exact-match flag, max boundary deviation (when counts match) and the fraction of
+    the analyzed duration on which both agree about speech vs non-speech.
+    """
+    boundaries = sorted({0.0, float(total_duration)} | {t for seg in reference + candidate for t in seg})
+
+    def _is_speech(segments, t):
+        return any(s <= t < e for s, e in segments)
+
+    agreed = 0.0
+    for a, b in zip(boundaries, boundaries[1:]):
+        mid = (a + b) / 2.0
+        if _is_speech(reference, mid) == _is_speech(candidate, mid):
+            agreed += b - a
+
+    max_boundary_delta = None
+    if len(reference) == len(candidate):
+        max_boundary_delta = max(
+            (max(abs(rs - cs), abs(re - ce)) for (rs, re), (cs, ce) in zip(reference, candidate)),
+            default=0.0,
+        )
+    return {
+        "exact_match": reference == candidate,
+        "reference_segments": len(reference),
+        "candidate_segments": len(candidate),
+        "max_boundary_delta": max_boundary_delta,
+        "agreement": (agreed / total_duration) if total_duration > 0 else 1.0,
+    }
+
+
 def main():
     args = parse_args()
     if not (0.0 <= args.vad_threshold <= 1.0):
@@ -67,13 +141,80 @@ def main():
         full_duration = videospeeder.get_video_duration(args.input)
         video_duration = max(0.0, float(full_duration) - float(args.offset))
 
+    vad_stats = {}
     speech_raw = videospeeder.detect_speech_segments_silero(
         args.input,
         vad_threshold=args.vad_threshold,
         offset=args.offset,
         process_duration=args.process_duration,
+        workers=args.vad_workers,
+        use_server=not args.no_vad_server,
+        backend=args.vad_backend,
+        energy_floor_db=args.vad_energy_floor,
+        stats=vad_stats,
     )
     speech = videospeeder.normalize_speech_segments(speech_raw, max_end=video_duration)
+
+    comparison = None
+    if args.compare_backend:
+        compare_raw = videospeeder.detect_speech_segments_silero(
+            args.input,
+            vad_threshold=args.vad_threshold,
+            offset=args.offset,
+            process_duration=args.process_duration,
+            workers=args.vad_workers,
+            use_server=False,
+            backend=args.compare_backend,
+        )
+        compare_speech = videospeeder.normalize_speech_segments(compare_raw, max_end=video_duration)
+        comparison = {
+            "backend": args.compare_backend,
+            **_speech_agreement(speech, compare_speech, video_duration),
+            "speech_segments": [{"start": s, "end": e} for s, e in compare_speech],
+        }
+    gate_comparison = None
+    if args.compare_energy_floor is not None:
+        # Reference: unmodified Silero (torch, stock segmentation, no gate). Timing baseline: ungated
+        # --vad-backend, which is the reference run itself for the torch backend.
+        runs = {}
+        for name, backend, floor_db in (
+            ("reference", "torch", None),
+            ("ungated", args.vad_backend, None),
+            ("gated", args.vad_backend, args.compare_energy_floor),
+        ):
+            if name == "ungated" and backend == "torch":
+                runs[name] = runs["reference"]
+                continue
+            stats = {}
+            started = time.perf_counter()
+            raw = videospeeder.detect_speech_segments_silero(
+                args.input,
+                vad_threshold=args.vad_threshold,
+                offset=args.offset,
+                process_duration=args.process_duration,
+                workers=args.vad_workers,
+                use_server=False,
+                backend=backend,
+                energy_floor_db=floor_db,
+                stats=stats,
+                stock_segmenter=name == "reference",
+            )
+            elapsed = time.perf_counter() - started
+            runs[name] = (videospeeder.normalize_speech_segments(raw, max_end=video_duration), stats, elapsed)
+        reference_speech = runs["reference"][0]
+        reference_seconds = runs["ungated"][2]
+        gated_speech, gated_stats, gated_seconds = runs["gated"]
+        analyzed = gated_stats.get("analyzed_seconds") or 0.0
+        gate_comparison = {
+            "energy_floor_db": args.compare_energy_floor,
+            "reference": "torch get_speech_timestamps",
+            **_speech_agreement(reference_speech, gated_speech, video_duration),
+            "inferred_fraction": (gated_stats["inferred_seconds"] / analyzed) if analyzed > 0 else 0.0,
+            "reference_seconds": reference_seconds,
+            "gated_seconds": gated_seconds,
+            "speedup": (reference_seconds / gated_seconds) if gated_seconds > 0 else None,
+        }
+
     silence_intervals = videospeeder.speech_segments_to_silence_intervals(
         speech, total_duration=video_duration
     )
@@ -91,11 +232,20 @@ def main():
         "process_duration": args.process_duration,
         "analyzed_duration": video_duration,
         "vad_threshold": args.vad_threshold,
+        "vad_backend": args.vad_backend,
+        "vad_energy_floor": args.vad_energy_floor,
         "speech_segments": [{"start": s, "end": e} for s, e in speech],
         "non_speech_intervals": [{"start": s, "end": e} for s, e in silence_intervals],
         "pipeline_segments": [{"start": s, "end": e, "type": t} for s, e, t in segments],
     }
 
+    if comparison is not None:
+        payload["backend_comparison"] = comparison
+    if args.vad_energy_floor is not None and vad_stats.get("analyzed_seconds"):
+        payload["vad_inferred_fraction"] = vad_stats["inferred_seconds"] / vad_stats["analyzed_seconds"]
+    if gate_comparison is not None:
+        payload["energy_gate_comparison"] = gate_comparison
+
     if args.at is not None:
         at = float(args.at)
         hit_idx = None
@@ -124,6 +274,34 @@ def main():
     lines.append(f"process_duration: {args.process_duration}")
     lines.append(f"analyzed_duration: {video_duration}")
     lines.append(f"vad_threshold: {args.vad_threshold}")
+    lines.append(f"vad_backend: {args.vad_backend}")
+    if comparison is not None:
+        delta = comparison["max_boundary_delta"]
+        lines.append(
+            f"compare_backend: {comparison['backend']} "
+            f"(exact_match={comparison['exact_match']}, "
+            f"segments={comparison['reference_segments']}/{comparison['candidate_segments']}, "
+            f"max_boundary_delta={'n/a' if delta is None else f'{delta:.3f}'}, "
+            f"agreement={comparison['agreement'] * 100:.2f}%)"
+        )
+    if "vad_inferred_fraction" in payload:
+        lines.append(
+            f"vad_energy_floor: {args.vad_energy_floor} dB "
+            f"(inferred {payload['vad_inferred_fraction'] * 100:.1f}% of audio)"
+        )
+    if gate_comparison is not None:
+        delta = gate_comparison["max_boundary_delta"]
+        speedup = gate_comparison["speedup"]
+        lines.append(
+            f"compare_energy_floor: {gate_comparison['energy_floor_db']} dB vs {gate_comparison['reference']} "
+            f"(exact_match={gate_comparison['exact_match']}, "
+            f"segments={gate_comparison['reference_segments']}/{gate_comparison['candidate_segments']}, "
+            f"max_boundary_delta={'n/a' if delta is None else f'{delta:.3f}'}, "
+            f"agreement={gate_comparison['agreement'] * 100:.2f}%, "
+            f"inferred={gate_comparison['inferred_fraction'] * 100:.1f}%, "
+            f"time={gate_comparison['reference_seconds']:.2f}s -> {gate_comparison['gated_seconds']:.2f}s"
+            f"{'' if speedup is None else f', speedup={speedup:.2f}x'})"
+        )
     lines.append("")
     lines.append("speech_segments:")
     for seg in payload["speech_segments"]:
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import time
+
+import videospeeder
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description=(
+            "Warm Silero VAD worker: keeps torch and the model loaded and serves detection jobs "
+            "to videospeeder.py and vad_dump.py over a Unix socket."
+        )
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help=(
+            "Socket path (default: $VIDEOSPEEDER_VAD_SOCKET, else "
+            "<tmpdir>/videospeeder-vad-<uid>.sock)."
+        ),
+    )
+    parser.add_argument(
+        "--vad-backend",
+        choices=videospeeder.VAD_BACKENDS,
+        default="torch",
+        help="Backend to preload (default: torch). Jobs for other backends load them on first use.",
+    )
+    return parser.parse_args()
+
+
+def _socket_in_use(path):
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(1.0)
+        probe.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def handle_job(job):
+    """
+    Run one request and return the reply payload.
+    Jobs are newline-delimited JSON objects with an "op" field:
+    - {"op": "ping"}
+    - {"op": "detect", "input": ..., "vad_threshold": ..., "offset": ..., "process_duration": ..., ...}
+      (keyword arguments of detect_speech_segments_silero)
+    """
+    op = job.get("op")
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid()}
+    if op != "detect":
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    started = time.monotonic()
+    stats = {}
+    segments = videospeeder.detect_speech_segments_silero(
+        job["input"],
+        vad_threshold=job["vad_threshold"],
+        offset=job.get("offset", 0.0),
+        process_duration=job.get("process_duration"),
+        sample_rate=job.get("sample_rate", 16000),
+        chunk_seconds=job.get("chunk_seconds", 30.0),
+        overlap_seconds=job.get("overlap_seconds", 1.0),
+        min_speech_duration_ms=job.get("min_speech_duration_ms", 200),
+        min_silence_duration_ms=job.get("min_silence_duration_ms", 100),
+        speech_pad_ms=job.get("speech_pad_ms", 50),
+        workers=job.get("workers", 1),
+        use_server=False,
+        backend=job.get("backend", "torch"),
+        return_probs=job.get("return_probs", False),
+        energy_floor_db=job.get("energy_floor_db"),
+        stats=stats,
+    )
+    reply = {"ok": True}
+    if stats:
+        reply["stats"] = stats
+    if job.get("return_probs"):
+        segments, track = segments
+        reply["probabilities"] = videospeeder.encode_probability_track(track)
+    print(
+        f"[vad-server] {job['input']} ({job.get('backend', 'torch')}, offset={job.get('offset', 0.0)}, "
+        f"duration={job.get('process_duration')}): {len(segments)} segments "
+        f"in {time.monotonic() - started:.2f}s",
+        file=sys.stderr,
+    )
+    reply["segments"] = [[start, end] for start, end in segments]
+    return reply
+
+
+class VadRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            reply = handle_job(json.loads(line.decode("utf-8")))
+        except Exception as e:
+            reply = {"ok": False, "error": str(e)}
+        self.wfile.write((json.dumps(reply) + "\n").encode("utf-8"))
+
+
+def main():
+    args = parse_args()
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: the warm VAD worker requires Unix domain sockets.", file=sys.stderr)
+        sys.exit(1)
+
+    socket_path = args.socket or videospeeder.vad_server_socket_path()
+    if not socket_path:
+        print(
+            f"Error: no socket path (${videospeeder.VAD_SERVER_SOCKET_ENV} is empty); pass --socket.",
+            file=sys.stderr,
+        )
+        sys.exit(2)
+    if os.path.exists(socket_path):
+        if _socket_in_use(socket_path):
+            print(f"Error: a VAD worker is already listening on {socket_path}", file=sys.stderr)
+            sys.exit(1)
+        os.unlink(socket_path)
+
+    try:
+        videospeeder.get_vad_backend(args.vad_backend)
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+
+    # Jobs are served one at a time: they share the single loaded model.
+    server = socketserver.UnixStreamServer(socket_path, VadRequestHandler)
+    os.chmod(socket_path, 0o600)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print(f"[vad-server] {args.vad_backend} model loaded, listening on {socket_path}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    main()
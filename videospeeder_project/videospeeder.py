@@ -1,9 +1,12 @@
 #!/usr/bin/env python3
 
 import argparse
+import contextlib
+import itertools
 import os
 import shutil
 import sys
+import threading
 
 try:
     from tqdm import tqdm
@@ -25,58 +28,32 @@ def probe_and_print_video_stats(input_file):
     """
     Probes the input video and prints a colored, icon-enhanced summary using rich.
     """
-    import subprocess
-    import json
-
     if Console is None or Table is None or Panel is None or box is None:
         print("[warn] rich is not installed; skipping formatted input stats.")
         return
 
     console = Console()
-    # ffprobe command to get video and audio stream info
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration:stream=index,codec_name,codec_type,width,height,avg_frame_rate,channels,sample_rate,bit_rate",
-        "-of", "json",
-        input_file
-    ]
-    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if result.returncode != 0:
-        console.print(f"[bold red]❌ ffprobe failed:[/bold red] {result.stderr}")
+    try:
+        media = probe_media(input_file)
+    except RuntimeError as e:
+        console.print(f"[bold red]❌ {e}[/bold red]")
         return
-    info = json.loads(result.stdout)
-    duration = float(info["format"].get("duration", 0))
-    streams = info.get("streams", [])
-
-    # Prepare stats
-    video_streams = [s for s in streams if s.get("codec_type") == "video"]
-    audio_streams = [s for s in streams if s.get("codec_type") == "audio"]
+    duration = media["duration"] or 0.0
 
     # Video info
-    if video_streams:
-        v = video_streams[0]
-        v_codec = v.get("codec_name", "?")
-        width = v.get("width", "?")
-        height = v.get("height", "?")
-        fps = v.get("avg_frame_rate", "0/0")
-        try:
-            if "/" in fps:
-                num, den = map(float, fps.split("/"))
-                fps_val = num / den if den != 0 else 0
-            else:
-                fps_val = float(fps)
-        except Exception:
-            fps_val = 0
+    if media["video_codec"] is not None:
+        v_codec = media["video_codec"]
+        width = media["width"] or "?"
+        height = media["height"] or "?"
+        fps_val = media["fps"] or 0
     else:
         v_codec = width = height = fps_val = "?"
 
     # Audio info
-    if audio_streams:
-        a = audio_streams[0]
-        a_codec = a.get("codec_name", "?")
-        channels = a.get("channels", "?")
-        sample_rate = a.get("sample_rate", "?")
+    if media["audio_codec"] is not None:
+        a_codec = media["audio_codec"]
+        channels = media["channels"] or "?"
+        sample_rate = media["sample_rate"] or "?"
     else:
         a_codec = channels = sample_rate = "?"
 
@@ -110,6 +87,16 @@ def parse_args():
         "--duration", "-d", type=float, default=2,
         help="Minimum silence duration in seconds (default: 2)."
     )
+    parser.add_argument(
+        "--silence-backend", choices=SILENCE_BACKENDS, default="ffmpeg",
+        help="Silence detector for --no-vad: 'ffmpeg' runs FFmpeg silencedetect (default); 'energy' "
+             "applies the same --threshold/--duration rules in-process with NumPy on streamed 16 kHz PCM."
+    )
+    parser.add_argument(
+        "--silence-shards", type=int, default=1, metavar="K",
+        help="Split --no-vad silence detection into K overlapping time ranges analyzed concurrently and "
+             "stitched back together (default: 1). Ranges are at least 60 s long."
+    )
     def _float_0_1(value):
         try:
             parsed = float(value)
@@ -136,6 +123,15 @@ def parse_args():
         "--detect", action="store_true",
         help="Run detection only: write a .vad.json sidecar file and exit without processing video."
     )
+    parser.add_argument(
+        "--sidecar-format", choices=["json", "bin"], default="json",
+        help="Sidecar format written by --detect/--vad-master: .vad.json (default) or compact "
+             "memory-mappable .vad.bin. Both are accepted by --vad-json."
+    )
+    parser.add_argument(
+        "--convert-sidecar", type=str, default=None, metavar="PATH",
+        help="Convert a sidecar between .vad.json and .vad.bin (next to PATH) and exit."
+    )
     parser.add_argument(
         "--quiet", action="store_true",
         help="Suppress verbose output (stats, intervals, filtergraph). Keep progress bar and summary."
@@ -144,6 +140,55 @@ def parse_args():
         "--vad-threshold", type=_float_0_1, default=0.75,
         help="VAD speech probability threshold in [0.0, 1.0] (default: 0.75). Higher rejects more keyboard noise."
     )
+    parser.add_argument(
+        "--vad-min-speech-ms", type=int, default=200, metavar="MS",
+        help="Drop VAD speech segments shorter than MS milliseconds (default: 200)."
+    )
+    parser.add_argument(
+        "--vad-min-silence-ms", type=int, default=100, metavar="MS",
+        help="End a VAD speech segment only after MS milliseconds of non-speech (default: 100)."
+    )
+    parser.add_argument(
+        "--vad-speech-pad-ms", type=int, default=50, metavar="MS",
+        help="Padding added around each VAD speech segment by the detector, in ms (default: 50)."
+    )
+    parser.add_argument(
+        "--vad-merge-gap", type=float, default=0.3, metavar="SECONDS",
+        help="Merge speech segments separated by at most SECONDS (default: 0.3)."
+    )
+    parser.add_argument(
+        "--vad-pad", type=float, default=0.05, metavar="SECONDS",
+        help="Pad merged speech segments by SECONDS on each side (default: 0.05)."
+    )
+    parser.add_argument(
+        "--vad-energy-floor", type=float, default=None, metavar="DB",
+        help="Skip VAD inference on audio quieter than DB dBFS RMS (e.g. -60), marking it non-speech. "
+             "Default: off (every window is scored)."
+    )
+    parser.add_argument(
+        "--retune", action="store_true",
+        help="Recompute speech/silence from the probabilities stored in a v2 sidecar with the current "
+             "--vad-threshold/--vad-* settings instead of running VAD. Use with --vad-json, or with "
+             "--detect to rewrite the input's sidecar."
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="With --detect: reuse the VAD work recorded in the input's existing sidecar and only analyze "
+             "audio after it (for recordings that are still growing). Runs a full detection if there is none."
+    )
+    parser.add_argument(
+        "--vad-workers", type=int, default=1, metavar="N",
+        help="Score VAD audio chunks in N worker processes (default: 1). Output is identical to N=1."
+    )
+    parser.add_argument(
+        "--vad-backend", choices=VAD_BACKENDS, default="torch",
+        help="VAD inference backend (default: torch). 'onnx' runs the Silero ONNX model with onnxruntime "
+             "on CPU without importing torch; 'onnx-int8' uses an int8-quantized copy of it."
+    )
+    parser.add_argument(
+        "--no-vad-server", action="store_true",
+        help="Always run VAD in-process, even if a warm VAD worker (vad_server.py) is listening."
+    )
     parser.add_argument(
         "--indicator", action="store_true",
         help="Show '>>' indicator during sped-up segments."
@@ -184,13 +229,88 @@ def parse_args():
         "--extensions", type=str, default="mp4,mkv,mov,avi,webm",
         help="Comma-separated video file extensions for folder mode (default: mp4,mkv,mov,avi,webm)."
     )
+    def _parallel(value):
+        if value == "auto":
+            return value
+        try:
+            return int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError("must be 'auto' or an integer")
     parser.add_argument(
-        "--parallel", type=int, default=1, metavar="N",
+        "--parallel", type=_parallel, default=1, metavar="N",
         help="Process N videos simultaneously in folder mode (default: 1). "
-             "With --gpu, each video uses one NVENC session. Consumer GPUs support ~8-12 concurrent sessions."
+             "With --gpu, each video uses one NVENC session. Consumer GPUs support ~8-12 concurrent sessions. "
+             "'auto' starts with one job and adds or removes jobs while watching aggregate throughput, "
+             "system load and available memory."
+    )
+    parser.add_argument(
+        "--metrics-json", default=None, metavar="PATH",
+        help="Write per-stage wall/CPU time and peak RSS, child-process (FFmpeg/ffprobe) resource usage "
+             "and derived throughput (realtime factor, VAD windows/s) to PATH when the run ends. "
+             "Folder mode reports each video separately."
+    )
+    parser.add_argument(
+        "--cpu-affinity", action="store_true",
+        help="With --parallel: pin each concurrent FFmpeg to its own disjoint set of CPUs (Linux)."
+    )
+    parser.add_argument(
+        "--timeline", action="store_true",
+        help="Render with a single-pass timeline filter (one timestamp remap per stream) instead of "
+             "one trim/concat branch per segment. Graph size and memory stay flat for long inputs."
+    )
+    def _ff_fps(value):
+        if value == "source":
+            return value
+        try:
+            parsed = float(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError("must be 'source' or a positive number")
+        if parsed <= 0:
+            raise argparse.ArgumentTypeError("must be 'source' or a positive number")
+        return parsed
+    parser.add_argument(
+        "--ff-fps", type=_ff_fps, default="source", metavar="FPS",
+        help="Output frame rate for sped-up segments: 'source' (match input, default) or a number. "
+             "Extra frames are dropped before encoding, so cost follows output duration "
+             "(with --timeline the rate applies to the whole output)."
+    )
+    parser.add_argument(
+        "--smart-render", action="store_true",
+        help="Stream-copy keyframe-aligned normal-speed ranges and re-encode only sped-up segments "
+             "and boundary slivers (h264/hevc inputs). Keyframe index is cached next to the input."
+    )
+    parser.add_argument(
+        "--smart-render-workers", type=int, default=None, metavar="N",
+        help="FFmpeg jobs --smart-render runs at once (default: number of CPUs; with --gpu at most "
+             f"{PARALLEL_AUTO_GPU_CEILING}, to stay within NVENC session limits)."
+    )
+    parser.add_argument(
+        "--chunks", type=int, default=1, metavar="N",
+        help="Split a single input into N time-contiguous chunks encoded by parallel FFmpeg workers, "
+             "then join them losslessly; the audio is encoded once over the whole timeline "
+             "(default: 1). With --gpu, each chunk uses one NVENC session."
+    )
+    parser.add_argument(
+        "--follow", action="store_true",
+        help="Tail a recording that is still growing: run VAD incrementally and render finalized regions "
+             "as HLS parts into the -o directory (index.m3u8), until the input stops growing."
+    )
+    parser.add_argument(
+        "--follow-interval", type=float, default=5.0, metavar="SECONDS",
+        help="With --follow: seconds between polls of the input (default: 5)."
+    )
+    parser.add_argument(
+        "--follow-idle", type=float, default=30.0, metavar="SECONDS",
+        help="With --follow: finish once the input has not grown for SECONDS (default: 30)."
+    )
+    parser.add_argument(
+        "--follow-part-seconds", type=float, default=6.0, metavar="SECONDS",
+        help="With --follow: target output duration of each HLS part (default: 6)."
     )
     return parser.parse_args()
 
+MAX_VIDEO_SPEED = 1000.0  # Cap for setpts
+
 def compute_silent_speed(segment_duration):
     target_duration = 4.0
     min_duration_for_variable_speed = 10.0
@@ -225,111 +345,772 @@ def import_vad_dependencies():
 
     return torch, load_silero_vad, get_speech_timestamps
 
-def get_video_duration(input_file):
+METRICS_VERSION = 1
+_METRICS = None  # Active recorder while --metrics-json is set (see start_metrics)
+_METRICS_LOCAL = threading.local()  # Per-thread metrics scope (the video being processed)
+_METRICS_DISABLED = contextlib.nullcontext()
+
+def start_metrics():
+    """Start recording stage timings and child-process resource usage for this run."""
+    global _METRICS
+    import time
+
+    _METRICS = {
+        "lock": threading.Lock(),
+        "started": time.monotonic(),
+        "started_cpu": time.process_time(),
+        "started_at": time.time(),
+        "scopes": {},
+        "spawned": {},  # pid -> (label, spawn time), until the child is reaped
+    }
+    return _METRICS
+
+def _maxrss_mb(maxrss):
+    """ru_maxrss in MiB (the field is KiB on Linux, bytes on macOS)."""
+    return maxrss / (2 ** 20 if sys.platform == "darwin" else 1024)
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not on Windows
+        return None
+    return _maxrss_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+def _metrics_scope_record(now):
+    """Record for the calling thread's scope; call with the metrics lock held."""
+    name = getattr(_METRICS_LOCAL, "scope", None) or "run"
+    scope = _METRICS["scopes"].get(name)
+    if scope is None:
+        scope = _METRICS["scopes"][name] = {"first": now, "last": now, "stages": {}, "counters": {}, "children": []}
+    scope["last"] = max(scope["last"], now)
+    return scope
+
+@contextlib.contextmanager
+def metrics_scope(name):
+    """Attribute metrics recorded by this thread inside the block to `name` (e.g. one video in folder mode)."""
+    import time
+
+    previous = getattr(_METRICS_LOCAL, "scope", None)
+    _METRICS_LOCAL.scope = name
+    try:
+        if _METRICS is not None:
+            with _METRICS["lock"]:
+                _metrics_scope_record(time.monotonic())  # The scope's wall time starts here
+        yield
+    finally:
+        if _METRICS is not None:
+            with _METRICS["lock"]:
+                _metrics_scope_record(time.monotonic())
+        _METRICS_LOCAL.scope = previous
+
+def metrics_add_time(stage, wall_seconds, thread_cpu_seconds=None):
+    """Add one timed occurrence of `stage` to the current scope (no-op unless metrics are on)."""
+    if _METRICS is None:
+        return
+    import time
+
+    peak_rss = _peak_rss_mb()
+    now = time.monotonic()
+    with _METRICS["lock"]:
+        stages = _metrics_scope_record(now)["stages"]
+        entry = stages.setdefault(stage, {"count": 0, "wall_seconds": 0.0, "thread_cpu_seconds": 0.0, "peak_rss_mb": None})
+        entry["count"] += 1
+        entry["wall_seconds"] += wall_seconds
+        if thread_cpu_seconds is not None:
+            entry["thread_cpu_seconds"] += thread_cpu_seconds
+        if peak_rss is not None:
+            entry["peak_rss_mb"] = max(entry["peak_rss_mb"] or 0.0, peak_rss)
+
+def metrics_stage(stage):
+    """
+    Context manager timing a block as `stage`: wall time, CPU time of the calling thread, and the
+    process's peak RSS when the block ends. Repeated blocks accumulate.
+    """
+    if _METRICS is None:
+        return _METRICS_DISABLED
+    return _timed_stage(stage)
+
+@contextlib.contextmanager
+def _timed_stage(stage):
+    import time
+
+    started, started_cpu = time.monotonic(), time.thread_time()
+    try:
+        yield
+    finally:
+        metrics_add_time(stage, time.monotonic() - started, time.thread_time() - started_cpu)
+
+def timed_stage(stage):
+    """Decorator recording every call of the function as `stage` (see metrics_stage)."""
+    import functools
+
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _METRICS is None:
+                return func(*args, **kwargs)
+            with _timed_stage(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def metrics_count(counter, amount):
+    """Add `amount` to a counter of the current scope (input seconds, VAD windows, ...)."""
+    if _METRICS is None:
+        return
+    import time
+
+    with _METRICS["lock"]:
+        counters = _metrics_scope_record(time.monotonic())["counters"]
+        counters[counter] = counters.get(counter, 0) + amount
+
+def spawn_child(cmd, label, **popen_kwargs):
+    """
+    subprocess.Popen(cmd, **popen_kwargs), registered so that wait_child can attribute the child's
+    resource usage to `label` ("ffprobe", "ffmpeg-render", ...) when metrics are on.
+    """
+    import subprocess
+    import time
+
+    proc = subprocess.Popen(cmd, **popen_kwargs)
+    if _METRICS is not None:
+        with _METRICS["lock"]:
+            _METRICS["spawned"][proc.pid] = (label, time.monotonic(), getattr(_METRICS_LOCAL, "scope", None))
+    return proc
+
+def wait_child(proc):
+    """
+    Wait for a child started by spawn_child and return its exit code. With metrics on (and os.wait4
+    available), the child is reaped with wait4 and its rusage recorded.
     """
-    Uses ffprobe to get the duration of the input video in seconds.
+    if _METRICS is None or not hasattr(os, "wait4") or proc.returncode is not None:
+        return proc.wait()
+    import time
+
+    with _METRICS["lock"]:
+        label, spawned, scope = _METRICS["spawned"].pop(proc.pid, ("child", None, None))
+    try:
+        _, status, usage = os.wait4(proc.pid, 0)
+    except ChildProcessError:
+        return proc.wait()
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    now = time.monotonic()
+    record = {
+        "label": label,
+        "program": os.path.basename(proc.args[0]) if isinstance(proc.args, (list, tuple)) else str(proc.args),
+        "pid": proc.pid,
+        "exit_code": proc.returncode,
+        "wall_seconds": now - spawned if spawned is not None else None,
+        "user_seconds": usage.ru_utime,
+        "system_seconds": usage.ru_stime,
+        "peak_rss_mb": _maxrss_mb(usage.ru_maxrss),
+    }
+    previous = getattr(_METRICS_LOCAL, "scope", None)
+    _METRICS_LOCAL.scope = scope
+    try:
+        with _METRICS["lock"]:
+            _metrics_scope_record(now)["children"].append(record)
+    finally:
+        _METRICS_LOCAL.scope = previous
+    return proc.returncode
+
+def run_child(cmd, label, text=True):
+    """
+    Equivalent of subprocess.run(cmd, stdout=PIPE, stderr=PIPE, text=text) whose child is reaped by
+    wait_child, so its rusage is recorded when metrics are on.
     """
     import subprocess
+
+    proc = spawn_child(cmd, label, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=text)
+    stderr_parts = []
+    stderr_thread = threading.Thread(target=lambda: stderr_parts.append(proc.stderr.read()), daemon=True)
+    stderr_thread.start()
+    stdout = proc.stdout.read()
+    stderr_thread.join()
+    proc.stdout.close()
+    proc.stderr.close()
+    wait_child(proc)
+    return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr_parts[0] if stderr_parts else stdout[:0])
+
+def _scope_derived_metrics(scope):
+    """Realtime factors and VAD throughput derived from a scope's stages and counters."""
+    stages, counters = scope["stages"], scope["counters"]
+    def wall(*names):
+        return sum(stages[name]["wall_seconds"] for name in names if name in stages)
+    def ratio(numerator, denominator):
+        return numerator / denominator if numerator and denominator else None
+    input_seconds = counters.get("input_seconds")
+    return {
+        "realtime_factor": ratio(input_seconds, scope["last"] - scope["first"]),
+        "encode_realtime_factor": ratio(input_seconds, wall("ffmpeg_startup", "encoding")),
+        "vad_windows_per_second": ratio(counters.get("vad_windows"), wall("vad_inference")),
+        "vad_audio_realtime_factor": ratio(counters.get("vad_audio_seconds"), wall("vad_inference")),
+        "silence_detection_realtime_factor": ratio(counters.get("silence_audio_seconds"), wall("silence_detection")),
+    }
+
+def metrics_report(mode, argv=None):
+    """The recorded metrics as a JSON-serializable dict."""
+    import time
+
+    with _METRICS["lock"]:
+        scopes = {}
+        for name, scope in _METRICS["scopes"].items():
+            scopes[name] = {
+                "wall_seconds": scope["last"] - scope["first"],
+                "stages": {stage: dict(entry) for stage, entry in scope["stages"].items()},
+                "counters": dict(scope["counters"]),
+                "derived": _scope_derived_metrics(scope),
+                "children": list(scope["children"]),
+            }
+    report = {
+        "version": METRICS_VERSION,
+        "mode": mode,
+        "argv": list(sys.argv if argv is None else argv),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S%z", time.localtime(_METRICS["started_at"])),
+        "wall_seconds": time.monotonic() - _METRICS["started"],
+        "process_cpu_seconds": time.process_time() - _METRICS["started_cpu"],
+        "peak_rss_mb": _peak_rss_mb(),
+        "scopes": scopes,
+    }
+    try:
+        import resource
+
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        # All reaped children, including VAD worker processes not spawned through spawn_child.
+        report["children_total"] = {
+            "user_seconds": children.ru_utime,
+            "system_seconds": children.ru_stime,
+            "peak_rss_mb": _maxrss_mb(children.ru_maxrss),
+        }
+    except ImportError:  # pragma: no cover
+        pass
+    return report
+
+def write_metrics_json(path, mode):
+    """Write metrics_report(mode) to path (atomically)."""
     import json
-    cmd = [
-        "ffprobe",
-        "-v", "error",
-        "-show_entries", "format=duration",
-        "-of", "json",
-        input_file
-    ]
-    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"ffprobe failed: {result.stderr}")
-    info = json.loads(result.stdout)
-    return float(info["format"]["duration"])
 
-def get_video_codec(input_file):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(metrics_report(mode), f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+PROBE_CACHE_VERSION = 1
+PROBE_KEYFRAME_SECONDS = 10  # Packets read for keyframe hints (from the start of the file)
+_PROBE_MEMO = {}  # (realpath, size, mtime_ns) -> probe record
+_PROBE_DISK_CACHE = None  # realpath -> {"size", "mtime_ns", "record"}, loaded on first use
+_PROBE_LOCK = threading.Lock()
+
+def _parse_frame_rate(rate):
+    """Parse an ffprobe rate ("30000/1001", "25") to float; 0 when missing or unparsable."""
+    try:
+        if "/" in rate:
+            num, den = map(float, rate.split("/"))
+            return num / den if den != 0 else 0
+        return float(rate)
+    except (TypeError, ValueError):
+        return 0
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def run_media_probe(input_file):
     """
-    Uses ffprobe to get the codec name of the first video stream.
-    Returns codec_name (e.g., 'h264', 'hevc', 'av1').
+    Run ffprobe once and return a flat media record:
+    duration, start_time, format_name; video_codec, width, height, fps (avg_frame_rate, then
+    r_frame_rate); audio_codec, sample_rate, channels, channel_layout; keyframe_times (the first
+    PROBE_KEYFRAME_SECONDS of video keyframes, relative to the stream start) and keyframe_interval.
+    Fields are None when the file has no such stream or ffprobe does not report them.
     """
     import subprocess
     import json
     cmd = [
         "ffprobe",
         "-v", "error",
-        "-select_streams", "v:0",
-        "-show_entries", "stream=codec_name",
+        "-read_intervals", f"%+{PROBE_KEYFRAME_SECONDS}",
+        "-show_entries",
+        "format=duration,start_time,format_name"
+        ":stream=index,codec_type,codec_name,width,height,avg_frame_rate,r_frame_rate,"
+        "sample_rate,channels,channel_layout,start_time"
+        ":packet=stream_index,pts_time,flags",
         "-of", "json",
         input_file
     ]
-    result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    result = run_child(cmd, "ffprobe")
     if result.returncode != 0:
         raise RuntimeError(f"ffprobe failed: {result.stderr}")
     info = json.loads(result.stdout)
-    if "streams" in info and len(info["streams"]) > 0:
-        return info["streams"][0]["codec_name"]
-    else:
+    fmt = info.get("format", {})
+    streams = info.get("streams", [])
+    video = next((st for st in streams if st.get("codec_type") == "video"), None)
+    audio = next((st for st in streams if st.get("codec_type") == "audio"), None)
+
+    record = {
+        "duration": _float_or_none(fmt.get("duration")),
+        "start_time": _float_or_none(fmt.get("start_time")),
+        "format_name": fmt.get("format_name"),
+        "video_codec": None,
+        "width": None,
+        "height": None,
+        "fps": None,
+        "audio_codec": None,
+        "sample_rate": None,
+        "channels": None,
+        "channel_layout": None,
+        "keyframe_times": [],
+        "keyframe_interval": None,
+    }
+    if video is not None:
+        fps = _parse_frame_rate(video.get("avg_frame_rate", "0/0")) or _parse_frame_rate(
+            video.get("r_frame_rate", "0/0")
+        )
+        record.update({
+            "video_codec": video.get("codec_name"),
+            "width": video.get("width"),
+            "height": video.get("height"),
+            "fps": fps or None,
+        })
+        video_start = _float_or_none(video.get("start_time")) or 0.0
+        keyframes = sorted(
+            float(packet["pts_time"]) - video_start
+            for packet in info.get("packets", [])
+            if packet.get("stream_index") == video.get("index")
+            and "K" in packet.get("flags", "")
+            and _float_or_none(packet.get("pts_time")) is not None
+        )
+        record["keyframe_times"] = [round(t, 6) for t in keyframes]
+        if len(keyframes) > 1:
+            record["keyframe_interval"] = round((keyframes[-1] - keyframes[0]) / (len(keyframes) - 1), 6)
+    if audio is not None:
+        try:
+            sample_rate = int(audio.get("sample_rate"))
+        except (TypeError, ValueError):
+            sample_rate = None
+        record.update({
+            "audio_codec": audio.get("codec_name"),
+            "sample_rate": sample_rate,
+            "channels": audio.get("channels"),
+            "channel_layout": audio.get("channel_layout") or None,
+        })
+    return record
+
+def _probe_cache_path():
+    return os.path.join(videospeeder_cache_dir(), "probe_cache.json")
+
+def _load_probe_disk_cache():
+    import json
+    try:
+        with open(_probe_cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == PROBE_CACHE_VERSION and isinstance(cached.get("entries"), dict):
+            return cached["entries"]
+    except (OSError, ValueError, AttributeError):
+        pass
+    return {}
+
+def _save_probe_disk_cache(entries):
+    import json
+    try:
+        cache_path = _probe_cache_path()
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": PROBE_CACHE_VERSION, "entries": entries}, f)
+            f.write("\n")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        print("[warn] Could not write the ffprobe cache; continuing without it.", file=sys.stderr)
+
+def probe_media(input_file):
+    """
+    Return the media record for input_file (see run_media_probe), running ffprobe at most once per
+    file version: records are memoized in-process and persisted in probe_cache.json under the
+    videospeeder cache directory, keyed by path, size and mtime. A file that is still growing
+    (or was replaced) is probed again.
+    """
+    global _PROBE_DISK_CACHE
+    path = os.path.realpath(input_file)
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    with _PROBE_LOCK:
+        record = _PROBE_MEMO.get(key)
+        if record is not None:
+            return record
+        if _PROBE_DISK_CACHE is None:
+            _PROBE_DISK_CACHE = _load_probe_disk_cache()
+        entry = _PROBE_DISK_CACHE.get(path)
+        if entry and entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            _PROBE_MEMO[key] = entry["record"]
+            return entry["record"]
+
+    with metrics_stage("probe"):
+        record = run_media_probe(path)
+    with _PROBE_LOCK:
+        _PROBE_MEMO[key] = record
+        # Re-read so concurrent runs sharing the cache don't drop each other's entries.
+        _PROBE_DISK_CACHE = _load_probe_disk_cache()
+        _PROBE_DISK_CACHE[path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "record": record}
+        _save_probe_disk_cache(_PROBE_DISK_CACHE)
+    return record
+
+def get_video_duration(input_file):
+    """
+    Duration of the input video in seconds (from probe_media).
+    """
+    duration = probe_media(input_file)["duration"]
+    if duration is None:
+        raise RuntimeError(f"ffprobe reported no duration for {input_file}")
+    return duration
+
+def get_video_codec(input_file):
+    """
+    Codec name of the first video stream (e.g., 'h264', 'hevc', 'av1'), from probe_media.
+    """
+    codec_name = probe_media(input_file)["video_codec"]
+    if codec_name is None:
+        raise RuntimeError("No video stream found in input file.")
+    return codec_name
+
+def get_video_frame_rate(input_file, default=30.0):
+    """
+    Frame rate of the first video stream (avg_frame_rate, then r_frame_rate), from probe_media.
+    Returns default when the rate is missing or unparsable.
+    """
+    media = probe_media(input_file)
+    if media["video_codec"] is None:
         raise RuntimeError("No video stream found in input file.")
+    return media["fps"] or default
+
+def get_audio_format(input_file, default_sample_rate=48000, default_channel_layout="stereo"):
+    """
+    (sample_rate, channel_layout) of the first audio stream, from probe_media.
+    Falls back to the defaults for fields ffprobe does not report (or when there is no audio stream).
+    """
+    media = probe_media(input_file)
+    if media["audio_codec"] is None:
+        return default_sample_rate, default_channel_layout
+    sample_rate = media["sample_rate"] or default_sample_rate
+    channel_layout = media["channel_layout"]
+    if not channel_layout:
+        channels = media["channels"]
+        channel_layout = f"{channels}c" if channels else default_channel_layout
+    return sample_rate, channel_layout
 
 import subprocess
 
-def run_silencedetect(input_file, threshold, duration, offset=0.0, process_duration=None):
+import re
+
+SILENCE_START_RE = re.compile(r"silence_start: (\d+(\.\d+)?)")
+SILENCE_END_RE = re.compile(r"silence_end: (\d+(\.\d+)?)")
+SILENCEDETECT_STDERR_TAIL_LINES = 50  # FFmpeg log lines kept for error reports
+
+def iter_silencedetect_intervals(lines):
     """
-    Runs FFmpeg silencedetect filter and returns stderr output.
-    Allows offset and process_duration to limit the region analyzed.
+    Incrementally parse FFmpeg silencedetect log lines, yielding (start, end) as soon as each
+    silence ends. A trailing silence without silence_end is yielded as (start, None) at the end.
+    Starts and ends are paired in the order they appear.
     """
-    cmd = [
-        "ffmpeg",
-    ]
+    from collections import deque
+
+    starts = deque()
+    ends = deque()
+    for line in lines:
+        if "silence_" not in line:
+            continue
+        start_match = SILENCE_START_RE.search(line)
+        if start_match:
+            starts.append(float(start_match.group(1)))
+        end_match = SILENCE_END_RE.search(line)
+        if end_match:
+            ends.append(float(end_match.group(1)))
+        while starts and ends:
+            yield starts.popleft(), ends.popleft()
+    for start in starts:
+        yield start, None
+
+def detect_silence_intervals_ffmpeg(input_file, threshold, duration, offset=0.0, process_duration=None, total_duration=None, show_progress=True):
+    """
+    Run FFmpeg silencedetect as a streaming pipeline and return its (start, end) silence intervals.
+    Interval events are parsed from stderr as FFmpeg emits them, and only the last
+    SILENCEDETECT_STDERR_TAIL_LINES log lines are kept (for the error report), so memory does not
+    grow with recording length. Progress comes from -progress on stdout, shown as a tqdm bar over
+    total_duration seconds when show_progress is set.
+    Raises subprocess.CalledProcessError if FFmpeg fails.
+    """
+    from collections import deque
+
+    cmd = ["ffmpeg", "-hide_banner", "-nostats"]
     if offset and offset > 0:
         cmd += ["-ss", str(offset)]
     if process_duration:
         cmd += ["-t", str(process_duration)]
     cmd += [
         "-i", input_file,
+        "-vn",  # Only audio is analyzed; skip decoding video
         "-af", f"silencedetect=noise={threshold}dB:d={duration}",
+        "-progress", "pipe:1",
         "-f", "null", "-"
     ]
+    proc = spawn_child(
+        cmd, "ffmpeg-silencedetect", stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+    )
+
+    intervals = []
+    stderr_tail = deque(maxlen=SILENCEDETECT_STDERR_TAIL_LINES)
+
+    def _stderr_lines():
+        for line in proc.stderr:
+            stderr_tail.append(line)
+            yield line
+
+    def _consume_stderr():
+        intervals.extend(iter_silencedetect_intervals(_stderr_lines()))
+
+    stderr_thread = threading.Thread(target=_consume_stderr, daemon=True)
+    stderr_thread.start()
+
+    if show_progress and tqdm is None:
+        print("[warn] tqdm is not installed; running without progress bar.")
+    pbar = None
+    if show_progress and tqdm is not None:
+        pbar = tqdm(total=total_duration, unit="s", desc="Detecting silence", dynamic_ncols=True)
     try:
-        result = subprocess.run(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        return result.stderr
-    except subprocess.CalledProcessError as e:
-        print("Error running FFmpeg silencedetect:", e)
-        print("FFmpeg stderr output:")
-        print(e.stderr)
-        raise
+        for line in proc.stdout:
+            if pbar is None or not line.startswith("out_time_ms="):
+                continue
+            value = line.strip().split("=", 1)[1]
+            if value == "N/A":
+                continue
+            try:
+                seconds = int(value) / 1_000_000
+            except ValueError:
+                continue
+            pbar.n = min(seconds, total_duration) if total_duration else seconds
+            pbar.refresh()
+        wait_child(proc)
+        stderr_thread.join()
+        if pbar is not None and total_duration and proc.returncode == 0:
+            pbar.n = total_duration
+            pbar.refresh()
+    finally:
+        if pbar is not None:
+            pbar.close()
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
 
-import re
+    if proc.returncode != 0:
+        stderr_text = "".join(stderr_tail)
+        print(f"Error running FFmpeg silencedetect (exit code {proc.returncode}).")
+        print("FFmpeg stderr output (last lines):")
+        print(stderr_text)
+        raise subprocess.CalledProcessError(proc.returncode, cmd, stderr=stderr_text)
+    return intervals
 
-def parse_silencedetect_output(stderr):
+SILENCE_BACKENDS = ("ffmpeg", "energy")
+
+def import_numpy():
     """
-    Parses FFmpeg silencedetect output and returns a list of (start, end) tuples.
+    Import numpy lazily, with actionable error messaging. The energy silence backend requires it; the
+    interval functions use it (IntervalSet) for inputs of INTERVAL_VECTOR_MIN or more intervals and
+    fall back to their loops without it.
     """
-    silence_starts = []
-    silence_ends = []
-    for line in stderr.splitlines():
-        start_match = re.search(r"silence_start: (\d+(\.\d+)?)", line)
-        end_match = re.search(r"silence_end: (\d+(\.\d+)?)", line)
-        if start_match:
-            silence_starts.append(float(start_match.group(1)))
-        if end_match:
-            silence_ends.append(float(end_match.group(1)))
-    # Pair starts and ends
+    try:
+        import numpy as np  # type: ignore
+    except ImportError as e:
+        raise RuntimeError(
+            "numpy is required by the energy silence backend, and by the vectorized interval "
+            f"processing used for inputs of {INTERVAL_VECTOR_MIN}+ intervals.\n"
+            "Install it with:\n"
+            "  pip install numpy"
+        ) from e
+    return np
+
+def silence_intervals_from_pcm_chunks(chunks, threshold, duration, sample_rate=16000, np=None, on_samples=None):
+    """
+    silencedetect semantics over streamed s16le PCM: a sample is silent when its amplitude is below
+    threshold dB (full scale), and a run of at least duration seconds of silent samples is a silence.
+    Intervals are (start, end) seconds from the first sample; a silence still running at the end of
+    the stream ends there. Runs are found with array operations per chunk, and state crossing
+    chunk boundaries is carried, so memory is bounded by the chunk size.
+    - chunks: iterable of PCM bytes (e.g. stream_audio_pcm_s16le_chunks)
+    - on_samples: optional callback with the number of samples consumed so far (progress)
+    """
+    if np is None:
+        np = import_numpy()
+    amplitude = (10.0 ** (threshold / 20.0)) * 32768.0
+    min_samples = duration * sample_rate
     intervals = []
-    for i, start in enumerate(silence_starts):
-        end = silence_ends[i] if i < len(silence_ends) else None
-        intervals.append((start, end))
-    return intervals
+    run_start = None  # Sample index where the silent run open at the previous chunk's end began
+    position = 0
+    leftover = b""
+    for data in chunks:
+        if leftover:
+            data = leftover + bytes(data)
+        leftover = b""
+        if len(data) % 2:
+            data, leftover = data[:-1], data[-1:]
+        samples = np.frombuffer(data, dtype="<i2")
+        if not len(samples):
+            continue
+        silent = np.abs(samples.astype(np.int32)) < amplitude
+        edges = np.diff(np.concatenate(([False], silent, [False])).astype(np.int8))
+        starts = np.flatnonzero(edges == 1) + position
+        ends = np.flatnonzero(edges == -1) + position
+        if run_start is not None:
+            if silent[0]:
+                starts[0] = run_start
+            elif position - run_start >= min_samples:
+                intervals.append((run_start / sample_rate, position / sample_rate))
+        position += len(samples)
+        run_start = None
+        if len(ends) and ends[-1] == position:
+            run_start = int(starts[-1])
+            starts, ends = starts[:-1], ends[:-1]
+        long_runs = (ends - starts) >= min_samples
+        intervals.extend(
+            (start / sample_rate, end / sample_rate)
+            for start, end in zip(starts[long_runs].tolist(), ends[long_runs].tolist())
+        )
+        if on_samples is not None:
+            on_samples(position)
+    if run_start is not None and position - run_start >= min_samples:
+        intervals.append((run_start / sample_rate, position / sample_rate))
+    return [(round(start, 6), round(end, 6)) for start, end in intervals]
 
-def extract_audio_pcm_s16le(input_file, offset=0.0, process_duration=None, sample_rate=16000):
+def detect_silence_intervals_energy(input_file, threshold, duration, offset=0.0, process_duration=None, total_duration=None, show_progress=True, sample_rate=16000):
     """
-    Extract 16-bit mono PCM (s16le) audio via FFmpeg pipe for VAD processing.
+    In-process replacement for FFmpeg silencedetect: decodes the same streamed 16 kHz mono PCM as the
+    VAD path and applies silence_intervals_from_pcm_chunks (same threshold/duration semantics).
+    """
+    np = import_numpy()
+    pbar = None
+    if show_progress and tqdm is not None:
+        pbar = tqdm(total=total_duration, unit="s", desc="Detecting silence", dynamic_ncols=True)
 
-    Returned audio is raw bytes (little-endian int16 samples).
-    Timestamps produced by downstream processing are relative to the extracted region, starting at 0.
+    def _progress(samples):
+        seconds = samples / sample_rate
+        pbar.n = min(seconds, total_duration) if total_duration else seconds
+        pbar.refresh()
+
+    try:
+        return silence_intervals_from_pcm_chunks(
+            stream_audio_pcm_s16le_chunks(
+                input_file, offset=offset, process_duration=process_duration, sample_rate=sample_rate
+            ),
+            threshold,
+            duration,
+            sample_rate=sample_rate,
+            np=np,
+            on_samples=_progress if pbar is not None else None,
+        )
+    finally:
+        if pbar is not None:
+            pbar.close()
+
+SILENCE_SHARD_MIN_SECONDS = 60.0  # Shorter shards cost more in FFmpeg startup than they save
+
+def merge_shard_silence_intervals(shard_intervals):
+    """
+    Stitch per-shard silence intervals (already on the common timeline) into one sorted list.
+    Shards overlap, so a silence crossing a shard boundary is reported by both neighbours (clipped
+    at the boundary in one or both); overlapping or touching intervals are the same silent run and
+    are merged. A None end (silence running to the end of the input) is kept.
+    """
+    intervals = sorted(
+        ((start, float("inf") if end is None else end) for shard in shard_intervals for start, end in shard)
+    )
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1] + 1e-6:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [(start, None if end == float("inf") else end) for start, end in merged]
+
+def detect_silence_intervals_sharded(input_file, threshold, duration, shards, total_duration, offset=0.0, process_duration=None, show_progress=True, backend="ffmpeg"):
+    """
+    Run the silence detector over `shards` time ranges of [0, total_duration] concurrently, each
+    seeking with -ss/-t and extended by duration + 1 s into the next range, then stitch the results
+    (merge_shard_silence_intervals). Any silence that starts in a range is then seen by that range's
+    detector for at least the minimum duration, so the result matches a single pass.
+    The shard count is capped so shards are at least SILENCE_SHARD_MIN_SECONDS long.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    shards = max(1, min(shards, int(total_duration // SILENCE_SHARD_MIN_SECONDS)))
+    if shards == 1:
+        return detect_silence_intervals(
+            input_file, threshold, duration, offset=offset, process_duration=process_duration,
+            total_duration=total_duration, show_progress=show_progress, backend=backend,
+        )
+    overlap = duration + 1.0
+    bounds = [total_duration * idx / shards for idx in range(shards + 1)]
+
+    def _detect_shard(idx):
+        shard_start = bounds[idx]
+        if idx < shards - 1:
+            shard_duration = bounds[idx + 1] - shard_start + overlap
+        else:
+            shard_duration = (process_duration - shard_start) if process_duration else None
+        intervals = detect_silence_intervals(
+            input_file, threshold, duration,
+            offset=offset + shard_start, process_duration=shard_duration,
+            show_progress=False, backend=backend,
+        )
+        shifted = []
+        for start, end in intervals:
+            if end is None and idx < shards - 1:
+                end = shard_duration  # Open at the shard's end: the next shard continues it
+            shifted.append((start + shard_start, None if end is None else end + shard_start))
+        return shifted
+
+    pbar = None
+    if show_progress and tqdm is not None:
+        pbar = tqdm(total=shards, unit="shard", desc=f"Detecting silence ({shards} shards)", dynamic_ncols=True)
+    results = []
+    try:
+        with ThreadPoolExecutor(max_workers=shards) as executor:
+            futures = [executor.submit(_detect_shard, idx) for idx in range(shards)]
+            for future in as_completed(futures):
+                results.append(future.result())
+                if pbar is not None:
+                    pbar.update(1)
+    finally:
+        if pbar is not None:
+            pbar.close()
+    return merge_shard_silence_intervals(results)
+
+def detect_silence_intervals(input_file, threshold, duration, offset=0.0, process_duration=None, total_duration=None, show_progress=True, backend="ffmpeg", shards=1):
+    """
+    Silence intervals for the --no-vad path with the selected backend: "ffmpeg" (silencedetect) or
+    "energy" (in-process, detect_silence_intervals_energy).
+    With shards > 1 (and total_duration known), time ranges are analyzed concurrently
+    (detect_silence_intervals_sharded).
+    """
+    if shards > 1 and total_duration:
+        return detect_silence_intervals_sharded(
+            input_file, threshold, duration, shards, total_duration, offset=offset,
+            process_duration=process_duration, show_progress=show_progress, backend=backend,
+        )
+    if backend == "energy":
+        return detect_silence_intervals_energy(
+            input_file, threshold, duration, offset=offset, process_duration=process_duration,
+            total_duration=total_duration, show_progress=show_progress,
+        )
+    if backend != "ffmpeg":
+        raise ValueError(f"unknown silence backend: {backend!r} (expected one of {', '.join(SILENCE_BACKENDS)})")
+    return detect_silence_intervals_ffmpeg(
+        input_file, threshold, duration, offset=offset, process_duration=process_duration,
+        total_duration=total_duration, show_progress=show_progress,
+    )
+
+def build_pcm_s16le_command(input_file, offset=0.0, process_duration=None, sample_rate=16000):
+    """
+    Build the FFmpeg command that decodes the first audio stream to 16-bit mono PCM (s16le) on stdout.
     """
     cmd = ["ffmpeg", "-hide_banner"]
     if offset and offset > 0:
@@ -347,10 +1128,20 @@ def extract_audio_pcm_s16le(input_file, offset=0.0, process_duration=None, sampl
         "-loglevel", "error",
         "pipe:1",
     ]
+    return cmd
 
-    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    audio_bytes, stderr_bytes = proc.communicate()
-    if proc.returncode != 0:
+def extract_audio_pcm_s16le(input_file, offset=0.0, process_duration=None, sample_rate=16000):
+    """
+    Extract 16-bit mono PCM (s16le) audio via FFmpeg pipe for VAD processing.
+
+    Returned audio is raw bytes (little-endian int16 samples).
+    Timestamps produced by downstream processing are relative to the extracted region, starting at 0.
+    """
+    cmd = build_pcm_s16le_command(input_file, offset, process_duration, sample_rate)
+    with metrics_stage("pcm_extract"):
+        result = run_child(cmd, "ffmpeg-pcm", text=False)
+    audio_bytes, stderr_bytes = result.stdout, result.stderr
+    if result.returncode != 0:
         stderr_text = stderr_bytes.decode("utf-8", errors="replace")
         raise RuntimeError(f"FFmpeg audio extraction failed:\n{stderr_text}".rstrip())
     if not audio_bytes:
@@ -359,64 +1150,44 @@ def extract_audio_pcm_s16le(input_file, offset=0.0, process_duration=None, sampl
         )
     return audio_bytes
 
-def pcm_s16le_bytes_to_float_tensor(audio_bytes, torch):
+def pcm_s16le_bytes_to_float_tensor(audio_bytes, torch, out=None):
     """
-    Convert s16le PCM bytes into a 1D float32 torch tensor normalized to ~[-1.0, 1.0].
+    Convert s16le PCM into a 1D float32 torch tensor normalized to ~[-1.0, 1.0].
+    - audio_bytes: bytes or any buffer (e.g. a memoryview into a PCM ring); writable buffers are
+      read in place through a zero-copy int16 view
+    - out: optional preallocated float32 tensor to convert into; a view of its first N samples is returned
     """
-    from array import array
-
     if not audio_bytes:
         raise ValueError("audio_bytes is empty")
-    if len(audio_bytes) % 2 != 0:
-        audio_bytes = audio_bytes[:-1]
-    samples = array("h")
-    samples.frombytes(audio_bytes)
-    if len(samples) == 0:
+    pcm = memoryview(audio_bytes).cast("B")
+    num_samples = len(pcm) // 2
+    if num_samples == 0:
         raise ValueError("no samples decoded from audio_bytes")
-    return torch.tensor(samples, dtype=torch.float32) / 32768.0
-
-def stream_audio_pcm_s16le_chunks(
-    input_file,
-    offset=0.0,
-    process_duration=None,
-    sample_rate=16000,
-    chunk_seconds=30.0,
-):
+    pcm = pcm[:num_samples * 2]
+    if pcm.readonly:
+        # torch.frombuffer warns on read-only buffers (e.g. bytes); copy once into a writable one.
+        pcm = memoryview(bytearray(pcm))
+    samples = torch.frombuffer(pcm, dtype=torch.int16)
+    if out is None:
+        return samples.to(torch.float32).div_(32768.0)
+    audio = out[:num_samples]
+    torch.div(samples, 32768.0, out=audio)
+    return audio
+
+def _start_pcm_s16le_stream(input_file, offset, process_duration, sample_rate, bufsize):
     """
-    Stream s16le PCM audio from FFmpeg in fixed-size chunks to avoid loading the entire audio into memory.
-
-    Yields: raw PCM bytes (little-endian int16), sized to approximately `chunk_seconds` per yield.
+    Start FFmpeg decoding PCM to stdout, draining stderr on a background thread.
+    Returns (proc, stderr_chunks, stderr_thread).
     """
     import threading
 
-    if chunk_seconds <= 0:
-        raise ValueError("chunk_seconds must be > 0")
-
-    chunk_samples = int(sample_rate * chunk_seconds)
-    bytes_per_chunk = chunk_samples * 2
-
-    cmd = ["ffmpeg", "-hide_banner"]
-    if offset and offset > 0:
-        cmd += ["-ss", str(offset)]
-    cmd += ["-i", input_file]
-    if process_duration:
-        cmd += ["-t", str(process_duration)]
-    cmd += [
-        "-map", "0:a:0",
-        "-vn",
-        "-acodec", "pcm_s16le",
-        "-ar", str(sample_rate),
-        "-ac", "1",
-        "-f", "s16le",
-        "-loglevel", "error",
-        "pipe:1",
-    ]
-
-    proc = subprocess.Popen(
+    cmd = build_pcm_s16le_command(input_file, offset, process_duration, sample_rate)
+    proc = spawn_child(
         cmd,
+        "ffmpeg-pcm",
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        bufsize=max(1024 * 1024, bytes_per_chunk * 2),
+        bufsize=bufsize,
     )
 
     stderr_chunks = []
@@ -437,255 +1208,1355 @@ def stream_audio_pcm_s16le_chunks(
         proc.kill()
         stderr_thread.join(timeout=1)
         raise RuntimeError("Failed to open FFmpeg stdout for PCM streaming.")
+    return proc, stderr_chunks, stderr_thread
+
+def _finish_pcm_s16le_stream(proc, stderr_thread):
+    try:
+        proc.stdout.close()
+    except Exception:
+        pass
+    wait_child(proc)
+    stderr_thread.join(timeout=1)
+
+def _check_pcm_s16le_stream(proc, stderr_chunks):
+    if proc.returncode != 0:
+        stderr_text = b"".join(stderr_chunks).decode("utf-8", errors="replace")
+        raise RuntimeError(f"FFmpeg audio streaming failed:\n{stderr_text}".rstrip())
+
+def stream_audio_pcm_s16le_chunks(
+    input_file,
+    offset=0.0,
+    process_duration=None,
+    sample_rate=16000,
+    chunk_seconds=30.0,
+):
+    """
+    Stream s16le PCM audio from FFmpeg in fixed-size chunks to avoid loading the entire audio into memory.
+
+    Yields: raw PCM bytes (little-endian int16), sized to approximately `chunk_seconds` per yield.
+    """
+    if chunk_seconds <= 0:
+        raise ValueError("chunk_seconds must be > 0")
+
+    chunk_samples = int(sample_rate * chunk_seconds)
+    bytes_per_chunk = chunk_samples * 2
 
+    proc, stderr_chunks, stderr_thread = _start_pcm_s16le_stream(
+        input_file, offset, process_duration, sample_rate, bufsize=max(1024 * 1024, bytes_per_chunk * 2)
+    )
     try:
         while True:
-            data = proc.stdout.read(bytes_per_chunk)
+            with metrics_stage("pcm_extract"):
+                data = proc.stdout.read(bytes_per_chunk)
             if not data:
                 break
             yield data
     finally:
-        try:
-            proc.stdout.close()
-        except Exception:
-            pass
-        proc.wait()
-        stderr_thread.join(timeout=1)
+        _finish_pcm_s16le_stream(proc, stderr_thread)
 
-    if proc.returncode != 0:
-        stderr_text = b"".join(stderr_chunks).decode("utf-8", errors="replace")
-        raise RuntimeError(f"FFmpeg audio streaming failed:\n{stderr_text}".rstrip())
+    _check_pcm_s16le_stream(proc, stderr_chunks)
 
-def detect_speech_segments_silero(
+def stream_audio_pcm_s16le_windows(
     input_file,
-    vad_threshold,
     offset=0.0,
     process_duration=None,
     sample_rate=16000,
     chunk_seconds=30.0,
     overlap_seconds=1.0,
-    min_speech_duration_ms=200,
-    min_silence_duration_ms=100,
-    speech_pad_ms=50,
+    start_seconds=0.0,
+    tail_seconds=0.0,
 ):
     """
-    Detect speech segments in the input using Silero VAD.
+    Stream overlapping PCM windows for chunked VAD: each window is the last overlap_seconds of the
+    previous window followed by the next chunk, so speech crossing a chunk boundary is seen whole.
 
-    Returns list of (start_seconds, end_seconds) tuples, relative to the processed region starting at 0.
-    """
-    torch, load_silero_vad, get_speech_timestamps = import_vad_dependencies()
+    FFmpeg's stdout is read straight into one preallocated buffer (overlap + chunk) with readinto;
+    after each window the tail is moved to the front, so no per-chunk byte strings are built.
 
+    To resume a previous run, decode from just before the next chunk and pass start_seconds
+    (timestamp of the first decoded sample) and tail_seconds (how much of the decoded audio is the
+    previous window's tail): windows then match the ones a full run would have produced.
+
+    Yields: (window_view, window_start_seconds), with the start relative to the processed region.
+    window_view is a memoryview into the shared buffer and is only valid until the next iteration.
+    """
+    if chunk_seconds <= 0:
+        raise ValueError("chunk_seconds must be > 0")
     if overlap_seconds < 0:
         raise ValueError("overlap_seconds must be >= 0")
-    overlap_samples = int(overlap_seconds * sample_rate)
-    overlap_bytes = overlap_samples * 2
+    overlap_bytes = int(overlap_seconds * sample_rate) * 2
+    bytes_per_chunk = int(sample_rate * chunk_seconds) * 2
+
+    ring = bytearray(overlap_bytes + bytes_per_chunk)
+    view = memoryview(ring)
+    tail_len = 0
+    odd_byte = False
+
+    # Unbuffered stdout: readinto lands in the ring directly instead of going through a read buffer.
+    proc, stderr_chunks, stderr_thread = _start_pcm_s16le_stream(
+        input_file, offset, process_duration, sample_rate, bufsize=0
+    )
+    try:
+        initial_tail_bytes = min(overlap_bytes, int(tail_seconds * sample_rate) * 2)
+        while tail_len < initial_tail_bytes:
+            n = proc.stdout.readinto(view[tail_len:initial_tail_bytes])
+            if not n:
+                break
+            tail_len += n
+        tail_len -= tail_len % 2
+        time_offset_seconds = start_seconds + (tail_len / 2) / sample_rate
+
+        while True:
+            filled = tail_len
+            chunk_end = tail_len + bytes_per_chunk
+            with metrics_stage("pcm_extract"):
+                while filled < chunk_end:
+                    n = proc.stdout.readinto(view[filled:chunk_end])
+                    if not n:
+                        break
+                    filled += n
+            chunk_len = filled - tail_len
+            if chunk_len % 2 != 0:
+                # Only possible at EOF, since a full chunk is always even.
+                odd_byte = True
+                chunk_len -= 1
+            if chunk_len == 0:
+                break
+
+            window_len = tail_len + chunk_len
+            tail_seconds = (tail_len / 2) / sample_rate
+            chunk_start_seconds = max(0.0, time_offset_seconds - tail_seconds)
+
+            metrics_count("vad_audio_seconds", (chunk_len / 2) / sample_rate)
+            yield view[:window_len], chunk_start_seconds
+
+            time_offset_seconds += (chunk_len / 2) / sample_rate
+            if filled < chunk_end:
+                break
+            tail_len = min(overlap_bytes, window_len)
+            if tail_len:
+                view[:tail_len] = view[window_len - tail_len:window_len]
+    finally:
+        _finish_pcm_s16le_stream(proc, stderr_thread)
+
+    _check_pcm_s16le_stream(proc, stderr_chunks)
+    if odd_byte:
+        # Unpaired last byte shouldn't happen, but avoid silent corruption.
+        raise RuntimeError("PCM stream ended on an odd byte boundary.")
 
-    torch.set_num_threads(1)
+def load_silero_model(load_silero_vad):
+    """
+    Load the Silero VAD model with an actionable error message on failure.
+    """
     try:
-        model = load_silero_vad()
+        return load_silero_vad()
     except Exception as e:
         raise RuntimeError(
             "Failed to load Silero VAD model. This may require network access on first run. "
             "See README for offline notes."
         ) from e
 
-    all_segments = []
-    time_offset_seconds = 0.0
-    tail_bytes = b""
-    carry_byte = b""
+VAD_BACKENDS = ("torch", "onnx", "onnx-int8")
 
-    for chunk_bytes in stream_audio_pcm_s16le_chunks(
-        input_file,
-        offset=offset,
-        process_duration=process_duration,
-        sample_rate=sample_rate,
-        chunk_seconds=chunk_seconds,
-    ):
-        if carry_byte:
-            chunk_bytes = carry_byte + chunk_bytes
-            carry_byte = b""
-        if len(chunk_bytes) % 2 != 0:
-            carry_byte = chunk_bytes[-1:]
-            chunk_bytes = chunk_bytes[:-1]
-
-        combined = tail_bytes + chunk_bytes
-        if len(combined) % 2 != 0:
-            combined = combined[:-1]
-
-        combined_seconds = (len(combined) / 2) / sample_rate
-        tail_seconds = (len(tail_bytes) / 2) / sample_rate
-        chunk_start_seconds = max(0.0, time_offset_seconds - tail_seconds)
-
-        audio_tensor = pcm_s16le_bytes_to_float_tensor(combined, torch)
-        speech_timestamps = get_speech_timestamps(
-            audio_tensor,
-            model,
-            threshold=vad_threshold,
-            sampling_rate=sample_rate,
-            min_speech_duration_ms=min_speech_duration_ms,
-            min_silence_duration_ms=min_silence_duration_ms,
-            speech_pad_ms=speech_pad_ms,
-            return_seconds=True,
-        )
+def import_onnx_vad_dependencies():
+    """
+    Import the ONNX VAD backend dependencies lazily, with actionable error messaging.
+    Neither torch nor the silero_vad package is imported by this backend.
+    """
+    try:
+        import numpy as np  # type: ignore
+        import onnxruntime  # type: ignore
+    except ImportError as e:
+        raise RuntimeError(
+            "The ONNX VAD backend requires onnxruntime.\n"
+            "Install it with:\n"
+            "  pip install onnxruntime\n"
+            "The silero-vad package must also be installed (it ships the ONNX model file)."
+        ) from e
+    return np, onnxruntime
 
-        for ts in speech_timestamps:
-            start = float(ts["start"]) + chunk_start_seconds
-            end = float(ts["end"]) + chunk_start_seconds
-            all_segments.append((start, end))
+def videospeeder_cache_dir():
+    """
+    Per-user cache directory ($XDG_CACHE_HOME/videospeeder, default ~/.cache/videospeeder).
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, "videospeeder")
+    os.makedirs(path, exist_ok=True)
+    return path
 
-        if overlap_bytes > 0:
-            tail_bytes = combined[-overlap_bytes:] if len(combined) > overlap_bytes else combined
-        else:
-            tail_bytes = b""
+def silero_onnx_model_path():
+    """
+    Locate the ONNX model bundled with the silero-vad package without importing it (its
+    __init__ imports torch).
+    """
+    import importlib.util
 
-        time_offset_seconds += (len(chunk_bytes) / 2) / sample_rate
+    spec = importlib.util.find_spec("silero_vad")
+    if spec is None or not spec.submodule_search_locations:
+        raise RuntimeError(
+            "The ONNX VAD backend needs the 'silero-vad' package for its model file.\n"
+            "Install dependencies with:\n"
+            "  pip install -r /Users/jordanknight/github/videospeeder/videospeeder_project/requirements.txt"
+        )
+    for package_dir in spec.submodule_search_locations:
+        path = os.path.join(package_dir, "data", "silero_vad.onnx")
+        if os.path.exists(path):
+            return path
+    raise RuntimeError("The installed silero-vad package has no silero_vad.onnx; upgrade to silero-vad 5.x.")
 
-    if carry_byte:
-        # Unpaired last byte shouldn't happen, but avoid silent corruption.
-        raise RuntimeError("PCM stream ended on an odd byte boundary.")
+def quantized_silero_onnx_model_path(model_path):
+    """
+    Return an int8 (dynamic weight quantization) copy of the Silero ONNX model, building it in the
+    cache directory on first use or when the source model changes.
+    """
+    cache_path = os.path.join(videospeeder_cache_dir(), "silero_vad.int8.onnx")
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(model_path):
+        return cache_path
+    try:
+        from onnxruntime.quantization import QuantType, quantize_dynamic  # type: ignore
+    except ImportError as e:
+        raise RuntimeError("The onnx-int8 VAD backend requires onnxruntime's quantization tools (pip install onnx).") from e
 
-    return all_segments
+    tmp_path = cache_path + ".tmp"
+    try:
+        quantize_dynamic(model_path, tmp_path, weight_type=QuantType.QInt8)
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        raise RuntimeError(f"Failed to quantize the Silero ONNX model: {e}") from e
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return cache_path
 
-def normalize_speech_segments(
-    speech_segments,
-    max_end,
-    merge_gap_seconds=0.3,
-    pad_seconds=0.05,
-    merge_tolerance_seconds=0.1,
-):
+class SileroOnnxModel:
     """
-    Merge, pad, and clamp speech segments to reduce fragmentation and avoid boundary clipping.
+    Silero VAD (v5) ONNX model driven with numpy, one window per call.
+    Mirrors silero_vad's OnnxWrapper: a 64-sample context (32 at 8 kHz) is carried between windows
+    along with the recurrent state.
     """
-    if max_end < 0:
-        raise ValueError("max_end must be >= 0")
 
-    cleaned = []
-    for start, end in speech_segments:
-        try:
-            start_f = float(start)
-            end_f = float(end)
-        except (TypeError, ValueError):
-            continue
-        if end_f <= start_f:
-            continue
-        cleaned.append((start_f, end_f))
+    def __init__(self, model_path, np, onnxruntime):
+        self.np = np
+        opts = onnxruntime.SessionOptions()
+        opts.inter_op_num_threads = 1
+        opts.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.reset_states()
+
+    def reset_states(self):
+        self._state = self.np.zeros((2, 1, 128), dtype=self.np.float32)
+        self._context = None
+
+    def __call__(self, chunk, sampling_rate):
+        np = self.np
+        context_size = 64 if sampling_rate == 16000 else 32
+        if self._context is None:
+            self._context = np.zeros((1, context_size), dtype=np.float32)
+        x = np.concatenate([self._context, chunk.reshape(1, -1)], axis=1)
+        out, self._state = self.session.run(
+            None,
+            {"input": x, "state": self._state, "sr": np.array(sampling_rate, dtype=np.int64)},
+        )
+        self._context = x[:, -context_size:]
+        return float(out[0][0])
 
-    if not cleaned:
-        return []
+def onnx_speech_probs(audio, model, np, sampling_rate=16000):
+    """
+    Per-window speech probabilities for a float32 numpy signal (512-sample windows at 16 kHz,
+    256 at 8 kHz; the last window is zero-padded).
+    """
+    if sampling_rate not in (8000, 16000):
+        raise ValueError("Silero VAD supports 8000 or 16000 Hz audio")
+    window_size_samples = 512 if sampling_rate == 16000 else 256
+    model.reset_states()
+    probs = []
+    for start in range(0, len(audio), window_size_samples):
+        chunk = audio[start:start + window_size_samples]
+        if len(chunk) < window_size_samples:
+            chunk = np.pad(chunk, (0, window_size_samples - len(chunk)))
+        probs.append(model(chunk, sampling_rate))
+    return probs
+
+def torch_speech_probs(audio, model, torch, sampling_rate=16000):
+    """
+    Per-window speech probabilities for a float32 torch signal, computed exactly as
+    get_speech_timestamps does before segmentation.
+    """
+    if sampling_rate not in (8000, 16000):
+        raise ValueError("Silero VAD supports 8000 or 16000 Hz audio")
+    window_size_samples = 512 if sampling_rate == 16000 else 256
+    model.reset_states()
+    probs = []
+    with torch.no_grad():
+        for start in range(0, len(audio), window_size_samples):
+            chunk = audio[start:start + window_size_samples]
+            if len(chunk) < window_size_samples:
+                chunk = torch.nn.functional.pad(chunk, (0, window_size_samples - len(chunk)))
+            probs.append(model(chunk, sampling_rate).item())
+    return probs
+
+def quantize_speech_probs(probs):
+    """
+    Quantize speech probabilities to uint16 (resolution 1/65535) for compact storage.
+    """
+    from array import array
 
-    cleaned.sort(key=lambda x: x[0])
+    return array("H", (min(65535, max(0, int(round(p * 65535.0)))) for p in probs))
 
-    # Merge segments that overlap or are separated by a small gap.
-    merged = [cleaned[0]]
-    for start, end in cleaned[1:]:
-        last_start, last_end = merged[-1]
-        gap = start - last_end
-        if gap <= merge_gap_seconds:
-            merged[-1] = (last_start, max(last_end, end))
+def dequantize_speech_probs(quantized):
+    return [q / 65535.0 for q in quantized]
+
+VAD_ENERGY_GATE_PAD_SECONDS = 0.5  # Audio kept around energetic frames (model warm-up and speech edges)
+
+def energy_gated_speech_probs(audio, speech_probs, floor_db, sampling_rate=16000, pad_seconds=VAD_ENERGY_GATE_PAD_SECONDS):
+    """
+    Per-window speech probabilities with an energy pre-gate: windows whose RMS level is below
+    floor_db (dBFS) are scored 0 without calling the model; runs of energetic windows, padded by
+    pad_seconds on each side, are scored with speech_probs(signal).
+    audio is a float32 numpy array or torch tensor (only operations both support are used).
+    Returns (probs, inferred_samples).
+    """
+    window_size_samples = 512 if sampling_rate == 16000 else 256
+    total = len(audio)
+    num_windows = -(-total // window_size_samples)
+    full_windows = total // window_size_samples
+    floor_power = 10.0 ** (floor_db / 10.0)
+
+    loud = []
+    if full_windows:
+        frames = audio[:full_windows * window_size_samples].reshape(full_windows, window_size_samples)
+        loud = ((frames ** 2).mean(-1) >= floor_power).tolist()
+    if total > full_windows * window_size_samples:
+        loud.append(float((audio[full_windows * window_size_samples:] ** 2).mean()) >= floor_power)
+
+    pad_windows = -(-int(pad_seconds * sampling_rate) // window_size_samples)
+    regions = []
+    for idx, is_loud in enumerate(loud):
+        if not is_loud:
+            continue
+        start = max(0, idx - pad_windows)
+        end = min(num_windows, idx + pad_windows + 1)
+        if regions and start <= regions[-1][1]:
+            regions[-1][1] = end
         else:
-            merged.append((start, end))
+            regions.append([start, end])
+
+    probs = [0.0] * num_windows
+    inferred_samples = 0
+    for start, end in regions:
+        start_sample = start * window_size_samples
+        end_sample = min(total, end * window_size_samples)
+        probs[start:end] = speech_probs(audio[start_sample:end_sample])
+        inferred_samples += end_sample - start_sample
+    return probs, inferred_samples
+
+def speech_probs_to_timestamps(
+    speech_probs,
+    audio_length_samples,
+    threshold=0.5,
+    sampling_rate=16000,
+    min_speech_duration_ms=250,
+    max_speech_duration_s=float("inf"),
+    min_silence_duration_ms=100,
+    speech_pad_ms=30,
+    neg_threshold=None,
+):
+    """
+    Turn per-window speech probabilities into speech segments.
+    This is the segmentation step of silero_vad's get_speech_timestamps (5.x) with
+    return_seconds=True, so backends that compute probabilities themselves produce the same output.
 
-    # Pad and clamp.
-    padded = []
-    for start, end in merged:
-        padded_start = max(0.0, start - pad_seconds)
-        padded_end = min(max_end, end + pad_seconds)
-        if padded_end > padded_start:
-            padded.append((padded_start, padded_end))
+    Returns list of (start_seconds, end_seconds) tuples.
+    """
+    window_size_samples = 512 if sampling_rate == 16000 else 256
+    min_speech_samples = sampling_rate * min_speech_duration_ms / 1000
+    speech_pad_samples = sampling_rate * speech_pad_ms / 1000
+    max_speech_samples = sampling_rate * max_speech_duration_s - window_size_samples - 2 * speech_pad_samples
+    min_silence_samples = sampling_rate * min_silence_duration_ms / 1000
+    min_silence_samples_at_max_speech = sampling_rate * 98 / 1000
+    if neg_threshold is None:
+        neg_threshold = max(threshold - 0.15, 0.01)
+
+    triggered = False
+    speeches = []
+    current_speech = {}
+    temp_end = 0
+    prev_end = next_start = 0
+
+    for i, speech_prob in enumerate(speech_probs):
+        position = window_size_samples * i
+        if speech_prob >= threshold and temp_end:
+            temp_end = 0
+            if next_start < prev_end:
+                next_start = position
+
+        if speech_prob >= threshold and not triggered:
+            triggered = True
+            current_speech["start"] = position
+            continue
 
-    if not padded:
-        return []
+        if triggered and position - current_speech["start"] > max_speech_samples:
+            if prev_end:
+                current_speech["end"] = prev_end
+                speeches.append(current_speech)
+                current_speech = {}
+                if next_start < prev_end:
+                    triggered = False
+                else:
+                    current_speech["start"] = next_start
+                prev_end = next_start = temp_end = 0
+            else:
+                current_speech["end"] = position
+                speeches.append(current_speech)
+                current_speech = {}
+                prev_end = next_start = temp_end = 0
+                triggered = False
+                continue
+
+        if speech_prob < neg_threshold and triggered:
+            if not temp_end:
+                temp_end = position
+            if position - temp_end > min_silence_samples_at_max_speech:
+                prev_end = temp_end
+            if position - temp_end < min_silence_samples:
+                continue
+            current_speech["end"] = temp_end
+            if current_speech["end"] - current_speech["start"] > min_speech_samples:
+                speeches.append(current_speech)
+            current_speech = {}
+            prev_end = next_start = temp_end = 0
+            triggered = False
+            continue
 
-    # Merge again after padding to remove overlaps.
-    padded.sort(key=lambda x: x[0])
-    final = [padded[0]]
-    for start, end in padded[1:]:
-        last_start, last_end = final[-1]
-        if start <= last_end + merge_tolerance_seconds:
-            final[-1] = (last_start, max(last_end, end))
+    if current_speech and audio_length_samples - current_speech["start"] > min_speech_samples:
+        current_speech["end"] = audio_length_samples
+        speeches.append(current_speech)
+
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech["start"] = int(max(0, speech["start"] - speech_pad_samples))
+        if i != len(speeches) - 1:
+            silence_duration = speeches[i + 1]["start"] - speech["end"]
+            if silence_duration < 2 * speech_pad_samples:
+                speech["end"] += int(silence_duration // 2)
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - silence_duration // 2))
+            else:
+                speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
+                speeches[i + 1]["start"] = int(max(0, speeches[i + 1]["start"] - speech_pad_samples))
         else:
-            final.append((start, end))
+            speech["end"] = int(min(audio_length_samples, speech["end"] + speech_pad_samples))
 
-    return final
+    audio_length_seconds = audio_length_samples / sampling_rate
+    return [
+        (
+            max(round(speech["start"] / sampling_rate, 1), 0),
+            min(round(speech["end"] / sampling_rate, 1), audio_length_seconds),
+        )
+        for speech in speeches
+    ]
 
-def speech_segments_to_silence_intervals(speech_segments, total_duration):
+def load_vad_backend(backend="torch"):
     """
-    Convert speech segments into non-speech ("silence") intervals for the existing pipeline.
-
-    - If no speech is detected: returns [(0, total_duration)] (all silence / all sped-up).
-    - If speech covers entire duration: returns [] (no silence to speed up).
+    Load a VAD inference backend:
+    - torch: Silero JIT model via the silero_vad package
+    - onnx: Silero ONNX model via onnxruntime on CPU (no torch import)
+    - onnx-int8: as onnx, with an int8 dynamically quantized copy of the model
+    Returns a dict consumed by score_vad_window.
     """
-    if total_duration < 0:
-        raise ValueError("total_duration must be >= 0")
-
-    if not speech_segments:
-        return [(0.0, float(total_duration))]
+    if backend == "torch":
+        torch, load_silero_vad, get_speech_timestamps = import_vad_dependencies()
+        torch.set_num_threads(1)
+        return {
+            "backend": backend,
+            "torch": torch,
+            "model": load_silero_model(load_silero_vad),
+            "get_speech_timestamps": get_speech_timestamps,
+        }
+    if backend in ("onnx", "onnx-int8"):
+        np, onnxruntime = import_onnx_vad_dependencies()
+        model_path = silero_onnx_model_path()
+        if backend == "onnx-int8":
+            model_path = quantized_silero_onnx_model_path(model_path)
+        try:
+            model = SileroOnnxModel(model_path, np, onnxruntime)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load Silero ONNX model {model_path}: {e}") from e
+        return {"backend": backend, "np": np, "model": model}
+    raise ValueError(f"unknown VAD backend: {backend!r} (expected one of {', '.join(VAD_BACKENDS)})")
 
-    intervals = []
-    prev_end = 0.0
-    for start, end in speech_segments:
-        if start > prev_end:
-            intervals.append((prev_end, start))
-        prev_end = max(prev_end, end)
+# VAD backends loaded by get_vad_backend, kept for the life of the process.
+_VAD_BACKEND_CACHE = {}
 
-    if prev_end < total_duration:
-        intervals.append((prev_end, float(total_duration)))
+def get_vad_backend(backend="torch"):
+    """
+    Return the process-wide instance of a VAD backend, loading it on first use.
+    """
+    if backend not in _VAD_BACKEND_CACHE:
+        _VAD_BACKEND_CACHE[backend] = load_vad_backend(backend)
+    return _VAD_BACKEND_CACHE[backend]
 
-    # If speech starts at 0 and runs through end, there will be no intervals (correct).
-    return intervals
+def allocate_vad_float_buffer(vad, num_samples):
+    """
+    Preallocate a float32 buffer of num_samples for score_vad_window, in the backend's array type.
+    """
+    if vad["backend"] == "torch":
+        torch = vad["torch"]
+        return torch.empty(num_samples, dtype=torch.float32)
+    np = vad["np"]
+    return np.empty(num_samples, dtype=np.float32)
 
-def validate_silence_intervals(silence_intervals, max_end):
+def pcm_s16le_bytes_to_float_array(audio_bytes, np, out=None):
     """
-    Validate silence intervals are ordered, non-negative, and within [0, max_end].
+    Convert s16le PCM into a 1D float32 numpy array normalized to ~[-1.0, 1.0] (zero-copy int16 view,
+    one conversion, optionally into the preallocated `out`).
     """
-    prev_end = 0.0
-    for idx, (start, end) in enumerate(silence_intervals):
-        if start is None or end is None:
-            raise ValueError(f"silence interval {idx} has open-ended bound (start={start}, end={end})")
-        if start < 0 or end < 0:
-            raise ValueError(f"silence interval {idx} is negative: ({start}, {end})")
-        if end < start:
-            raise ValueError(f"silence interval {idx} has end < start: ({start}, {end})")
-        if start < prev_end:
-            raise ValueError(f"silence interval {idx} overlaps or is unsorted: ({start}, {end})")
-        if end > max_end + 1e-6:
-            raise ValueError(f"silence interval {idx} exceeds max_end={max_end}: ({start}, {end})")
-        prev_end = end
+    num_samples = len(memoryview(audio_bytes).cast("B")) // 2
+    if num_samples == 0:
+        raise ValueError("no samples decoded from audio_bytes")
+    samples = np.frombuffer(audio_bytes, dtype="<i2", count=num_samples)
+    if out is None:
+        out = np.empty(num_samples, dtype=np.float32)
+    audio = out[:num_samples]
+    np.divide(samples, np.float32(32768.0), out=audio)
+    return audio
 
-def silence_intervals_to_speech_segments(silence_intervals, total_duration):
+VAD_SERVER_SOCKET_ENV = "VIDEOSPEEDER_VAD_SOCKET"
+
+def vad_server_socket_path():
     """
-    Convert silence intervals into speech segments (the inverse of speech_segments_to_silence_intervals).
-    Used when the silencedetect backend provides silence intervals directly and we need
-    speech_segments for the sidecar file.
+    Socket path of the warm VAD worker (vad_server.py).
+    Overridable via $VIDEOSPEEDER_VAD_SOCKET; an empty value disables the server lookup.
     """
-    if not silence_intervals:
-        return [(0.0, float(total_duration))]
-    segments = []
-    prev_end = 0.0
-    for start, end in silence_intervals:
-        if start > prev_end:
-            segments.append((prev_end, start))
-        prev_end = max(prev_end, end)
-    if prev_end < total_duration:
-        segments.append((prev_end, float(total_duration)))
-    return segments
+    path = os.environ.get(VAD_SERVER_SOCKET_ENV)
+    if path is not None:
+        return path or None
+    import tempfile
 
-def write_vad_metadata(input_file, speech_segments, silence_intervals, analyzed_duration,
-                       backend, params):
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tempfile.gettempdir(), f"videospeeder-vad-{uid}.sock")
+
+def request_vad_server(job, socket_path=None, connect_timeout=1.0):
     """
-    Write a .vad.json sidecar file next to the input video.
-    Schema v1: version, source, detection (backend, analyzed_duration, params),
-    speech_segments as [[s,e],...], silence_intervals as [[s,e],...].
+    Send one newline-delimited JSON request to the warm VAD worker and return its decoded reply.
+    Returns None when no worker is listening, so callers can fall back to in-process inference.
     """
     import json
+    import socket
 
-    sidecar_path = os.path.splitext(input_file)[0] + ".vad.json"
-    payload = {
-        "version": 1,
-        "source": {
-            "file": os.path.basename(input_file),
-        },
-        "detection": {
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    socket_path = socket_path or vad_server_socket_path()
+    if not socket_path or not os.path.exists(socket_path):
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(connect_timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            # Stale socket file or a worker that is shutting down.
+            return None
+        # Detection takes as long as it takes; only the connect is bounded.
+        sock.settimeout(None)
+        sock.sendall((json.dumps(job) + "\n").encode("utf-8"))
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+
+    if not line:
+        raise RuntimeError(f"VAD server at {socket_path} closed the connection without a reply.")
+    reply = json.loads(line.decode("utf-8"))
+    if not reply.get("ok"):
+        raise RuntimeError(f"VAD server error: {reply.get('error', 'unknown error')}")
+    return reply
+
+def score_vad_window(window_bytes, window_start_seconds, vad, vad_params, float_buffer=None, return_probs=False, energy_floor_db=None, stock_segmenter=False):
+    """
+    Run Silero VAD over one PCM window.
+    Segments always come from speech_probs_to_timestamps on the raw (unquantized) probabilities, for
+    every backend and option, so a --detect sidecar and a direct render of the same input agree.
+    - vad: backend from load_vad_backend / get_vad_backend
+    - vad_params: keyword arguments for get_speech_timestamps (threshold, sampling_rate, ...)
+    - float_buffer: optional preallocated float32 buffer (allocate_vad_float_buffer) reused for the samples
+    - return_probs: also return the window's probability record (see detect_speech_segments_silero),
+      quantized for storage; it is only used to re-segment for other parameters (--retune)
+    - energy_floor_db: if set, windows quieter than this RMS level (dBFS) are marked non-speech without
+      running the model (see energy_gated_speech_probs); the probability record then also carries
+      "inferred_samples"
+    - stock_segmenter: segment with silero_vad's own get_speech_timestamps instead (torch backend only,
+      without return_probs or energy_floor_db); the reference vad_dump.py checks the pipeline against
+    Returns list of (start_seconds, end_seconds) tuples, shifted by window_start_seconds
+    (and the probability record if return_probs).
+    """
+    sampling_rate = vad_params["sampling_rate"]
+    if vad["backend"] == "torch":
+        audio = pcm_s16le_bytes_to_float_tensor(window_bytes, vad["torch"], out=float_buffer)
+
+        def speech_probs(signal):
+            return torch_speech_probs(signal, vad["model"], vad["torch"], sampling_rate)
+    else:
+        audio = pcm_s16le_bytes_to_float_array(window_bytes, vad["np"], out=float_buffer)
+
+        def speech_probs(signal):
+            return onnx_speech_probs(signal, vad["model"], vad["np"], sampling_rate=sampling_rate)
+
+    if stock_segmenter:
+        if vad["backend"] != "torch" or return_probs or energy_floor_db is not None:
+            raise ValueError("stock_segmenter needs the torch backend without probabilities or energy gate")
+        speech_timestamps = vad["get_speech_timestamps"](
+            audio,
+            vad["model"],
+            return_seconds=True,
+            **vad_params,
+        )
+        return [
+            (float(ts["start"]) + window_start_seconds, float(ts["end"]) + window_start_seconds)
+            for ts in speech_timestamps
+        ]
+
+    inferred_samples = len(audio)
+    if energy_floor_db is not None:
+        probs, inferred_samples = energy_gated_speech_probs(audio, speech_probs, energy_floor_db, sampling_rate)
+    else:
+        probs = speech_probs(audio)
+    segments = [
+        (float(start) + window_start_seconds, float(end) + window_start_seconds)
+        for start, end in speech_probs_to_timestamps(probs, len(audio), **vad_params)
+    ]
+    if not return_probs:
+        return segments
+    record = {"start": window_start_seconds, "samples": len(audio), "probs": quantize_speech_probs(probs)}
+    if energy_floor_db is not None:
+        record["inferred_samples"] = inferred_samples
+    return segments, record
+
+# Per-process state of a VAD pool worker (set by _vad_worker_init).
+_VAD_WORKER = None
+
+def _vad_worker_init(shm_name, slot_bytes, vad_params, backend="torch", return_probs=False, energy_floor_db=None, stock_segmenter=False):
+    """
+    Initializer for VAD pool workers: load the backend once and attach the shared PCM slots.
+    """
+    global _VAD_WORKER
+    from multiprocessing import shared_memory
+
+    vad = get_vad_backend(backend)
+    # Workers share the parent's resource tracker, so attaching doesn't change ownership:
+    # the parent unlinks the block when detection finishes.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _VAD_WORKER = {
+        "vad": vad,
+        "shm": shm,
+        "slot_bytes": slot_bytes,
+        "vad_params": vad_params,
+        "return_probs": return_probs,
+        "energy_floor_db": energy_floor_db,
+        "stock_segmenter": stock_segmenter,
+        "float_buffer": allocate_vad_float_buffer(vad, slot_bytes // 2),
+    }
+
+def _vad_worker_score(slot, nbytes, window_start_seconds):
+    """
+    Score the PCM window stored in shared-memory slot `slot` (runs in a VAD pool worker).
+    """
+    worker = _VAD_WORKER
+    base = slot * worker["slot_bytes"]
+    # Zero-copy view of the slot; the parent doesn't reuse it until this call returns.
+    return score_vad_window(
+        worker["shm"].buf[base:base + nbytes],
+        window_start_seconds,
+        worker["vad"],
+        worker["vad_params"],
+        float_buffer=worker["float_buffer"],
+        return_probs=worker["return_probs"],
+        energy_floor_db=worker["energy_floor_db"],
+        stock_segmenter=worker["stock_segmenter"],
+    )
+
+def _detect_speech_segments_parallel(windows, workers, slot_bytes, vad_params, backend="torch", return_probs=False, energy_floor_db=None, stock_segmenter=False):
+    """
+    Score PCM windows concurrently in a pool of worker processes.
+    Windows are handed over through a shared-memory block of 2 * workers slots (bounded memory);
+    results are merged in window order, so output matches the serial path.
+    Returns the per-window score_vad_window results, in window order.
+    """
+    import multiprocessing
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    from concurrent.futures.process import BrokenProcessPool
+    from multiprocessing import shared_memory
+
+    num_slots = workers * 2
+    shm = shared_memory.SharedMemory(create=True, size=num_slots * slot_bytes)
+    free_slots = list(range(num_slots))
+    pending = {}
+    results = {}
+
+    def _collect(done):
+        for future in done:
+            window_idx, slot = pending.pop(future)
+            results[window_idx] = future.result()
+            free_slots.append(slot)
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_vad_worker_init,
+            initargs=(shm.name, slot_bytes, vad_params, backend, return_probs, energy_floor_db, stock_segmenter),
+        ) as executor:
+            for window_idx, (window_view, window_start_seconds) in enumerate(windows):
+                if not free_slots:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    _collect(done)
+                slot = free_slots.pop()
+                base = slot * slot_bytes
+                nbytes = len(window_view)
+                shm.buf[base:base + nbytes] = window_view
+                future = executor.submit(_vad_worker_score, slot, nbytes, window_start_seconds)
+                pending[future] = (window_idx, slot)
+            done, _ = wait(pending)
+            _collect(done)
+    except BrokenProcessPool as e:
+        raise RuntimeError(
+            "A VAD worker process failed to start or crashed. "
+            "Re-run with --vad-workers 1 to see the underlying error."
+        ) from e
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return [results[window_idx] for window_idx in sorted(results)]
+
+def detect_speech_segments_silero(
+    input_file,
+    vad_threshold,
+    offset=0.0,
+    process_duration=None,
+    sample_rate=16000,
+    chunk_seconds=30.0,
+    overlap_seconds=1.0,
+    min_speech_duration_ms=200,
+    min_silence_duration_ms=100,
+    speech_pad_ms=50,
+    workers=1,
+    use_server=True,
+    backend="torch",
+    return_probs=False,
+    resume_from=None,
+    energy_floor_db=None,
+    stats=None,
+    stock_segmenter=False,
+):
+    """
+    Detect speech segments in the input using Silero VAD.
+    With workers > 1, PCM windows are scored concurrently in worker processes; the result is
+    identical to the serial path.
+    With use_server, the job is handed to a running warm VAD worker (vad_server.py) if one is
+    listening, skipping torch import and model load; otherwise inference runs in-process.
+    backend selects the inference backend (see load_vad_backend); all backends share this contract.
+    With return_probs, the per-window speech probability track is returned as well, so segments can
+    later be recomputed for other parameters without inference (segments_from_probability_track).
+    The returned segments don't depend on return_probs: they come from the unquantized probabilities.
+    With resume_from (a probability track from an earlier run over the same region), its complete
+    windows are reused and only audio after them is decoded and scored, e.g. for a recording that
+    is still growing; implies return_probs and in-process inference.
+    With energy_floor_db, audio quieter than that RMS level (dBFS) is marked non-speech without
+    running the model. If stats (a dict) is given, it is updated with "analyzed_seconds" and
+    "inferred_seconds" (audio actually sent to the model) for the audio scored in this call
+    (with probabilities or the gate only).
+    With stock_segmenter, segments come from silero_vad's own get_speech_timestamps (torch backend,
+    in-process; see score_vad_window), as a reference for the pipeline's segmenter.
+
+    Returns list of (start_seconds, end_seconds) tuples, relative to the processed region starting at 0
+    (and the probability track if return_probs).
+    """
+    if overlap_seconds < 0:
+        raise ValueError("overlap_seconds must be >= 0")
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    if backend not in VAD_BACKENDS:
+        raise ValueError(f"unknown VAD backend: {backend!r} (expected one of {', '.join(VAD_BACKENDS)})")
+
+    vad_params = {
+        "threshold": vad_threshold,
+        "sampling_rate": sample_rate,
+        "min_speech_duration_ms": min_speech_duration_ms,
+        "min_silence_duration_ms": min_silence_duration_ms,
+        "speech_pad_ms": speech_pad_ms,
+    }
+    chunk_samples = int(sample_rate * chunk_seconds)
+    overlap_samples = int(overlap_seconds * sample_rate)
+
+    kept_chunks = []
+    if resume_from is not None:
+        if (resume_from.get("sample_rate") != sample_rate
+                or resume_from.get("chunk_seconds") != chunk_seconds
+                or resume_from.get("overlap_seconds") != overlap_seconds
+                or resume_from.get("complete_windows") is None):
+            raise ValueError("resume_from track was produced with different chunking; run a full detection")
+        kept_chunks = list(resume_from["chunks"][:resume_from["complete_windows"]])
+        return_probs = True
+        use_server = False
+    if stock_segmenter:
+        use_server = False
+    # The gate works on probabilities; the per-window records also carry the inference counts.
+    want_probs = return_probs
+    if energy_floor_db is not None:
+        return_probs = True
+
+    if use_server:
+        reply = request_vad_server({
+            "op": "detect",
+            "input": os.path.abspath(input_file),
+            "vad_threshold": vad_threshold,
+            "offset": offset,
+            "process_duration": process_duration,
+            "sample_rate": sample_rate,
+            "chunk_seconds": chunk_seconds,
+            "overlap_seconds": overlap_seconds,
+            "min_speech_duration_ms": min_speech_duration_ms,
+            "min_silence_duration_ms": min_silence_duration_ms,
+            "speech_pad_ms": speech_pad_ms,
+            "workers": workers,
+            "backend": backend,
+            "return_probs": want_probs,
+            "energy_floor_db": energy_floor_db,
+        })
+        if reply is not None:
+            segments = [(float(start), float(end)) for start, end in reply["segments"]]
+            if stats is not None and "stats" in reply:
+                stats.update(reply["stats"])
+            if want_probs:
+                return segments, decode_probability_track(reply["probabilities"])
+            return segments
+
+    # Resuming: decode from the previous window's tail before the first chunk not yet analyzed.
+    start_seconds = (len(kept_chunks) * chunk_samples) / sample_rate
+    tail_seconds = min(overlap_samples / sample_rate, start_seconds)
+    decode_start = start_seconds - tail_seconds
+    if process_duration and decode_start >= process_duration:
+        windows = iter(())
+    else:
+        windows = stream_audio_pcm_s16le_windows(
+            input_file,
+            offset=offset + decode_start,
+            process_duration=(process_duration - decode_start) if process_duration else None,
+            sample_rate=sample_rate,
+            chunk_seconds=chunk_seconds,
+            overlap_seconds=overlap_seconds,
+            start_seconds=decode_start,
+            tail_seconds=tail_seconds,
+        )
+
+    # Largest possible window: overlap tail + one chunk.
+    window_samples = overlap_samples + chunk_samples
+    if workers > 1:
+        # Surface missing dependencies here rather than as a broken worker pool.
+        if backend == "torch":
+            import_vad_dependencies()
+        else:
+            import_onnx_vad_dependencies()
+        # Pool wall time; PCM reads happen inside it and are also counted as pcm_extract.
+        with metrics_stage("vad_inference"):
+            results = _detect_speech_segments_parallel(
+                windows, workers, window_samples * 2, vad_params,
+                backend=backend, return_probs=return_probs, energy_floor_db=energy_floor_db,
+                stock_segmenter=stock_segmenter,
+            )
+    else:
+        with metrics_stage("vad_model_load"):
+            vad = get_vad_backend(backend)
+        float_buffer = allocate_vad_float_buffer(vad, window_samples)
+        results = []
+        for window_view, window_start_seconds in windows:
+            with metrics_stage("vad_inference"):
+                results.append(score_vad_window(
+                    window_view,
+                    window_start_seconds,
+                    vad,
+                    vad_params,
+                    float_buffer=float_buffer,
+                    return_probs=return_probs,
+                    energy_floor_db=energy_floor_db,
+                    stock_segmenter=stock_segmenter,
+                ))
+    metrics_count("vad_windows", len(results))
+
+    if stats is not None and return_probs:
+        # Window audio is counted including the overlap tails, for both totals.
+        stats.update({
+            "analyzed_seconds": sum(chunk["samples"] for _, chunk in results) / sample_rate,
+            "inferred_seconds": sum(
+                chunk.get("inferred_samples", chunk["samples"]) for _, chunk in results
+            ) / sample_rate,
+        })
+
+    if not return_probs:
+        return [seg for window_segments in results for seg in window_segments]
+    for _, chunk in results:
+        chunk.pop("inferred_samples", None)
+    chunks = kept_chunks + [chunk for _, chunk in results]
+    # Only the last window can be short (end of input so far); it is redone when resuming.
+    complete_windows = len(chunks)
+    if chunks and chunks[-1]["samples"] != chunk_samples + (overlap_samples if len(chunks) > 1 else 0):
+        complete_windows -= 1
+    track = {
+        "sample_rate": sample_rate,
+        "window_samples": 512 if sample_rate == 16000 else 256,
+        "chunk_seconds": chunk_seconds,
+        "overlap_seconds": overlap_seconds,
+        "complete_windows": complete_windows,
+        "chunks": chunks,
+    }
+    all_segments = segments_from_probability_track(
+        {"sample_rate": sample_rate, "chunks": kept_chunks},
+        vad_threshold,
+        min_speech_duration_ms=min_speech_duration_ms,
+        min_silence_duration_ms=min_silence_duration_ms,
+        speech_pad_ms=speech_pad_ms,
+    )
+    all_segments.extend(seg for window_segments, _ in results for seg in window_segments)
+    if not want_probs:
+        return all_segments
+    return all_segments, track
+
+def format_energy_gate_stats(stats):
+    """One-line summary of how much audio the energy gate sent to the model."""
+    analyzed = stats.get("analyzed_seconds") or 0.0
+    inferred = stats.get("inferred_seconds") or 0.0
+    fraction = (inferred / analyzed * 100) if analyzed > 0 else 0.0
+    return f"Energy gate: {fraction:.1f}% of audio inferred ({inferred:.1f}s of {analyzed:.1f}s)"
+
+def segments_from_probability_track(
+    track,
+    vad_threshold,
+    min_speech_duration_ms=200,
+    min_silence_duration_ms=100,
+    speech_pad_ms=50,
+):
+    """
+    Recompute raw speech segments from a stored probability track (no decoding or inference).
+    With the detection-time parameters this reproduces detect_speech_segments_silero's output up to
+    the track's uint16 quantization (a boundary can only move where a probability sits within
+    1/65535 of a threshold).
+    """
+    segments = []
+    for chunk in track["chunks"]:
+        chunk_segments = speech_probs_to_timestamps(
+            dequantize_speech_probs(chunk["probs"]),
+            chunk["samples"],
+            threshold=vad_threshold,
+            sampling_rate=track["sample_rate"],
+            min_speech_duration_ms=min_speech_duration_ms,
+            min_silence_duration_ms=min_silence_duration_ms,
+            speech_pad_ms=speech_pad_ms,
+        )
+        segments.extend(
+            (float(start) + chunk["start"], float(end) + chunk["start"]) for start, end in chunk_segments
+        )
+    return segments
+
+# Interval lists at least this long are handled by IntervalSet; below it the loops win (see
+# `python benchmark.py intervals`).
+INTERVAL_VECTOR_MIN = 512
+_INTERVAL_NUMPY = None  # numpy module once probed, False when it isn't installed
+
+def _vector_intervals(pairs):
+    """
+    IntervalSet for a list of (start, end) pairs when it is long enough to be worth vectorizing,
+    numpy is installed and every bound is a number; otherwise None (use the loop version).
+    """
+    global _INTERVAL_NUMPY
+    try:
+        size = len(pairs)
+    except TypeError:
+        return None
+    if size < INTERVAL_VECTOR_MIN:
+        return None
+    if _INTERVAL_NUMPY is None:
+        try:
+            _INTERVAL_NUMPY = import_numpy()
+        except RuntimeError:
+            _INTERVAL_NUMPY = False
+    if not _INTERVAL_NUMPY:
+        return None
+    try:
+        intervals = IntervalSet.from_pairs(pairs, _INTERVAL_NUMPY)
+    except (TypeError, ValueError):
+        return None
+    # None bounds come through as NaN; the loop versions have their own handling for them.
+    if _INTERVAL_NUMPY.isnan(intervals.starts).any() or _INTERVAL_NUMPY.isnan(intervals.ends).any():
+        return None
+    return intervals
+
+class IntervalSet:
+    """
+    A list of (start, end) intervals held as two float64 arrays, with the vectorized operations behind
+    normalize_speech_segments, the speech/silence complements, truncate_intervals_to_duration,
+    validate_silence_intervals and calculate_segments. Each operation returns exactly what the
+    corresponding loop does (they are checked against each other by `python benchmark.py intervals`).
+    """
+
+    def __init__(self, starts, ends, np):
+        self.starts = starts
+        self.ends = ends
+        self.np = np
+
+    @classmethod
+    def from_pairs(cls, pairs, np):
+        """From a list of (start, end) pairs; raises TypeError/ValueError for a bound that isn't a number."""
+        bounds = np.fromiter(itertools.chain.from_iterable(pairs), dtype=np.float64, count=2 * len(pairs))
+        return cls(bounds[0::2], bounds[1::2], np)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def to_pairs(self):
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def _select(self, index):
+        return IntervalSet(self.starts[index], self.ends[index], self.np)
+
+    def nonempty(self):
+        """Drop intervals with end <= start."""
+        return self._select(~(self.ends <= self.starts))
+
+    def sorted(self):
+        """Stable sort by start (equal starts keep their order, as list.sort does)."""
+        return self._select(self.np.argsort(self.starts, kind="stable"))
+
+    def _merge_where(self, breaks):
+        """Collapse runs of intervals into one; `breaks[i]` is True where interval i+1 opens a new run."""
+        np = self.np
+        if len(self) == 0:
+            return self
+        firsts = np.concatenate(([0], np.flatnonzero(breaks) + 1))
+        return IntervalSet(self.starts[firsts], np.maximum.reduceat(self.ends, firsts), np)
+
+    def merge(self, gap):
+        """
+        Merge a start-sorted, non-empty set: an interval joins the run before it when it starts at
+        most `gap` (>= 0) seconds after the run's end.
+        """
+        running_end = self.np.maximum.accumulate(self.ends)
+        return self._merge_where(self.starts[1:] - running_end[:-1] > gap)
+
+    def merge_touching(self, tolerance):
+        """Like merge(), but joining when start <= run end + tolerance (>= 0)."""
+        running_end = self.np.maximum.accumulate(self.ends)
+        return self._merge_where(self.starts[1:] > running_end[:-1] + tolerance)
+
+    def pad(self, seconds, low, high):
+        """Widen each interval by `seconds` on both sides, clamp to [low, high] and drop empty results."""
+        np = self.np
+        starts = np.maximum(low, self.starts - seconds)
+        ends = np.minimum(high, self.ends + seconds)
+        keep = ends > starts
+        return IntervalSet(starts[keep], ends[keep], np)
+
+    def complement(self, total):
+        """
+        The gaps of [0, total] walking the intervals in order: a gap opens wherever an interval starts
+        after every earlier one has ended. An empty set complements to [(0, total)].
+        """
+        np = self.np
+        total = float(total)
+        if len(self) == 0:
+            return IntervalSet(np.array([0.0]), np.array([total]), np)
+        covered = np.maximum(0.0, np.maximum.accumulate(self.ends))
+        prev = np.concatenate(([0.0], covered[:-1]))
+        gap = self.starts > prev
+        starts, ends = prev[gap], self.starts[gap]
+        if covered[-1] < total:
+            starts = np.append(starts, covered[-1])
+            ends = np.append(ends, total)
+        return IntervalSet(starts, ends, np)
+
+    def truncate(self, limit):
+        """Keep the intervals before the first one starting at or past `limit`, ends clamped to it."""
+        np = self.np
+        past = np.flatnonzero(self.starts >= limit)
+        count = int(past[0]) if len(past) else len(self)
+        return IntervalSet(self.starts[:count], np.minimum(self.ends[:count], limit), np)
+
+    def first_invalid(self, max_end):
+        """Index of the first interval validate_silence_intervals would reject, or None."""
+        np = self.np
+        starts, ends = self.starts, self.ends
+        prev = np.concatenate(([0.0], ends[:-1]))
+        invalid = (starts < 0) | (ends < 0) | (ends < starts) | (starts < prev) | (ends > max_end + 1e-6)
+        index = np.flatnonzero(invalid)
+        return int(index[0]) if len(index) else None
+
+    def render_segments(self, duration, buffer_duration):
+        """
+        calculate_segments for these silence intervals. Each silence is preceded by the non-silent
+        gap before it (if any); a silence followed by a non-silent part keeps its last
+        `buffer_duration` seconds at normal speed, or plays entirely at normal speed when it is
+        not longer than the buffer.
+        """
+        np = self.np
+        starts, ends = self.starts, self.ends
+        count = len(self)
+        tail_start = float(ends[-1]) if count else 0.0
+        has_tail = tail_start < duration
+        prev = np.concatenate(([0.0], ends[:-1]))
+        gap_before = starts > prev
+        followed = np.concatenate((starts[1:] > ends[:-1], [has_tail])) if count else gap_before
+        buffered = followed & (ends - starts > buffer_duration)
+        normal = followed & ~buffered
+        cut = np.maximum(starts, ends - buffer_duration)
+
+        # Output rows per silence: [gap], silence (or its cut-down part), [buffer].
+        rows = gap_before.astype(np.int64) + 1 + buffered
+        first = np.cumsum(rows) - rows
+        size = int(rows.sum()) + has_tail
+        out_starts = np.empty(size)
+        out_ends = np.empty(size)
+        silent = np.zeros(size, dtype=bool)
+
+        gap_rows = first[gap_before]
+        out_starts[gap_rows] = prev[gap_before]
+        out_ends[gap_rows] = starts[gap_before]
+        main_rows = first + gap_before
+        out_starts[main_rows] = starts
+        out_ends[main_rows] = np.where(buffered, cut, ends)
+        silent[main_rows] = ~normal
+        buffer_rows = main_rows[buffered] + 1
+        out_starts[buffer_rows] = cut[buffered]
+        out_ends[buffer_rows] = ends[buffered]
+        if has_tail:
+            out_starts[-1] = tail_start
+            out_ends[-1] = duration
+
+        kinds = np.where(silent, "silent", "non-silent").tolist()
+        return list(zip(out_starts.tolist(), out_ends.tolist(), kinds))
+
+@timed_stage("interval_normalisation")
+def normalize_speech_segments(
+    speech_segments,
+    max_end,
+    merge_gap_seconds=0.3,
+    pad_seconds=0.05,
+    merge_tolerance_seconds=0.1,
+):
+    """
+    Merge, pad, and clamp speech segments to reduce fragmentation and avoid boundary clipping.
+    """
+    if max_end < 0:
+        raise ValueError("max_end must be >= 0")
+    intervals = _vector_intervals(speech_segments)
+    if intervals is None or merge_gap_seconds < 0 or merge_tolerance_seconds < 0:
+        return _normalize_speech_segments_py(
+            speech_segments, max_end, merge_gap_seconds, pad_seconds, merge_tolerance_seconds
+        )
+    merged = intervals.nonempty().sorted().merge(merge_gap_seconds)
+    padded = merged.pad(pad_seconds, 0.0, max_end)
+    return padded.merge_touching(merge_tolerance_seconds).to_pairs()
+
+def _normalize_speech_segments_py(speech_segments, max_end, merge_gap_seconds, pad_seconds, merge_tolerance_seconds):
+    """Loop version of normalize_speech_segments (small inputs, or numpy not installed)."""
+    cleaned = []
+    for start, end in speech_segments:
+        try:
+            start_f = float(start)
+            end_f = float(end)
+        except (TypeError, ValueError):
+            continue
+        if end_f <= start_f:
+            continue
+        cleaned.append((start_f, end_f))
+
+    if not cleaned:
+        return []
+
+    cleaned.sort(key=lambda x: x[0])
+
+    # Merge segments that overlap or are separated by a small gap.
+    merged = [cleaned[0]]
+    for start, end in cleaned[1:]:
+        last_start, last_end = merged[-1]
+        gap = start - last_end
+        if gap <= merge_gap_seconds:
+            merged[-1] = (last_start, max(last_end, end))
+        else:
+            merged.append((start, end))
+
+    # Pad and clamp.
+    padded = []
+    for start, end in merged:
+        padded_start = max(0.0, start - pad_seconds)
+        padded_end = min(max_end, end + pad_seconds)
+        if padded_end > padded_start:
+            padded.append((padded_start, padded_end))
+
+    if not padded:
+        return []
+
+    # Merge again after padding to remove overlaps.
+    padded.sort(key=lambda x: x[0])
+    final = [padded[0]]
+    for start, end in padded[1:]:
+        last_start, last_end = final[-1]
+        if start <= last_end + merge_tolerance_seconds:
+            final[-1] = (last_start, max(last_end, end))
+        else:
+            final.append((start, end))
+
+    return final
+
+@timed_stage("interval_normalisation")
+def speech_segments_to_silence_intervals(speech_segments, total_duration):
+    """
+    Convert speech segments into non-speech ("silence") intervals for the existing pipeline.
+
+    - If no speech is detected: returns [(0, total_duration)] (all silence / all sped-up).
+    - If speech covers entire duration: returns [] (no silence to speed up).
+    """
+    if total_duration < 0:
+        raise ValueError("total_duration must be >= 0")
+    intervals = _vector_intervals(speech_segments)
+    if intervals is not None:
+        return intervals.complement(total_duration).to_pairs()
+    return _complement_intervals_py(speech_segments, total_duration)
+
+def _complement_intervals_py(speech_segments, total_duration):
+    """
+    Loop version of speech_segments_to_silence_intervals / silence_intervals_to_speech_segments
+    (small inputs, or numpy not installed).
+    """
+    if not speech_segments:
+        return [(0.0, float(total_duration))]
+
+    intervals = []
+    prev_end = 0.0
+    for start, end in speech_segments:
+        if start > prev_end:
+            intervals.append((prev_end, start))
+        prev_end = max(prev_end, end)
+
+    if prev_end < total_duration:
+        intervals.append((prev_end, float(total_duration)))
+
+    # If speech starts at 0 and runs through end, there will be no intervals (correct).
+    return intervals
+
+def validate_silence_intervals(silence_intervals, max_end):
+    """
+    Validate silence intervals are ordered, non-negative, and within [0, max_end].
+    """
+    intervals = _vector_intervals(silence_intervals)
+    if intervals is not None and intervals.first_invalid(max_end) is None:
+        return
+    # Small input, or one is invalid: the loop finds it and words the error.
+    _validate_silence_intervals_py(silence_intervals, max_end)
+
+def _validate_silence_intervals_py(silence_intervals, max_end):
+    prev_end = 0.0
+    for idx, (start, end) in enumerate(silence_intervals):
+        if start is None or end is None:
+            raise ValueError(f"silence interval {idx} has open-ended bound (start={start}, end={end})")
+        if start < 0 or end < 0:
+            raise ValueError(f"silence interval {idx} is negative: ({start}, {end})")
+        if end < start:
+            raise ValueError(f"silence interval {idx} has end < start: ({start}, {end})")
+        if start < prev_end:
+            raise ValueError(f"silence interval {idx} overlaps or is unsorted: ({start}, {end})")
+        if end > max_end + 1e-6:
+            raise ValueError(f"silence interval {idx} exceeds max_end={max_end}: ({start}, {end})")
+        prev_end = end
+
+@timed_stage("interval_normalisation")
+def silence_intervals_to_speech_segments(silence_intervals, total_duration):
+    """
+    Convert silence intervals into speech segments (the inverse of speech_segments_to_silence_intervals).
+    Used when the silencedetect backend provides silence intervals directly and we need
+    speech_segments for the sidecar file.
+    """
+    intervals = _vector_intervals(silence_intervals)
+    if intervals is not None:
+        return intervals.complement(total_duration).to_pairs()
+    return _complement_intervals_py(silence_intervals, total_duration)
+
+def encode_probability_track(track):
+    """
+    JSON-serializable form of a probability track: per-chunk uint16 little-endian probabilities, base64.
+    """
+    import base64
+    from array import array
+
+    chunks = []
+    for chunk in track["chunks"]:
+        probs = array("H", chunk["probs"])
+        if sys.byteorder == "big":
+            probs.byteswap()
+        chunks.append({
+            "start": chunk["start"],
+            "samples": chunk["samples"],
+            "probs": base64.b64encode(probs.tobytes()).decode("ascii"),
+        })
+    encoded = {
+        "encoding": "uint16le-base64",
+        "sample_rate": track["sample_rate"],
+        "window_samples": track["window_samples"],
+    }
+    # Chunking and completeness, needed to resume detection (absent in tracks written before resume support).
+    for key in ("chunk_seconds", "overlap_seconds", "complete_windows"):
+        if track.get(key) is not None:
+            encoded[key] = track[key]
+    encoded["chunks"] = chunks
+    return encoded
+
+def decode_probability_track(encoded):
+    """
+    Inverse of encode_probability_track.
+    """
+    import base64
+    from array import array
+
+    if encoded.get("encoding") != "uint16le-base64":
+        raise ValueError(f"unsupported probability encoding: {encoded.get('encoding')!r}")
+    chunks = []
+    for chunk in encoded["chunks"]:
+        probs = array("H")
+        probs.frombytes(base64.b64decode(chunk["probs"]))
+        if sys.byteorder == "big":
+            probs.byteswap()
+        chunks.append({"start": float(chunk["start"]), "samples": int(chunk["samples"]), "probs": probs})
+    return {
+        "sample_rate": int(encoded["sample_rate"]),
+        "window_samples": int(encoded["window_samples"]),
+        "chunk_seconds": encoded.get("chunk_seconds"),
+        "overlap_seconds": encoded.get("overlap_seconds"),
+        "complete_windows": encoded.get("complete_windows"),
+        "chunks": chunks,
+    }
+
+def write_vad_metadata(input_file, speech_segments, silence_intervals, analyzed_duration,
+                       backend, params, probabilities=None, sidecar_path=None, sidecar_format="json"):
+    """
+    Write a .vad.json sidecar file next to the input video.
+    Schema v2: version, source, detection (backend, analyzed_duration, params),
+    speech_segments as [[s,e],...], silence_intervals as [[s,e],...], and optionally
+    probabilities (encode_probability_track) for re-thresholding without inference.
+    v1 is the same without probabilities.
+    With sidecar_format="bin", the same payload is written as a .vad.bin (see write_vad_binary).
+    """
+    import json
+
+    if sidecar_path is None:
+        extension = ".vad.bin" if sidecar_format == "bin" else ".vad.json"
+        sidecar_path = os.path.splitext(input_file)[0] + extension
+    payload = {
+        "version": 2,
+        "source": {
+            "file": os.path.basename(input_file),
+        },
+        "detection": {
             "backend": backend,
             "analyzed_duration": round(analyzed_duration, 3),
             "params": params,
@@ -693,10 +2564,15 @@ def write_vad_metadata(input_file, speech_segments, silence_intervals, analyzed_
         "speech_segments": [[round(s, 3), round(e, 3)] for s, e in speech_segments],
         "silence_intervals": [[round(s, 3), round(e, 3)] for s, e in silence_intervals],
     }
+    if probabilities is not None:
+        payload["probabilities"] = encode_probability_track(probabilities)
     try:
-        with open(sidecar_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, indent=2)
-            f.write("\n")
+        if sidecar_format == "bin":
+            write_vad_binary(sidecar_path, payload)
+        else:
+            with open(sidecar_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+                f.write("\n")
     except PermissionError:
         sidecar_dir = os.path.dirname(os.path.abspath(sidecar_path))
         print(f"Error: Cannot write sidecar — check write permissions for: {sidecar_dir}",
@@ -704,436 +2580,2080 @@ def write_vad_metadata(input_file, speech_segments, silence_intervals, analyzed_
         sys.exit(1)
     return sidecar_path
 
-def load_vad_metadata(vad_json_path):
+# Binary sidecar (.vad.bin) layout, little-endian:
+#   header: magic, format version, analyzed_duration, then (offset, length) of the metadata JSON
+#           and (offset, count) of the speech and silence interval arrays
+#   metadata: UTF-8 JSON with every sidecar field except the interval lists
+#   arrays: packed float64 start/end pairs, 8-byte aligned, sorted and non-overlapping
+VAD_BIN_MAGIC = b"VSVADBIN"
+VAD_BIN_VERSION = 1
+_VAD_BIN_HEADER = "<8sI4xd6Q"
+
+def is_vad_binary(path):
+    with open(path, "rb") as f:
+        return f.read(len(VAD_BIN_MAGIC)) == VAD_BIN_MAGIC
+
+def write_vad_binary(path, payload):
+    """
+    Write a sidecar payload (as produced for .vad.json) in the binary .vad.bin format.
+    """
+    import json
+    import struct
+    from array import array
+
+    def _pack(intervals):
+        values = array("d", (float(t) for interval in intervals for t in interval))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def _align(n):
+        return (n + 7) & ~7
+
+    metadata = {k: v for k, v in payload.items() if k not in ("speech_segments", "silence_intervals")}
+    meta_bytes = json.dumps(metadata, separators=(",", ":")).encode("utf-8")
+    speech_bytes = _pack(payload["speech_segments"])
+    silence_bytes = _pack(payload["silence_intervals"])
+
+    meta_offset = struct.calcsize(_VAD_BIN_HEADER)
+    speech_offset = _align(meta_offset + len(meta_bytes))
+    silence_offset = speech_offset + len(speech_bytes)
+    header = struct.pack(
+        _VAD_BIN_HEADER,
+        VAD_BIN_MAGIC,
+        VAD_BIN_VERSION,
+        float(payload["detection"]["analyzed_duration"]),
+        meta_offset, len(meta_bytes),
+        speech_offset, len(payload["speech_segments"]),
+        silence_offset, len(payload["silence_intervals"]),
+    )
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(meta_bytes)
+        f.write(b"\0" * (speech_offset - meta_offset - len(meta_bytes)))
+        f.write(speech_bytes)
+        f.write(silence_bytes)
+    return path
+
+class VadBinarySidecar:
+    """
+    Memory-mapped reader for .vad.bin sidecars. Interval arrays are read in place and can be
+    windowed by binary search; the metadata JSON is only parsed when asked for.
+    """
+
+    def __init__(self, path):
+        import mmap
+        import struct
+
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header_size = struct.calcsize(_VAD_BIN_HEADER)
+        if len(self._mmap) < header_size:
+            self.close()
+            raise ValueError(f"{path}: truncated .vad.bin header")
+        (magic, version, self.analyzed_duration, self._meta_offset, self._meta_length,
+         speech_offset, speech_count, silence_offset, silence_count) = struct.unpack_from(
+            _VAD_BIN_HEADER, self._mmap, 0
+        )
+        if magic != VAD_BIN_MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not a .vad.bin sidecar")
+        if version != VAD_BIN_VERSION:
+            self.close()
+            raise ValueError(f"{path}: unsupported .vad.bin version {version}")
+        self._arrays = {
+            "speech_segments": (speech_offset, speech_count),
+            "silence_intervals": (silence_offset, silence_count),
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def metadata(self):
+        import json
+
+        raw = self._mmap[self._meta_offset:self._meta_offset + self._meta_length]
+        return json.loads(raw.decode("utf-8"))
+
+    def intervals(self, kind="silence_intervals", window=None):
+        """
+        Return intervals of `kind` as (start, end) tuples. With window=(start, end), only the
+        intervals overlapping it are read, clipped to it.
+        """
+        import struct
+
+        offset, count = self._arrays[kind]
+        values = None
+        if sys.byteorder == "big":
+            def value(i):
+                return struct.unpack_from("<d", self._mmap, offset + 8 * i)[0]
+        else:
+            values = memoryview(self._mmap)[offset:offset + 16 * count].cast("d")
+            value = values.__getitem__
+
+        try:
+            first, last = 0, count
+            if window is not None:
+                window_start, window_end = window
+                # First interval ending after window_start; first interval starting at/after window_end.
+                lo, hi = 0, count
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if value(2 * mid + 1) <= window_start:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                first = lo
+                lo, hi = first, count
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if value(2 * mid) < window_end:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+                last = lo
+
+            result = []
+            for i in range(first, last):
+                start, end = value(2 * i), value(2 * i + 1)
+                if window is not None:
+                    start, end = max(start, window[0]), min(end, window[1])
+                    if end <= start:
+                        continue
+                result.append((start, end))
+            return result
+        finally:
+            # The map can't be closed while a view into it is alive.
+            if values is not None:
+                del value
+                values.release()
+
+    def payload(self):
+        """
+        Full sidecar payload, in the same shape as a parsed .vad.json.
+        """
+        data = self.metadata()
+        data["speech_segments"] = [list(interval) for interval in self.intervals("speech_segments")]
+        data["silence_intervals"] = [list(interval) for interval in self.intervals("silence_intervals")]
+        return data
+
+def convert_vad_sidecar(src_path, dst_path=None):
+    """
+    Convert a sidecar between .vad.json and .vad.bin (direction picked from the source format).
+    Returns the destination path.
+    """
+    import json
+
+    if is_vad_binary(src_path):
+        with VadBinarySidecar(src_path) as sidecar:
+            payload = sidecar.payload()
+        if dst_path is None:
+            dst_path = _swap_sidecar_extension(src_path, ".vad.json")
+        with open(dst_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+            f.write("\n")
+        return dst_path
+
+    payload = read_vad_sidecar(src_path)
+    if dst_path is None:
+        dst_path = _swap_sidecar_extension(src_path, ".vad.bin")
+    return write_vad_binary(dst_path, payload)
+
+def _swap_sidecar_extension(path, extension):
+    for known in (".vad.json", ".vad.bin"):
+        if path.endswith(known):
+            return path[:-len(known)] + extension
+    return os.path.splitext(path)[0] + extension
+
+def read_vad_sidecar(vad_json_path):
+    """
+    Read a sidecar file (.vad.json, or .vad.bin by magic) and validate its version (1 or 2).
+    Returns the parsed payload.
+    """
+    import json
+
+    if is_vad_binary(vad_json_path):
+        with VadBinarySidecar(vad_json_path) as sidecar:
+            data = sidecar.payload()
+    else:
+        with open(vad_json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+    version = data.get("version")
+    if version not in (1, 2):
+        print(f"Unsupported vad.json version: {version}", file=sys.stderr)
+        sys.exit(1)
+    return data
+
+def load_vad_metadata(vad_json_path, window=None):
+    """
+    Load a sidecar file (.vad.json, or .vad.bin by magic). Validates version (1 or 2).
+    With window=(start, end), only silence intervals overlapping it are returned, clipped to it;
+    .vad.bin sidecars read just that range from the memory-mapped file.
+    Returns (silence_intervals, analyzed_duration) where silence_intervals
+    is a list of (start, end) tuples.
+    """
+    if is_vad_binary(vad_json_path):
+        try:
+            with VadBinarySidecar(vad_json_path) as sidecar:
+                return sidecar.intervals("silence_intervals", window=window), sidecar.analyzed_duration
+        except ValueError as e:
+            print(f"Invalid .vad.bin sidecar: {e}", file=sys.stderr)
+            sys.exit(1)
+
+    data = read_vad_sidecar(vad_json_path)
+    silence_intervals = [(float(s), float(e)) for s, e in data["silence_intervals"]]
+    if window is not None:
+        silence_intervals = [
+            (max(s, window[0]), min(e, window[1]))
+            for s, e in silence_intervals
+            if min(e, window[1]) > max(s, window[0])
+        ]
+    analyzed_duration = float(data["detection"]["analyzed_duration"])
+    return silence_intervals, analyzed_duration
+
+def retune_vad_metadata(vad_json_path, vad_threshold, min_speech_duration_ms=200,
+                        min_silence_duration_ms=100, speech_pad_ms=50,
+                        merge_gap_seconds=0.3, pad_seconds=0.05):
+    """
+    Recompute speech segments and silence intervals for new VAD/normalization parameters from the
+    probability track stored in a v2 sidecar (no decoding or inference).
+    Returns (speech_segments, silence_intervals, analyzed_duration, sidecar_payload).
+    """
+    data = read_vad_sidecar(vad_json_path)
+    if "probabilities" not in data:
+        print(f"Error: {vad_json_path} has no stored VAD probabilities; "
+              f"re-run --detect with VAD to create a retunable sidecar.", file=sys.stderr)
+        sys.exit(1)
+    track = decode_probability_track(data["probabilities"])
+    analyzed_duration = float(data["detection"]["analyzed_duration"])
+    speech_segments_raw = segments_from_probability_track(
+        track,
+        vad_threshold,
+        min_speech_duration_ms=min_speech_duration_ms,
+        min_silence_duration_ms=min_silence_duration_ms,
+        speech_pad_ms=speech_pad_ms,
+    )
+    speech_segments = normalize_speech_segments(
+        speech_segments_raw,
+        max_end=analyzed_duration,
+        merge_gap_seconds=merge_gap_seconds,
+        pad_seconds=pad_seconds,
+    )
+    silence_intervals = speech_segments_to_silence_intervals(
+        speech_segments, total_duration=analyzed_duration
+    )
+    return speech_segments, silence_intervals, analyzed_duration, data
+
+@timed_stage("interval_normalisation")
+def truncate_intervals_to_duration(intervals, max_duration):
+    """
+    Truncate silence intervals to fit within [0, max_duration].
+    Drops intervals that start past max_duration; clamps end to max_duration.
+    """
+    vector = _vector_intervals(intervals)
+    if vector is not None:
+        return vector.truncate(max_duration).to_pairs()
+    return _truncate_intervals_py(intervals, max_duration)
+
+def _truncate_intervals_py(intervals, max_duration):
+    result = []
+    for start, end in intervals:
+        if start >= max_duration:
+            break
+        result.append((start, min(end, max_duration)))
+    return result
+
+def discover_videos(folder, extensions):
+    """
+    Scan a folder for video files matching the given extensions (comma-separated string).
+    Returns a sorted list of absolute paths. Excludes *.vad.json files.
+    """
+    ext_list = [e.strip().lower().lstrip(".") for e in extensions.split(",") if e.strip()]
+    videos = []
+    for entry in os.listdir(folder):
+        filepath = os.path.join(folder, entry)
+        if not os.path.isfile(filepath):
+            continue
+        if entry.lower().endswith(".vad.json"):
+            continue
+        _, ext = os.path.splitext(entry)
+        if ext.lower().lstrip(".") in ext_list:
+            videos.append(filepath)
+    videos.sort()
+    return videos
+
+def discover_sidecar(folder):
+    """
+    Find exactly one sidecar (.vad.json or .vad.bin) in folder; when both formats exist for the
+    same recording, the .vad.bin is used.
+    Returns the path if exactly one found.
+    Prints error and exits if zero or multiple found.
+    """
+    import glob
+    by_base = {}
+    for extension in (".vad.json", ".vad.bin"):
+        for path in glob.glob(os.path.join(folder, "*" + extension)):
+            by_base[path[:-len(extension)]] = path
+    sidecars = sorted(by_base.values())
+    if len(sidecars) == 0:
+        print(f"Error: No .vad.json or .vad.bin sidecar found in '{folder}'.", file=sys.stderr)
+        sys.exit(1)
+    if len(sidecars) > 1:
+        print(f"Error: Multiple sidecars found in '{folder}':", file=sys.stderr)
+        for s in sidecars:
+            print(f"  {s}", file=sys.stderr)
+        print("Specify which to use with --vad-json.", file=sys.stderr)
+        sys.exit(1)
+    print(f"Auto-discovered sidecar: {sidecars[0]}")
+    return sidecars[0]
+
+@timed_stage("interval_normalisation")
+def calculate_segments(silence_intervals, video_duration, buffer_duration=2.0):
+    """
+    Given silence intervals and total duration, returns a list of segments:
+    Each segment is (start, end, type) where type is 'silent' or 'non-silent'.
+    Adds a buffer of normal speed (non-silent) before each non-silent segment.
+    """
+    intervals = _vector_intervals(silence_intervals)
+    if intervals is None:
+        return _calculate_segments_py(silence_intervals, video_duration, buffer_duration)
+    return intervals.render_segments(video_duration, buffer_duration)
+
+def _calculate_segments_py(silence_intervals, video_duration, buffer_duration):
+    """Loop version of calculate_segments (small inputs, open-ended silences, or numpy not installed)."""
+    segments = []
+    prev_end = 0.0
+    for start, end in silence_intervals:
+        # Non-silent before this silence
+        if start > prev_end:
+            segments.append((prev_end, start, "non-silent"))
+        # Silent segment
+        if end is not None:
+            segments.append((start, end, "silent"))
+            prev_end = end
+        else:
+            # Open-ended silence (shouldn't happen, but handle gracefully)
+            segments.append((start, video_duration, "silent"))
+            prev_end = video_duration
+    # Any remaining non-silent at the end
+    if prev_end < video_duration:
+        segments.append((prev_end, video_duration, "non-silent"))
+
+    # Post-process to add buffer before each non-silent segment
+    adjusted_segments = []
+    i = 0
+    while i < len(segments):
+        seg = segments[i]
+        if seg[2] == "silent" and i + 1 < len(segments) and segments[i + 1][2] == "non-silent":
+            silent_start, silent_end, _ = seg
+            next_non_silent_start, next_non_silent_end, _ = segments[i + 1]
+            # Only adjust if silent segment is longer than buffer
+            if silent_end - silent_start > buffer_duration:
+                # Shorten silent segment
+                new_silent_end = max(silent_start, silent_end - buffer_duration)
+                adjusted_segments.append((silent_start, new_silent_end, "silent"))
+                # Insert buffer as non-silent
+                buffer_start = new_silent_end
+                buffer_end = silent_end
+                adjusted_segments.append((buffer_start, buffer_end, "non-silent"))
+                # Adjust next non-silent segment to start after buffer
+                segments[i + 1] = (buffer_end, next_non_silent_end, "non-silent")
+            else:
+                # If silent segment is too short, treat as non-silent
+                adjusted_segments.append((silent_start, silent_end, "non-silent"))
+            i += 1
+        else:
+            adjusted_segments.append(seg)
+            i += 1
+    return adjusted_segments
+
+def build_filtergraph(segments, indicator, use_gpu_decode=False, png_input_index=1, png_path="fastforward.png", audio_sample_rate=48000, audio_channel_layout="stereo", ff_frame_rate=None, streams="av"):
+    """
+    Builds a dynamic FFmpeg filtergraph string for the given segments.
+    - segments: list of (start, end, type)
+    - indicator: bool, whether to add fastforward overlay during sped-up segments
+    - use_gpu_decode: bool, whether GPU decode is active (insert hwdownload/format if True)
+    - png_input_index: index of the PNG input in FFmpeg (default 1, i.e., [1:v])
+    - png_path: path to the PNG file
+    - audio_sample_rate/audio_channel_layout: format of the generated silence for sped-up segments
+      (should match the input audio so concat needs no resampling)
+    - ff_frame_rate: output frame rate for sped-up segments; extra frames are dropped before the
+      indicator and encoder (None keeps every source frame)
+    - streams: "av" builds [vout] and [aout]; "v" or "a" builds only that output
+    Returns: filtergraph string
+    """
+    vf_parts = []
+    af_parts = []
+    concat_v = []
+    concat_a = []
+    seg_idx = 0
+
+    for start, end, typ in segments:
+        v_label = f"v{seg_idx}"
+        a_label = f"a{seg_idx}"
+        segment_duration = end - start
+        video_speed = min(compute_silent_speed(segment_duration), MAX_VIDEO_SPEED) if typ == "silent" else 1.0
+
+        # --- Audio part ---
+        if typ == "silent":
+            # Sped-up audio is muted anyway: generate silence of exactly the sped-up video duration
+            # instead of decoding, time-stretching and then discarding the source audio.
+            out_samples = max(1, int(round(segment_duration / video_speed * audio_sample_rate)))
+            af = (
+                f"anullsrc=r={audio_sample_rate}:cl={audio_channel_layout},"
+                f"atrim=end_sample={out_samples}"
+            )
+        else:
+            af = f"[0:a]atrim=start={start}:end={end},asetpts=PTS-STARTPTS"
+        af += f"[{a_label}]"
+        af_parts.append(af)
+
+        # --- Video part ---
+        vf_segment_chain = "" # Build the chain for this segment as a string
+        last_video_label = "[0:v]" # Start with the main video input
+
+        # 1. Trim and initial setpts
+        trim_label = f"trim{seg_idx}"
+        vf_segment_chain += f"{last_video_label}trim=start={start}:end={end},setpts=PTS-STARTPTS[{trim_label}]"
+        last_video_label = trim_label
+
+        # 2. Optional GPU download
+        if use_gpu_decode:
+            gpu_label = f"gpu{seg_idx}"
+            vf_segment_chain += f";[{last_video_label}]hwdownload,format=yuv420p[{gpu_label}]"
+            last_video_label = gpu_label
+
+        # 3. If silent, decimate and then speed up
+        if typ == "silent":
+            # 3a. Drop frames the sped-up output can't show: keep at most one frame per output
+            # frame interval (in input time) so the encoder only sees frames that survive.
+            if ff_frame_rate:
+                step = video_speed / ff_frame_rate
+                decimate_label = f"dec{seg_idx}"
+                vf_segment_chain += (
+                    f";[{last_video_label}]select='isnan(prev_selected_t)+gte(t-prev_selected_t,{step - 0.001:.6f})'"
+                    f"[{decimate_label}]"
+                )
+                last_video_label = decimate_label
+
+            # 3b. Apply speed change (setpts); the indicator is drawn once after concat
+            vf_segment_chain += f";[{last_video_label}]setpts=PTS/{video_speed}[{v_label}]"
+            last_video_label = v_label # Final label is v_label
+        else:
+            # If not silent, alias last_video_label to v_label
+            vf_segment_chain += f";[{last_video_label}]null[{v_label}]"
+            last_video_label = v_label
+
+        # Append the completed chain for this segment
+        vf_parts.append(vf_segment_chain)
+
+        # Add segment labels for final concat
+        concat_v.append(f"[{v_label}]")
+        concat_a.append(f"[{a_label}]")
+        seg_idx += 1
+
+    # --- Final filtergraph assembly ---
+    n = len(segments)
+    # Segment filter chains first, then the final concatenation filters
+    if indicator:
+        vf_parts.append(f"{''.join(concat_v)}concat=n={n}:v=1:a=0[vcat]") # Concat video
+        timeline = build_segment_timeline(segments, max_speed=MAX_VIDEO_SPEED)
+        vf_parts.append(build_indicator_chain(timeline, "vcat", "vout", png_input_index))
+    else:
+        vf_parts.append(f"{''.join(concat_v)}concat=n={n}:v=1:a=0[vout]") # Concat video
+    af_parts.append(f"{''.join(concat_a)}concat=n={n}:v=0:a=1[aout]") # Concat audio
+    return ";".join((vf_parts if "v" in streams else []) + (af_parts if "a" in streams else []))
+
+def build_segment_timeline(segments, max_speed=None):
+    """
+    Map segments onto the output timeline.
+    Returns a list of dicts with in_start/in_end, out_start/out_end, speed and type per segment.
+    Silent segments use compute_silent_speed (optionally capped at max_speed); others play at 1x.
+    """
+    timeline = []
+    out_cursor = 0.0
+    for seg_start, seg_end, seg_type in segments:
+        seg_start = float(seg_start)
+        seg_end = float(seg_end)
+        in_duration = max(0.0, seg_end - seg_start)
+        speed = 1.0
+        if seg_type == "silent":
+            speed = compute_silent_speed(in_duration)
+            if max_speed is not None:
+                speed = min(speed, max_speed)
+        out_duration = 0.0 if speed <= 0 else in_duration / speed
+        timeline.append(
+            {
+                "out_start": out_cursor,
+                "out_end": out_cursor + out_duration,
+                "in_start": seg_start,
+                "in_end": seg_end,
+                "speed": speed,
+                "type": seg_type,
+            }
+        )
+        out_cursor += out_duration
+    return timeline
+
+def build_piecewise_expr(breakpoints, pieces, var):
+    """
+    Build an FFmpeg expression that evaluates pieces[i] when breakpoints[i] <= var < breakpoints[i + 1].
+    The pieces are arranged as a balanced if() tree, so nesting depth and per-frame evaluation cost
+    grow with log2(len(pieces)) instead of linearly.
+    """
+    if not pieces:
+        raise ValueError("pieces must not be empty")
+    if len(pieces) == 1:
+        return pieces[0]
+    mid = len(pieces) // 2
+    left = build_piecewise_expr(breakpoints[:mid], pieces[:mid], var)
+    right = build_piecewise_expr(breakpoints[mid:], pieces[mid:], var)
+    return f"if(lt({var},{breakpoints[mid]:.6f}),{left},{right})"
+
+def build_indicator_chain(timeline, in_label, out_label, png_input_index=1):
+    """
+    Build the speed indicator as a single stage on the output timeline (after concat/remap):
+    one drawbox, one overlay of the PNG and one drawtext, each enabled only inside sped-up ranges.
+    Visibility and the speed text follow the segment table through piecewise expressions on output
+    time, so the number of filters does not depend on the segment count.
+    - timeline: output of build_segment_timeline for the rendered segments
+    Returns: filtergraph fragment reading [in_label] and producing [out_label]
+    """
+    visible = [seg for seg in timeline if seg["out_end"] > seg["out_start"]]
+    if not visible:
+        return f"[{in_label}]null[{out_label}]"
+    breakpoints = [seg["out_start"] for seg in visible]
+    enable_pieces = ["1" if seg["type"] == "silent" else "0" for seg in visible]
+    # Label with the uncapped speed, as the per-segment indicator did.
+    text_pieces = [
+        str(int(compute_silent_speed(seg["in_end"] - seg["in_start"]))) if seg["type"] == "silent" else "0"
+        for seg in visible
+    ]
+    enable_expr = build_piecewise_expr(breakpoints, enable_pieces, "t")
+    text_expr = build_piecewise_expr(breakpoints, text_pieces, "t")
+
+    # Semi-transparent box, fastforward icon on top of it (top-left), then the speed text right of the icon.
+    chain = f"[{in_label}]drawbox=x=10:y=10:w=400:h=220:color=black@0.5:t=fill:enable='{enable_expr}'[ind_box]"
+    chain += f";[ind_box][{png_input_index}:v]overlay=x=10:y=10:enable='{enable_expr}'[ind_ovl]"
+    chain += (
+        f";[ind_ovl]drawtext=text='%{{eif\\:{text_expr}\\:d}}x':x=260:y=100:fontsize=60"
+        f":fontcolor=white:borderw=4:enable='{enable_expr}'[{out_label}]"
+    )
+    return chain
+
+def build_timeline_filtergraph(segments, frame_rate, indicator=False, use_gpu_decode=False, png_input_index=1, audio_frame_samples=256, streams="av"):
+    """
+    Builds a single-pass FFmpeg filtergraph whose filter count does not depend on the segment count.
+    - Video: one setpts stage remaps input timestamps piecewise (driven by the segment table encoded
+      as a balanced expression tree), then fps drops the frames squeezed together by sped-up ranges.
+      frame_rate is the output rate (setpts discards the input rate, so it must be given).
+    - Audio: frames inside sped-up ranges are dropped and the gaps are filled with silence by
+      aresample, matching the muted audio of the per-segment renderer.
+    - indicator: add the speed indicator as one stage on the remapped output (build_indicator_chain)
+    - streams: "av" builds [vout] and [aout]; "v" or "a" builds only that output
+    Returns: filtergraph string producing [vout] and [aout]
+    """
+    timeline = build_segment_timeline(segments, max_speed=MAX_VIDEO_SPEED)
+    timeline = [seg for seg in timeline if seg["in_end"] > seg["in_start"]]
+    if not timeline:
+        raise ValueError("segments must cover a non-empty duration")
+    total_out = timeline[-1]["out_end"]
+    breakpoints = [seg["in_start"] for seg in timeline]
+
+    video_pieces = [
+        f"({seg['out_start']:.6f}+(T-{seg['in_start']:.6f})/{seg['speed']:.6f})"
+        for seg in timeline
+    ]
+    audio_pieces = [
+        f"({seg['out_start']:.6f}+T-{seg['in_start']:.6f})" for seg in timeline
+    ]
+    keep_pieces = ["0" if seg["type"] == "silent" else "1" for seg in timeline]
+
+    video_expr = build_piecewise_expr(breakpoints, video_pieces, "T")
+    audio_expr = build_piecewise_expr(breakpoints, audio_pieces, "T")
+    keep_expr = build_piecewise_expr(breakpoints, keep_pieces, "t")
+
+    vf = "[0:v]"
+    if use_gpu_decode:
+        vf += "hwdownload,format=yuv420p,"
+    if indicator:
+        vf += f"setpts='({video_expr})/TB',fps=fps={frame_rate:.6f}[vtl]"
+        vf += ";" + build_indicator_chain(timeline, "vtl", "vout", png_input_index)
+    else:
+        vf += f"setpts='({video_expr})/TB',fps=fps={frame_rate:.6f}[vout]"
+
+    af = (
+        f"[0:a]asetnsamples=n={audio_frame_samples}:p=0,"
+        f"aselect='{keep_expr}',"
+        f"asetpts='({audio_expr})/TB',"
+        f"aresample=async=1:min_hard_comp=0.01:first_pts=0,"
+        f"apad=whole_dur={total_out:.6f},atrim=end={total_out:.6f}[aout]"
+    )
+    return ";".join(([vf] if "v" in streams else []) + ([af] if "a" in streams else []))
+
+def resolve_ff_frame_rate(input_file, ff_fps="source"):
+    """
+    Resolve the --ff-fps policy to a frame rate: "source" matches the input's frame rate,
+    anything else is taken as a number of frames per second.
+    """
+    if ff_fps in (None, "source"):
+        return get_video_frame_rate(input_file)
+    return float(ff_fps)
+
+@timed_stage("filtergraph")
+def build_render_filtergraph(input_file, segments, indicator, timeline=False, use_gpu_decode=False, png_input_index=1, png_path="fastforward.png", ff_fps="source", streams="av"):
+    """
+    Build the filtergraph for segments with the selected renderer: the single-pass timeline renderer
+    when timeline is set, otherwise the per-segment renderer.
+    ff_fps is the output frame rate policy for sped-up segments (see resolve_ff_frame_rate).
+    streams selects the outputs: "av" ([vout] and [aout]), "v" or "a".
+    """
+    ff_frame_rate = resolve_ff_frame_rate(input_file, ff_fps)
+    if timeline:
+        return build_timeline_filtergraph(
+            segments,
+            ff_frame_rate,
+            indicator=indicator,
+            use_gpu_decode=use_gpu_decode,
+            png_input_index=png_input_index,
+            streams=streams,
+        )
+    sample_rate, channel_layout = get_audio_format(input_file)
+    return build_filtergraph(
+        segments,
+        indicator,
+        use_gpu_decode=use_gpu_decode,
+        png_input_index=png_input_index,
+        png_path=png_path,
+        audio_sample_rate=sample_rate,
+        audio_channel_layout=channel_layout,
+        ff_frame_rate=ff_frame_rate,
+        streams=streams,
+    )
+
+def run_ffmpeg_processing(input_file, output_file, filtergraph, video_duration, codec_name, use_gpu=False, offset=0.0, process_duration=None, png_path="fastforward.png", use_gpu_decode=False, progress_segments=None, show_progress=True, extra_output_args=None, threads=None, cpu_set=None, on_progress=None, streams="av"):
+    """
+    Runs the main FFmpeg processing command with the given filtergraph and shows a tqdm progress bar.
+    Selects hardware/software encoder/decoder based on codec_name and use_gpu.
+    Allows offset and process_duration to limit the region processed.
+    extra_output_args are inserted just before output_file (e.g. ["-f", "mpegts"]).
+    threads caps FFmpeg's decoder, filtergraph and encoder threads (default: FFmpeg's own choice);
+    cpu_set pins the FFmpeg process to those CPUs where the OS supports it (see cpu_pinning_method).
+    on_progress, if given, is called (from this thread) with each -progress block as a dict:
+    out_time and input_time in seconds, fps, speed (realtime factor), and progress ("continue"/"end").
+    streams says which filtergraph outputs to encode: "av" ([vout] and [aout]), "v" or "a".
+    """
+    import subprocess
+    import re
+    import time
+
+    # Map codec to decoder/encoder
+    codec_map = {
+        "h264": {
+            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "h264_cuvid"],
+            "gpu_encoder": "h264_nvenc",
+            "cpu_encoder": "libx264"
+        },
+        "hevc": {
+            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "hevc_cuvid"],
+            "gpu_encoder": "hevc_nvenc",
+            "cpu_encoder": "libx265"
+        },
+        "h265": {
+            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "hevc_cuvid"],
+            "gpu_encoder": "hevc_nvenc",
+            "cpu_encoder": "libx265"
+        },
+        "av1": {
+            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "av1_cuvid"],
+            "gpu_encoder": "av1_nvenc",
+            "cpu_encoder": "libaom-av1"
+        }
+    }
+
+    codec_key = codec_name.lower()
+    if codec_key not in codec_map:
+        print(f"Warning: Unrecognized codec '{codec_name}'. Defaulting to software x264.")
+        vcodec = "libx264"
+        decoder_args = []
+    else:
+        entry = codec_map[codec_key]
+        vcodec = entry["gpu_encoder"] if use_gpu else entry["cpu_encoder"]
+        decoder_args = entry["gpu_decoder"] if use_gpu and use_gpu_decode else []
+
+    print(f"Detected input codec: {codec_name}")
+    if "v" in streams:
+        print(f"Selected encoder: {vcodec}")
+    if decoder_args:
+        print(f"Selected decoder args: {' '.join(decoder_args)}")
+
+    # Write filtergraph to a temp file to avoid "Argument list too long" on long videos
+    import tempfile
+    fg_file = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False, prefix="vs_filtergraph_")
+    fg_file.write(filtergraph)
+    fg_file.close()
+    fg_path = fg_file.name
+
+    cmd = ["ffmpeg", "-y"]
+    if threads:
+        cmd += ["-filter_complex_threads", str(threads)]
+    cmd += decoder_args
+    if offset and offset > 0:
+        cmd += ["-ss", str(offset)]
+    if process_duration:
+        cmd += ["-t", str(process_duration)]
+    if threads:
+        cmd += ["-threads", str(threads)]  # Decoder threads (input option)
+    cmd += ["-i", input_file]
+    if "v" in streams:
+        cmd += ["-i", png_path]  # Add PNG as second input
+    cmd += ["-filter_complex_script", fg_path]
+    if "v" in streams:
+        cmd += ["-map", "[vout]", "-c:v", vcodec, "-crf", "23" if not use_gpu else "18"]
+    if "a" in streams:
+        cmd += ["-map", "[aout]", "-c:a", "aac", "-b:a", "128k"]
+    cmd += ["-progress", "pipe:1", "-nostats"]
+    if threads:
+        cmd += ["-threads", str(threads)]  # Encoder threads (output option)
+    if extra_output_args:
+        cmd += list(extra_output_args)
+    cmd += [output_file]
+    # No preexec_fn: this runs in worker threads, where forking with a preexec_fn can deadlock the child.
+    pin_method = cpu_pinning_method() if cpu_set else None
+    if pin_method == "taskset":
+        cmd = ["taskset", "-c", ",".join(map(str, sorted(cpu_set)))] + cmd
+
+    def pin_child(proc):
+        # Threads FFmpeg started before this call keep the parent's affinity.
+        if pin_method == "setaffinity":
+            try:
+                os.sched_setaffinity(proc.pid, cpu_set)
+            except OSError:
+                pass  # Already exited; its exit code reports any failure
+    print("Running FFmpeg processing command:")
+    print(" ".join(cmd))
+    print(f"Filtergraph written to: {fg_path} ({len(filtergraph)} chars)")
+    try:
+        # progress_segments passed as parameter
+        progress_map = None
+        progress_map_index = 0
+        if progress_segments:
+            progress_map = build_segment_timeline(progress_segments)
+
+        def map_out_time_to_input_time(out_time_seconds):
+            nonlocal progress_map_index
+            if not progress_map:
+                return out_time_seconds
+            while (
+                progress_map_index < len(progress_map)
+                and out_time_seconds > progress_map[progress_map_index]["out_end"] + 1e-6
+            ):
+                progress_map_index += 1
+            if progress_map_index >= len(progress_map):
+                return video_duration
+            seg = progress_map[progress_map_index]
+            rel_out = max(0.0, min(out_time_seconds - seg["out_start"], seg["out_end"] - seg["out_start"]))
+            return min(video_duration, seg["in_start"] + rel_out * seg["speed"])
+
+        progress_block = {}
+        # Startup (spawn to first -progress block: probing, graph init) vs encoding, for --metrics-json
+        timings = {"spawned": time.monotonic(), "first_progress": None}
+
+        def consume_progress_line(line):
+            """Parse one -progress line; returns the mapped input time for out_time lines, else None."""
+            key, sep, value = line.strip().partition("=")
+            if not sep:
+                return None
+            input_seconds = None
+            if key in ("out_time_ms", "out_time") and value != "N/A":
+                seconds = parse_ffmpeg_progress_time(key, value)
+                if seconds is not None:
+                    input_seconds = min(map_out_time_to_input_time(seconds), video_duration)
+                    progress_block["out_time"] = seconds
+                    progress_block["input_time"] = input_seconds
+            elif key in ("fps", "speed"):
+                progress_block[key] = parse_ffmpeg_progress_rate(value)
+            elif key == "progress":
+                progress_block["progress"] = value
+                if timings["first_progress"] is None:
+                    timings["first_progress"] = time.monotonic()
+                if on_progress is not None:
+                    on_progress(dict(progress_block))
+            return input_seconds
+
+        if tqdm is None or not show_progress:
+            if tqdm is None and show_progress:
+                print("[warn] tqdm is not installed; running without progress bar.")
+            proc = spawn_child(
+                cmd, "ffmpeg-render", stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+            )
+            pin_child(proc)
+            while True:
+                line = proc.stdout.readline()
+                if not line:
+                    break
+                consume_progress_line(line)
+                if show_progress and (line.startswith("out_time_ms=") or line.startswith("out_time=")):
+                    print(line.strip())
+            wait_child(proc)
+        else:
+            with tqdm(total=video_duration, unit="s", desc="Processing", dynamic_ncols=True) as pbar:
+                proc = spawn_child(
+                    cmd, "ffmpeg-render", stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+                )
+                pin_child(proc)
+                while True:
+                    line = proc.stdout.readline()
+                    if not line:
+                        break
+                    input_seconds = consume_progress_line(line)
+                    if input_seconds is not None:
+                        pbar.n = input_seconds
+                        pbar.refresh()
+
+                wait_child(proc)
+                pbar.n = video_duration
+                pbar.refresh()
+
+        finished = time.monotonic()
+        first_progress = timings["first_progress"] or finished
+        metrics_add_time("ffmpeg_startup", first_progress - timings["spawned"])
+        metrics_add_time("encoding", finished - first_progress)
+        if proc.returncode == 0:
+            print("FFmpeg processing completed successfully.")
+        else:
+            print("Error running FFmpeg processing. See FFmpeg output above.")
+            print(proc.stderr.read())
+            raise subprocess.CalledProcessError(proc.returncode, cmd)
+    except Exception as e:
+        print("Error during FFmpeg processing:", e)
+        raise
+    finally:
+        # Clean up filtergraph temp file
+        try:
+            os.unlink(fg_path)
+        except OSError:
+            pass
+
+def parse_ffmpeg_progress_time(key, value):
+    """Seconds from an FFmpeg -progress out_time_ms (microseconds) or out_time (HH:MM:SS.micro) value, or None."""
+    try:
+        if key == "out_time_ms":
+            return int(value) / 1_000_000
+        h, m, sec = value.split(":")
+        return int(h) * 3600 + int(m) * 60 + float(sec)
+    except ValueError:
+        return None
+
+def parse_ffmpeg_progress_rate(value):
+    """Float from an FFmpeg -progress fps/speed value ("29.97", "1.52x"), or None for N/A."""
+    try:
+        return float(value.rstrip("x"))
+    except ValueError:
+        return None
+
+def split_segments_into_chunks(segments, num_chunks):
+    """
+    Split segments into at most num_chunks time-contiguous groups, cutting only at segment boundaries.
+    Groups are balanced on input duration, since every worker has to decode its whole input range.
+    Returns a list of segment lists (in timeline order).
+    """
+    if num_chunks < 1:
+        raise ValueError("num_chunks must be >= 1")
+    if not segments:
+        return []
+
+    total_duration = sum(max(0.0, end - start) for start, end, _ in segments)
+    num_chunks = min(num_chunks, len(segments))
+    target = total_duration / num_chunks if num_chunks else total_duration
+
+    chunks = []
+    current = []
+    cursor = 0.0
+    for idx, seg in enumerate(segments):
+        current.append(seg)
+        cursor += max(0.0, seg[1] - seg[0])
+        remaining_segments = len(segments) - idx - 1
+        remaining_chunks = num_chunks - len(chunks) - 1
+        # Close the chunk once it reaches its share of the timeline, but always leave
+        # at least one segment for each chunk still to be filled.
+        if remaining_chunks > 0 and (
+            cursor >= target * (len(chunks) + 1) or remaining_segments <= remaining_chunks
+        ):
+            chunks.append(current)
+            current = []
+    if current:
+        chunks.append(current)
+    return chunks
+
+def concat_media_parts(part_paths, output_file, audio_file=None, extra_output_args=None):
+    """
+    Join encoded parts into output_file with the FFmpeg concat demuxer (stream copy, no re-encode).
+    All parts must share codecs and encoding parameters.
+    audio_file, if given, is muxed in (stream copy) as the output's audio instead of the parts' audio.
+    extra_output_args are inserted just before output_file (e.g. ["-tag:v", "avc3"]).
+    """
+    import tempfile
+
+    list_file = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False, prefix="vs_concat_")
+    for path in part_paths:
+        escaped = os.path.abspath(path).replace("'", "'\\''")
+        list_file.write(f"file '{escaped}'\n")
+    list_file.close()
+
+    cmd = [
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+        "-f", "concat", "-safe", "0",
+        "-i", list_file.name,
+    ]
+    if audio_file:
+        cmd += ["-i", audio_file, "-map", "0:v", "-map", "1:a"]
+    else:
+        cmd += ["-map", "0"]
+    cmd += ["-c", "copy"] + list(extra_output_args or []) + [output_file]
+    try:
+        result = run_child(cmd, "ffmpeg-concat")
+        if result.returncode != 0:
+            raise RuntimeError(f"FFmpeg concat failed:\n{result.stderr}".rstrip())
+    finally:
+        try:
+            os.unlink(list_file.name)
+        except OSError:
+            pass
+
+def render_segments_to_file(input_file, output_file, segments, codec_name, indicator=False, use_gpu=False, offset=0.0, png_path="fastforward.png", use_gpu_decode=False, extra_output_args=None, timeline=False, ff_fps="source", streams="av"):
+    """
+    Render a contiguous run of segments (timestamps relative to offset) into output_file.
+    The segments are rebased to start at 0 and FFmpeg seeks to the first segment's start.
+    streams selects what is rendered: "av", "v" (video only) or "a" (audio only).
+    """
+    part_start = segments[0][0]
+    part_duration = segments[-1][1] - part_start
+    rebased = [(start - part_start, end - part_start, typ) for start, end, typ in segments]
+    filtergraph = build_render_filtergraph(
+        input_file,
+        rebased,
+        indicator,
+        timeline=timeline,
+        ff_fps=ff_fps,
+        use_gpu_decode=use_gpu_decode,
+        png_input_index=1,
+        png_path=png_path,
+        streams=streams,
+    )
+    run_ffmpeg_processing(
+        input_file,
+        output_file,
+        filtergraph,
+        part_duration,
+        codec_name,
+        use_gpu=use_gpu,
+        offset=offset + part_start,
+        process_duration=part_duration,
+        png_path=png_path,
+        use_gpu_decode=use_gpu_decode,
+        progress_segments=rebased,
+        show_progress=False,
+        extra_output_args=extra_output_args,
+        streams=streams,
+    )
+
+def run_chunked_processing(input_file, output_file, segments, codec_name, num_chunks, indicator=False, use_gpu=False, offset=0.0, png_path="fastforward.png", use_gpu_decode=False, timeline=False, ff_fps="source"):
+    """
+    Render one input as num_chunks time-contiguous chunks in parallel FFmpeg workers, then join the
+    parts losslessly. Each chunk gets its own filtergraph built from its (rebased) segments.
+    Chunks carry video only: the audio is encoded once over the whole timeline (alongside the chunks)
+    and muxed in when joining, because every separately encoded AAC part would start with its own
+    encoder delay and end padded to a whole frame, drifting the audio at each join.
+    """
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    chunks = split_segments_into_chunks(segments, num_chunks)
+    if not chunks:
+        raise RuntimeError("No segments to render.")
+
+    _, ext = os.path.splitext(output_file)
+    work_dir = tempfile.mkdtemp(
+        prefix="vs_chunks_", dir=os.path.dirname(os.path.abspath(output_file))
+    )
+    part_paths = [os.path.join(work_dir, f"part_{idx:04d}{ext or '.mp4'}") for idx in range(len(chunks))]
+    audio_path = os.path.join(work_dir, "audio.m4a")
+
+    def _render_chunk(idx):
+        if idx == len(chunks):
+            render_segments_to_file(
+                input_file,
+                audio_path,
+                segments,
+                codec_name,
+                offset=offset,
+                timeline=timeline,
+                ff_fps=ff_fps,
+                streams="a",
+            )
+            return idx
+        render_segments_to_file(
+            input_file,
+            part_paths[idx],
+            chunks[idx],
+            codec_name,
+            indicator=indicator,
+            use_gpu=use_gpu,
+            offset=offset,
+            png_path=png_path,
+            use_gpu_decode=use_gpu_decode,
+            timeline=timeline,
+            ff_fps=ff_fps,
+            streams="v",
+        )
+        return idx
+
+    print(f"Rendering {len(chunks)} chunk(s) in parallel:")
+    for idx, chunk_segments in enumerate(chunks):
+        print(f"  chunk#{idx:02d} in=[{chunk_segments[0][0]:.2f},{chunk_segments[-1][1]:.2f}] "
+              f"segments={len(chunk_segments)}")
+
+    try:
+        completed = 0
+        with ThreadPoolExecutor(max_workers=len(chunks) + 1) as executor:
+            futures = [executor.submit(_render_chunk, idx) for idx in range(len(chunks) + 1)]
+            for future in as_completed(futures):
+                idx = future.result()
+                if idx == len(chunks):
+                    print("  Audio encoded.")
+                    continue
+                completed += 1
+                print(f"  [{completed}/{len(chunks)}] Chunk {idx} encoded.")
+        concat_media_parts(part_paths, output_file, audio_file=audio_path)
+        print(f"Joined {len(part_paths)} chunk(s) into {output_file}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+# Bitstream filters that convert stream-copied video to Annex B so copied and re-encoded
+# MPEG-TS parts carry in-band parameter sets and can be joined with the concat demuxer.
+SMART_RENDER_BSF = {
+    "h264": "h264_mp4toannexb",
+    "hevc": "hevc_mp4toannexb",
+    "h265": "hevc_mp4toannexb",
+}
+# MP4 sample entries that allow parameter sets in-band: copied and re-encoded parts keep their own
+# SPS/PPS, which a single avcC/hvcC (avc1/hvc1) can't describe.
+SMART_RENDER_INBAND_TAGS = {"h264": "avc3", "hevc": "hev1", "h265": "hev1"}
+SMART_RENDER_MP4_EXTENSIONS = (".mp4", ".m4v", ".mov")
+# ffprobe profile names -> encoder -profile values, so re-encoded parts match the source's SPS.
+SMART_RENDER_PROFILES = {
+    "h264": {
+        "Constrained Baseline": "baseline",
+        "Baseline": "baseline",
+        "Main": "main",
+        "High": "high",
+        "High 10": "high10",
+        "High 4:2:2": "high422",
+        "High 4:4:4 Predictive": "high444",
+    },
+    "hevc": {"Main": "main", "Main 10": "main10"},
+}
+SMART_RENDER_NVENC_PROFILES = ("baseline", "main", "high", "main10")
+# Stream parameters that must agree between copied and re-encoded parts for them to share a stream.
+SMART_RENDER_SPS_FIELDS = ("codec_name", "profile", "level", "pix_fmt", "width", "height", "field_order")
+SMART_RENDER_BRIDGE_SECONDS = 4.0  # Re-encode copy ranges shorter than this instead of splitting an encode job
+
+def probe_video_parameters(input_file):
     """
-    Load a .vad.json sidecar file. Validates version == 1.
-    Returns (silence_intervals, analyzed_duration) where silence_intervals
-    is a list of (start, end) tuples.
+    Stream parameters of the first video stream as reported by ffprobe (SMART_RENDER_SPS_FIELDS plus
+    r_frame_rate). Fields ffprobe doesn't report are None.
     """
     import json
+    fields = SMART_RENDER_SPS_FIELDS + ("r_frame_rate",)
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=" + ",".join(fields),
+        "-of", "json",
+        input_file
+    ]
+    result = run_child(cmd, "ffprobe-video-params")
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr}")
+    streams = json.loads(result.stdout).get("streams", [])
+    stream = streams[0] if streams else {}
+    return {field: stream.get(field) for field in fields}
 
-    with open(vad_json_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    version = data.get("version")
-    if version != 1:
-        print(f"Unsupported vad.json version: {version}", file=sys.stderr)
-        sys.exit(1)
-
-    silence_intervals = [(float(s), float(e)) for s, e in data["silence_intervals"]]
-    analyzed_duration = float(data["detection"]["analyzed_duration"])
-    return silence_intervals, analyzed_duration
+def probe_video_frame_count(input_file):
+    """
+    Number of packets (frames) in the first video stream, counted by ffprobe without decoding.
+    None when ffprobe doesn't report it.
+    """
+    import json
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-count_packets",
+        "-show_entries", "stream=nb_read_packets",
+        "-of", "json",
+        input_file
+    ]
+    result = run_child(cmd, "ffprobe-frame-count")
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr}")
+    streams = json.loads(result.stdout).get("streams", [])
+    try:
+        return int(streams[0]["nb_read_packets"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
 
-def truncate_intervals_to_duration(intervals, max_duration):
+def smart_render_encoder_args(params, codec_name, use_gpu=False):
     """
-    Truncate silence intervals to fit within [0, max_duration].
-    Drops intervals that start past max_duration; clamps end to max_duration.
+    Output options that make re-encoded parts match the source stream (profile, level, pixel format,
+    frame rate), so their GOPs can sit in the same stream as stream-copied ones.
+    - params: probe_video_parameters of the source
     """
-    result = []
-    for start, end in intervals:
-        if start >= max_duration:
-            break
-        result.append((start, min(end, max_duration)))
-    return result
+    codec_key = "hevc" if codec_name.lower() in ("hevc", "h265") else "h264"
+    args = []
+    if params.get("pix_fmt"):
+        args += ["-pix_fmt", params["pix_fmt"]]
+    if params.get("r_frame_rate") and _parse_frame_rate(params["r_frame_rate"]):
+        args += ["-r", params["r_frame_rate"]]
+    profile = SMART_RENDER_PROFILES[codec_key].get(params.get("profile"))
+    if profile and (not use_gpu or profile in SMART_RENDER_NVENC_PROFILES):
+        args += ["-profile:v", profile]
+    level = params.get("level")
+    if isinstance(level, int) and level > 0:
+        # ffprobe reports level_idc: 10x the level for H.264, 30x for HEVC.
+        level_name = f"{level / (30 if codec_key == 'hevc' else 10):.1f}"
+        if codec_key == "hevc" and not use_gpu:
+            args += ["-x265-params", f"level-idc={level_name}"]
+        else:
+            args += ["-level:v", level_name]
+    return args
 
-def discover_videos(folder, extensions):
+def build_keyframe_index(input_file):
     """
-    Scan a folder for video files matching the given extensions (comma-separated string).
-    Returns a sorted list of absolute paths. Excludes *.vad.json files.
+    Uses ffprobe to list keyframe packet timestamps of the first video stream.
+    Returns keyframe times in seconds, relative to the container start (the origin used by input -ss:
+    the earliest start of any stream, which is before the video when audio starts first).
     """
-    ext_list = [e.strip().lower().lstrip(".") for e in extensions.split(",") if e.strip()]
-    videos = []
-    for entry in os.listdir(folder):
-        filepath = os.path.join(folder, entry)
-        if not os.path.isfile(filepath):
+    import json
+    cmd = [
+        "ffprobe",
+        "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "format=start_time:packet=pts_time,flags",
+        "-of", "json",
+        input_file
+    ]
+    result = run_child(cmd, "ffprobe-keyframes")
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe failed: {result.stderr}")
+    info = json.loads(result.stdout)
+    start_time = _float_or_none(info.get("format", {}).get("start_time")) or 0.0
+    keyframes = []
+    for packet in info.get("packets", []):
+        if "K" not in packet.get("flags", ""):
             continue
-        if entry.lower().endswith(".vad.json"):
+        try:
+            keyframes.append(float(packet["pts_time"]) - start_time)
+        except (KeyError, TypeError, ValueError):
             continue
-        _, ext = os.path.splitext(entry)
-        if ext.lower().lstrip(".") in ext_list:
-            videos.append(filepath)
-    videos.sort()
-    return videos
+    keyframes.sort()
+    return keyframes
 
-def discover_sidecar(folder):
-    """
-    Find exactly one .vad.json sidecar file in folder.
-    Returns the path if exactly one found.
-    Prints error and exits if zero or multiple found.
-    """
-    import glob
-    pattern = os.path.join(folder, "*.vad.json")
-    sidecars = sorted(glob.glob(pattern))
-    if len(sidecars) == 0:
-        print(f"Error: No .vad.json sidecar found in '{folder}'.", file=sys.stderr)
-        sys.exit(1)
-    if len(sidecars) > 1:
-        print(f"Error: Multiple .vad.json sidecars found in '{folder}':", file=sys.stderr)
-        for s in sidecars:
-            print(f"  {s}", file=sys.stderr)
-        print("Specify which to use with --vad-json.", file=sys.stderr)
-        sys.exit(1)
-    print(f"Auto-discovered sidecar: {sidecars[0]}")
-    return sidecars[0]
+KEYFRAME_INDEX_VERSION = 2  # 2: keyframe times relative to the container start (was the video stream start)
 
-def calculate_segments(silence_intervals, video_duration, buffer_duration=2.0):
+def load_or_build_keyframe_index(input_file):
     """
-    Given silence intervals and total duration, returns a list of segments:
-    Each segment is (start, end, type) where type is 'silent' or 'non-silent'.
-    Adds a buffer of normal speed (non-silent) before each non-silent segment.
+    Return the keyframe index for input_file, cached in a .keyframes.json file next to the input
+    (alongside its .vad.json sidecar). The cache is rebuilt when the input's size or mtime changes.
     """
-    segments = []
-    prev_end = 0.0
-    for start, end in silence_intervals:
-        # Non-silent before this silence
-        if start > prev_end:
-            segments.append((prev_end, start, "non-silent"))
-        # Silent segment
-        if end is not None:
-            segments.append((start, end, "silent"))
-            prev_end = end
-        else:
-            # Open-ended silence (shouldn't happen, but handle gracefully)
-            segments.append((start, video_duration, "silent"))
-            prev_end = video_duration
-    # Any remaining non-silent at the end
-    if prev_end < video_duration:
-        segments.append((prev_end, video_duration, "non-silent"))
+    import json
 
-    # Post-process to add buffer before each non-silent segment
-    adjusted_segments = []
-    i = 0
-    while i < len(segments):
-        seg = segments[i]
-        if seg[2] == "silent" and i + 1 < len(segments) and segments[i + 1][2] == "non-silent":
-            silent_start, silent_end, _ = seg
-            next_non_silent_start, next_non_silent_end, _ = segments[i + 1]
-            # Only adjust if silent segment is longer than buffer
-            if silent_end - silent_start > buffer_duration:
-                # Shorten silent segment
-                new_silent_end = max(silent_start, silent_end - buffer_duration)
-                adjusted_segments.append((silent_start, new_silent_end, "silent"))
-                # Insert buffer as non-silent
-                buffer_start = new_silent_end
-                buffer_end = silent_end
-                adjusted_segments.append((buffer_start, buffer_end, "non-silent"))
-                # Adjust next non-silent segment to start after buffer
-                segments[i + 1] = (buffer_end, next_non_silent_end, "non-silent")
-            else:
-                # If silent segment is too short, treat as non-silent
-                adjusted_segments.append((silent_start, silent_end, "non-silent"))
-            i += 1
-        else:
-            adjusted_segments.append(seg)
-            i += 1
-    return adjusted_segments
+    index_path = os.path.splitext(input_file)[0] + ".keyframes.json"
+    stat = os.stat(input_file)
+    source = {
+        "file": os.path.basename(input_file),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+    }
+    try:
+        with open(index_path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == KEYFRAME_INDEX_VERSION and cached.get("source") == source:
+            return [float(t) for t in cached["keyframes"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    keyframes = build_keyframe_index(input_file)
+    payload = {
+        "version": KEYFRAME_INDEX_VERSION,
+        "source": source,
+        "keyframes": [round(t, 6) for t in keyframes],
+    }
+    try:
+        with open(index_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+            f.write("\n")
+    except OSError:
+        print(f"[warn] Could not write keyframe index cache: {index_path}", file=sys.stderr)
+    return keyframes
 
-def build_filtergraph(segments, indicator, use_gpu_decode=False, png_input_index=1, png_path="fastforward.png"):
+def plan_smart_render(segments, keyframes, min_copy_seconds=2.0):
     """
-    Builds a dynamic FFmpeg filtergraph string for the given segments.
-    - segments: list of (start, end, type)
-    - indicator: bool, whether to add fastforward overlay during sped-up segments
-    - use_gpu_decode: bool, whether GPU decode is active (insert hwdownload/format if True)
-    - png_input_index: index of the PNG input in FFmpeg (default 1, i.e., [1:v])
-    - png_path: path to the PNG file
-    Returns: filtergraph string
+    Split segments into render parts for smart rendering.
+    - keyframes: keyframe times relative to the processed region (same origin as segments)
+    Non-silent ranges are snapped inward to keyframes and stream-copied when the copyable span is at
+    least min_copy_seconds; boundary slivers and silent segments are grouped into re-encoded parts.
+    Returns a list of (mode, payload) where mode is "copy" with payload (start, end), or "encode"
+    with payload a list of (start, end, type) segments.
     """
-    MAX_VIDEO_SPEED = 1000.0 # Cap for setpts
-    MAX_ATEMPO = 2.0         # FFmpeg atempo max per filter
-    vf_parts = []
-    af_parts = []
-    concat_v = []
-    concat_a = []
-    seg_idx = 0
+    import bisect
 
-    for start, end, typ in segments:
-        v_label = f"v{seg_idx}"
-        a_label = f"a{seg_idx}"
+    parts = []
+    pending = []
 
-        # --- Audio part ---
-        af = f"[0:a]atrim=start={start}:end={end},asetpts=PTS-STARTPTS"
-        if typ == "silent":
-            segment_duration = end - start
-            audio_speed = compute_silent_speed(segment_duration)
-            remain = audio_speed
-            atempo_chain = []
-            while remain > MAX_ATEMPO:
-                atempo_chain.append(f"atempo={MAX_ATEMPO}")
-                remain /= MAX_ATEMPO
-            if remain > 1.001:
-                final_atempo = min(remain, MAX_ATEMPO)
-                if final_atempo > 1.001:
-                    atempo_chain.append(f"atempo={final_atempo:.2f}")
-            if atempo_chain:
-                af += "," + ",".join(atempo_chain)
-            # Keep A/V durations aligned (still apply atempo), but mute audio during sped-up segments.
-            af += ",volume=0"
-        af += f"[{a_label}]"
-        af_parts.append(af)
+    def _flush_pending():
+        if pending:
+            parts.append(("encode", list(pending)))
+            pending.clear()
 
-        # --- Video part ---
-        vf_segment_chain = "" # Build the chain for this segment as a string
-        last_video_label = "[0:v]" # Start with the main video input
+    for start, end, typ in segments:
+        if typ == "non-silent":
+            first_idx = bisect.bisect_left(keyframes, start)
+            last_idx = bisect.bisect_right(keyframes, end) - 1
+            if first_idx < len(keyframes) and last_idx >= first_idx:
+                copy_start = keyframes[first_idx]
+                copy_end = keyframes[last_idx]
+                if copy_end - copy_start >= min_copy_seconds:
+                    if copy_start > start:
+                        pending.append((start, copy_start, "non-silent"))
+                    _flush_pending()
+                    parts.append(("copy", (copy_start, copy_end)))
+                    if end > copy_end:
+                        pending.append((copy_end, end, "non-silent"))
+                    continue
+        if end > start:
+            pending.append((start, end, typ))
+    _flush_pending()
+    return parts
+
+def merge_smart_render_parts(parts, bridge_seconds=SMART_RENDER_BRIDGE_SECONDS):
+    """
+    Fold copy parts shorter than bridge_seconds into the encode parts on both sides (re-encoding them at
+    normal speed), so a run of short speech ranges becomes one FFmpeg job instead of a copy job and an
+    encode job per range. Parts are plan_smart_render's.
+    """
+    merged = []
+    for mode, payload in parts:
+        if (mode == "encode" and len(merged) >= 2 and merged[-1][0] == "copy" and merged[-2][0] == "encode"
+                and merged[-1][1][1] - merged[-1][1][0] < bridge_seconds):
+            copy_start, copy_end = merged.pop()[1]
+            segments = list(merged[-1][1])
+            for start, end, typ in [(copy_start, copy_end, "non-silent")] + list(payload):
+                # Join the bridged range with the normal-speed slivers around it.
+                if typ == "non-silent" and segments and segments[-1][2] == typ and segments[-1][1] == start:
+                    segments[-1] = (segments[-1][0], end, typ)
+                else:
+                    segments.append((start, end, typ))
+            merged[-1] = ("encode", segments)
+            continue
+        merged.append((mode, payload))
+    return merged
 
-        # 1. Trim and initial setpts
-        trim_label = f"trim{seg_idx}"
-        vf_segment_chain += f"{last_video_label}trim=start={start}:end={end},setpts=PTS-STARTPTS[{trim_label}]"
-        last_video_label = trim_label
+def run_smart_rendering(input_file, output_file, segments, codec_name, workers=1, indicator=False, use_gpu=False, offset=0.0, png_path="fastforward.png", use_gpu_decode=False, min_copy_seconds=2.0, timeline=False, ff_fps="source"):
+    """
+    Smart render: stream-copy keyframe-aligned non-silent ranges and re-encode only sped-up segments
+    and the boundary slivers around them, then join all parts with the concat demuxer.
+    Video parts are written as MPEG-TS (in-band parameter sets) and re-encoded with the source's profile,
+    level, pixel format and frame rate; if the re-encoded parts still don't match the copied ones, the
+    whole timeline is re-encoded instead. The audio is encoded once over the whole timeline and muxed
+    in when joining. MP4/MOV outputs are tagged avc3/hev1, which allow parameter sets in-band.
+    """
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor, as_completed
 
-        # 2. Optional GPU download
-        if use_gpu_decode:
-            gpu_label = f"gpu{seg_idx}"
-            vf_segment_chain += f";[{last_video_label}]hwdownload,format=yuv420p[{gpu_label}]"
-            last_video_label = gpu_label
+    codec_key = codec_name.lower()
+    bsf = SMART_RENDER_BSF[codec_key]
+    keyframes = [t - offset for t in load_or_build_keyframe_index(input_file)]
+    parts = plan_smart_render(segments, keyframes, min_copy_seconds=min_copy_seconds)
+    parts = merge_smart_render_parts(parts)
+    if not parts:
+        raise RuntimeError("No segments to render.")
+    source_params = probe_video_parameters(input_file)
+    encoder_args = smart_render_encoder_args(source_params, codec_name, use_gpu=use_gpu)
+    fps = _parse_frame_rate(source_params.get("r_frame_rate")) or get_video_frame_rate(input_file)
+
+    copy_seconds = sum(payload[1] - payload[0] for mode, payload in parts if mode == "copy")
+    encode_seconds = sum(end - start for mode, payload in parts if mode == "encode"
+                         for start, end, _ in payload)
+    print(f"Smart render plan: {len(parts)} part(s), "
+          f"{copy_seconds:.1f}s stream-copied, {encode_seconds:.1f}s re-encoded, {max(1, workers)} worker(s)")
+
+    work_dir = tempfile.mkdtemp(
+        prefix="vs_smart_", dir=os.path.dirname(os.path.abspath(output_file))
+    )
+    part_paths = [os.path.join(work_dir, f"part_{idx:05d}.ts") for idx in range(len(parts))]
+    audio_path = os.path.join(work_dir, "audio.m4a")
+
+    def _render_part(idx):
+        if idx == len(parts):
+            render_segments_to_file(
+                input_file,
+                audio_path,
+                segments,
+                codec_name,
+                offset=offset,
+                timeline=timeline,
+                ff_fps=ff_fps,
+                streams="a",
+            )
+            return idx
+        mode, payload = parts[idx]
+        if mode == "encode":
+            render_segments_to_file(
+                input_file,
+                part_paths[idx],
+                payload,
+                codec_name,
+                indicator=indicator,
+                use_gpu=use_gpu,
+                offset=offset,
+                png_path=png_path,
+                use_gpu_decode=use_gpu_decode,
+                extra_output_args=encoder_args + ["-f", "mpegts"],
+                timeline=timeline,
+                ff_fps=ff_fps,
+                streams="v",
+            )
+            return idx
+        copy_start, copy_end = payload
+        # Seek a hair past the keyframe so rounding in the index never lands on the previous GOP, and stop at
+        # the last packet before the keyframe at copy_end (which starts the next encode part). -t can't bound
+        # that: the stream-copy check compares packet dts, which trails pts by the B-frame delay, so the
+        # boundary keyframe and the packets after it get through. Counting packets stops exactly there.
+        cmd = [
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error",
+            "-ss", f"{offset + copy_start + 0.001:.6f}",
+            "-i", input_file,
+            "-frames:v", str(round((copy_end - copy_start) * fps)),
+            "-map", "0:v:0",
+            "-c:v", "copy",
+            "-bsf:v", bsf,
+            "-f", "mpegts",
+            part_paths[idx],
+        ]
+        result = run_child(cmd, "ffmpeg-copy")
+        if result.returncode != 0:
+            raise RuntimeError(f"FFmpeg stream copy failed:\n{result.stderr}".rstrip())
+        return idx
+
+    def _render_whole_timeline():
+        render_segments_to_file(
+            input_file,
+            output_file,
+            segments,
+            codec_name,
+            indicator=indicator,
+            use_gpu=use_gpu,
+            offset=offset,
+            png_path=png_path,
+            use_gpu_decode=use_gpu_decode,
+            timeline=timeline,
+            ff_fps=ff_fps,
+        )
 
-        # 3. If silent, apply indicator and then speedup
-        if typ == "silent":
-            # Recalculate speed (needed for video_speed and text)
-            segment_duration = end - start
-            target_duration = 4.0
-            min_duration_for_variable_speed = 10.0
-            fixed_speed_short = 4.0
-            if segment_duration <= min_duration_for_variable_speed:
-                current_speed = fixed_speed_short
+    try:
+        completed = 0
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [executor.submit(_render_part, idx) for idx in range(len(parts) + 1)]
+            for future in as_completed(futures):
+                idx = future.result()
+                if idx == len(parts):
+                    print("  Audio encoded.")
+                    continue
+                completed += 1
+                print(f"  [{completed}/{len(parts)}] Part {idx} ({parts[idx][0]}) done.")
+
+        modes = {mode for mode, _ in parts}
+        if modes == {"copy", "encode"}:
+            copied = probe_video_parameters(part_paths[next(i for i, (m, _) in enumerate(parts) if m == "copy")])
+            encoded = probe_video_parameters(part_paths[next(i for i, (m, _) in enumerate(parts) if m == "encode")])
+            mismatched = [
+                f"{field} {copied[field]} vs {encoded[field]}"
+                for field in SMART_RENDER_SPS_FIELDS if copied[field] != encoded[field]
+            ]
+            if mismatched:
+                print(f"[warn] Re-encoded parts don't match the source stream ({', '.join(mismatched)}); "
+                      f"re-encoding the whole timeline instead.", file=sys.stderr)
+                _render_whole_timeline()
+                return
+
+        # A frame lost or repeated at a join shifts the video against the single audio encode from there on.
+        # Copy parts must hold exactly their keyframe-to-keyframe frames; encode parts may round by a frame.
+        problems = []
+        total_seconds = 0.0
+        for idx, (mode, payload) in enumerate(parts):
+            frames = probe_video_frame_count(part_paths[idx])
+            if frames is None:
+                problems.append(f"part {idx}: no frame count")
+                continue
+            actual = frames / fps
+            if mode == "copy":
+                expected = payload[1] - payload[0]
+                tolerance = 0.5 / fps
             else:
-                current_speed = max(1.0, segment_duration / target_duration)
-            video_speed = min(current_speed, MAX_VIDEO_SPEED)
-
-            # 3a. Apply indicator if requested (MOVED: now happens BEFORE speed change)
-            if indicator:
-                box_label = f"box{seg_idx}"
-                overlay_label = f"ovl{seg_idx}"
-                text_label = f"txt{seg_idx}"
-                # Draw a semi-transparent black box first
-                # Position everything top-left
-                # y=10: Position box 10px from top edge
-                vf_segment_chain += f";[{last_video_label}]drawbox=x=10:y=10:w=400:h=220:color=black@0.5:t=fill[{box_label}]"
-                last_video_label = box_label # Output of drawbox is input for overlay
-                
-                # Chain overlay filter (takes 2 inputs: box stream and png input)
-                # Place overlay in top-left, on top of the box
-                vf_segment_chain += f";[{last_video_label}][{png_input_index}:v]overlay=x=10:y=10[{overlay_label}]"
-                last_video_label = overlay_label # Output of overlay is input for drawtext
-                
-                # Chain drawtext filter, place text right of icon, aligned near top, on top of the box
-                # x=10+w+10: Position text 10px right of the overlay icon (icon starts at x=10, width is 'w')
-                # y=10: Align text baseline near top
-                # Move text further right and down for better separation from icon
-                vf_segment_chain += f";[{last_video_label}]drawtext=text='{int(current_speed)}x':x=260:y=100:fontsize=60:fontcolor=white:borderw=4[{text_label}]"
-                last_video_label = text_label # Output of drawtext is input for speed change
-            
-            # 3b. Apply speed change (setpts) AFTER overlays
-            spedup_label = f"spedup{seg_idx}"
-            vf_segment_chain += f";[{last_video_label}]setpts=PTS/{video_speed}[{v_label}]"
-            last_video_label = v_label # Final label is v_label
-        else:
-            # If not silent, alias last_video_label to v_label
-            vf_segment_chain += f";[{last_video_label}]null[{v_label}]"
-            last_video_label = v_label
+                expected = build_segment_timeline(payload, max_speed=MAX_VIDEO_SPEED)[-1]["out_end"]
+                tolerance = 1.0 / fps
+            total_seconds += actual
+            if abs(actual - expected) > tolerance:
+                problems.append(f"part {idx} ({mode}): {actual:.3f}s vs {expected:.3f}s")
+        timeline_seconds = build_segment_timeline(segments, max_speed=MAX_VIDEO_SPEED)[-1]["out_end"]
+        encode_parts = sum(1 for mode, _ in parts if mode == "encode")
+        if not problems and abs(total_seconds - timeline_seconds) > (encode_parts + 0.5) / fps:
+            problems.append(f"total {total_seconds:.3f}s vs timeline {timeline_seconds:.3f}s")
+        if problems:
+            print(f"[warn] Smart render parts don't add up to the timeline ({'; '.join(problems)}); "
+                  f"re-encoding the whole timeline instead.", file=sys.stderr)
+            _render_whole_timeline()
+            return
 
-        # Append the completed chain for this segment
-        vf_parts.append(vf_segment_chain)
+        tag_args = []
+        if os.path.splitext(output_file)[1].lower() in SMART_RENDER_MP4_EXTENSIONS:
+            tag_args = ["-tag:v", SMART_RENDER_INBAND_TAGS[codec_key]]
+        concat_media_parts(part_paths, output_file, audio_file=audio_path, extra_output_args=tag_args)
+        print(f"Joined {len(part_paths)} part(s) into {output_file}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
 
-        # Add segment labels for final concat
-        concat_v.append(f"[{v_label}]")
-        concat_a.append(f"[{a_label}]")
-        seg_idx += 1
+FOLLOW_VAD_CHUNK_SECONDS = 10.0  # Shorter VAD windows in --follow finalize regions sooner
 
-    # --- Final filtergraph assembly ---
-    n = len(segments)
-    # Join all segment filter chains first
-    filtergraph = ";".join(vf_parts + af_parts)
-    # Then add the final concatenation filters
-    filtergraph += f";{''.join(concat_v)}concat=n={n}:v=1:a=0[vout]" # Concat video
-    filtergraph += f";{''.join(concat_a)}concat=n={n}:v=0:a=1[aout]" # Concat audio
-    return filtergraph
+def follow_settle_seconds(merge_gap_seconds, pad_seconds, speech_pad_ms, buffer_duration=2.0):
+    """
+    How far behind the end of the final VAD windows segment boundaries can still move: speech found
+    later can be padded and merged backwards, and shifts the normal-speed buffer in front of it.
+    """
+    return merge_gap_seconds + pad_seconds + speech_pad_ms / 1000.0 + buffer_duration + 0.5
 
-def run_ffmpeg_processing(input_file, output_file, filtergraph, video_duration, codec_name, use_gpu=False, offset=0.0, process_duration=None, png_path="fastforward.png", use_gpu_decode=False, progress_segments=None, show_progress=True):
+def follow_cut_point(segments, horizon):
     """
-    Runs the main FFmpeg processing command with the given filtergraph and shows a tqdm progress bar.
-    Selects hardware/software encoder/decoder based on codec_name and use_gpu.
-    Allows offset and process_duration to limit the region processed.
+    Latest point <= horizon up to which segments are final and can be rendered.
+    Non-silent segments play at 1x, so they can be cut anywhere; a silent segment's speed depends on
+    its full length, so a horizon inside one is pulled back to its start.
+    Returns (cut, in_silence).
     """
-    import subprocess
-    import re
+    for seg_start, seg_end, seg_type in segments:
+        if seg_start <= horizon < seg_end:
+            if seg_type == "silent":
+                return seg_start, True
+            return horizon, False
+    return horizon, False
+
+def plan_follow_parts(segments, start, end, part_seconds):
+    """
+    Split the segments covering [start, end) into HLS parts of at most part_seconds of output
+    (a silent segment longer than that becomes a part of its own). Silent segments are never split.
+    Returns (closed_parts, open_part): closed parts are full; the open one may still grow.
+    """
+    parts = []
+    current = []
+    current_out = 0.0
+    for seg_start, seg_end, seg_type in segments:
+        seg_start = max(seg_start, start)
+        seg_end = min(seg_end, end)
+        if seg_end - seg_start <= 1e-6:
+            continue
+        if seg_type == "silent":
+            out_duration = build_segment_timeline(
+                [(seg_start, seg_end, seg_type)], max_speed=MAX_VIDEO_SPEED
+            )[0]["out_end"]
+            if current and current_out + out_duration > part_seconds:
+                parts.append(current)
+                current, current_out = [], 0.0
+            current.append((seg_start, seg_end, seg_type))
+            current_out += out_duration
+            continue
+        while seg_end - seg_start > 1e-6:
+            take = min(seg_end - seg_start, part_seconds - current_out)
+            if take > 1e-6:
+                current.append((seg_start, seg_start + take, seg_type))
+                current_out += take
+                seg_start += take
+            if current_out >= part_seconds - 1e-6:
+                parts.append(current)
+                current, current_out = [], 0.0
+    return parts, current
+
+def write_hls_playlist(playlist_path, parts, target_duration, ended=False):
+    """
+    Write an HLS EVENT playlist for parts [(filename, duration_seconds), ...].
+    The file is replaced atomically, so players polling it never read a partial playlist.
+    """
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{target_duration}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:EVENT",
+    ]
+    for name, duration in parts:
+        lines.append(f"#EXTINF:{duration:.3f},")
+        lines.append(name)
+    if ended:
+        lines.append("#EXT-X-ENDLIST")
+    tmp_path = playlist_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(tmp_path, playlist_path)
+
+def _arrival_time(observations, position):
+    """Wall-clock time at which the input first reached position, interpolated between polls."""
+    prev_wall, prev_end = None, None
+    for wall, end in observations:
+        if end >= position:
+            if prev_wall is None or end <= prev_end:
+                return wall
+            return prev_wall + (wall - prev_wall) * (position - prev_end) / (end - prev_end)
+        prev_wall, prev_end = wall, end
+    return observations[-1][0]
+
+def run_follow_mode(input_file, output_dir, args, png_path="fastforward.png"):
+    """
+    Near-real-time rendering of a recording that is still growing.
+    Each poll resumes VAD over the new audio, recomputes segments, and renders the region whose
+    segment boundaries can no longer change into MPEG-TS parts listed in output_dir/index.m3u8.
+    Once the input stops growing for args.follow_idle seconds (or on Ctrl-C), the rest is rendered
+    and the playlist is closed. Returns a summary dict with per-part latency.
+
+    Speech reaches the playlist at most about chunk + overlap + settle + part + poll seconds after
+    it is written to the input, plus VAD and render time; the measured latency is reported per part.
+    """
+    import math
+    import time
+
+    chunk_seconds = FOLLOW_VAD_CHUNK_SECONDS
+    overlap_seconds = 1.0
+    settle = follow_settle_seconds(args.vad_merge_gap, args.vad_pad, args.vad_speech_pad_ms)
+    part_seconds = args.follow_part_seconds
+    target_duration = int(math.ceil(max(part_seconds, 4.0)))
+    latency_bound = chunk_seconds + overlap_seconds + settle + part_seconds + args.follow_interval
+
+    os.makedirs(output_dir, exist_ok=True)
+    playlist_path = os.path.join(output_dir, "index.m3u8")
+    codec_name = get_video_codec(input_file)
+    print(f"Following {input_file} -> {playlist_path}")
+    print(f"Expected speech-to-playlist latency: <= {latency_bound:.0f}s plus VAD and render time")
+
+    track = None
+    observations = []  # (wall time, decoded seconds) per poll
+    rendered_until = 0.0
+    out_cursor = 0.0
+    playlist_parts = []
+    part_records = []
+    last_growth = time.monotonic()
+    finishing = False
+
+    while True:
+        try:
+            if not finishing:
+                time.sleep(0 if track is None else args.follow_interval)
+            speech_segments_raw, track = detect_speech_segments_silero(
+                input_file,
+                vad_threshold=args.vad_threshold,
+                offset=args.offset,
+                chunk_seconds=chunk_seconds,
+                overlap_seconds=overlap_seconds,
+                min_speech_duration_ms=args.vad_min_speech_ms,
+                min_silence_duration_ms=args.vad_min_silence_ms,
+                speech_pad_ms=args.vad_speech_pad_ms,
+                workers=args.vad_workers,
+                use_server=False,
+                backend=args.vad_backend,
+                return_probs=True,
+                resume_from=track,
+                energy_floor_db=args.vad_energy_floor,
+            )
+        except KeyboardInterrupt:
+            if finishing or track is None:
+                raise
+            print("Interrupted; rendering what has been recorded so far.")
+            finishing = True
+            continue
 
-    # Map codec to decoder/encoder
-    codec_map = {
-        "h264": {
-            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "h264_cuvid"],
-            "gpu_encoder": "h264_nvenc",
-            "cpu_encoder": "libx264"
-        },
-        "hevc": {
-            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "hevc_cuvid"],
-            "gpu_encoder": "hevc_nvenc",
-            "cpu_encoder": "libx265"
-        },
-        "h265": {
-            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "hevc_cuvid"],
-            "gpu_encoder": "hevc_nvenc",
-            "cpu_encoder": "libx265"
+        now = time.monotonic()
+        chunks = track["chunks"]
+        decoded_end = (chunks[-1]["start"] + chunks[-1]["samples"] / track["sample_rate"]) if chunks else 0.0
+        if observations and decoded_end <= observations[-1][1] + 1e-3:
+            if now - last_growth >= args.follow_idle:
+                finishing = True
+        else:
+            last_growth = now
+        observations.append((now, decoded_end))
+
+        speech_segments = normalize_speech_segments(
+            speech_segments_raw, max_end=decoded_end,
+            merge_gap_seconds=args.vad_merge_gap, pad_seconds=args.vad_pad,
+        )
+        silence_intervals = speech_segments_to_silence_intervals(speech_segments, total_duration=decoded_end)
+        segments = calculate_segments(silence_intervals, decoded_end)
+
+        if finishing:
+            cut, in_silence = decoded_end, True
+        else:
+            final_end = track["complete_windows"] * chunk_seconds - overlap_seconds
+            cut, in_silence = follow_cut_point(segments, final_end - settle)
+        parts, open_part = plan_follow_parts(segments, rendered_until, cut, part_seconds)
+        # Nothing can join the open part until the silence at the cut is final, so flush it now.
+        if open_part and in_silence:
+            parts.append(open_part)
+
+        for part in parts:
+            name = f"seg_{len(playlist_parts):05d}.ts"
+            render_segments_to_file(
+                input_file,
+                os.path.join(output_dir, name),
+                part,
+                codec_name,
+                indicator=args.indicator,
+                use_gpu=args.gpu,
+                offset=args.offset,
+                png_path=png_path,
+                use_gpu_decode=args.gpu_decode,
+                extra_output_args=["-f", "mpegts", "-output_ts_offset", f"{out_cursor:.6f}"],
+                timeline=args.timeline,
+                ff_fps=args.ff_fps,
+            )
+            duration = build_segment_timeline(part, max_speed=MAX_VIDEO_SPEED)[-1]["out_end"]
+            # Latency is measured from the first speech in the part (silence waits for its own end).
+            speech_start = next((start for start, _, typ in part if typ != "silent"), None)
+            latency = None
+            if speech_start is not None:
+                latency = time.monotonic() - _arrival_time(observations, speech_start)
+            playlist_parts.append((name, duration))
+            out_cursor += duration
+            rendered_until = part[-1][1]
+            part_records.append({
+                "name": name,
+                "in_start": part[0][0],
+                "in_end": part[-1][1],
+                "duration": duration,
+                "latency": latency,
+                "final": finishing,
+            })
+            write_hls_playlist(playlist_path, playlist_parts, target_duration)
+            if not args.quiet:
+                latency_text = f"latency={latency:.1f}s" if latency is not None else "silence"
+                print(f"  {name}: in=[{part[0][0]:.1f},{part[-1][1]:.1f}] out={duration:.2f}s "
+                      f"{latency_text}{' (final)' if finishing else ''}")
+
+        if finishing:
+            break
+
+    write_hls_playlist(playlist_path, playlist_parts, target_duration, ended=True)
+    # Leave a sidecar behind so the full recording can be re-rendered or retuned later.
+    write_vad_metadata(
+        input_file, speech_segments, silence_intervals, decoded_end, "silero",
+        {
+            "vad_threshold": args.vad_threshold,
+            "offset": args.offset,
+            "process_duration": None,
+            "min_speech_ms": args.vad_min_speech_ms,
+            "min_silence_ms": args.vad_min_silence_ms,
+            "speech_pad_ms": args.vad_speech_pad_ms,
+            "merge_gap": args.vad_merge_gap,
+            "pad": args.vad_pad,
+            "energy_floor_db": args.vad_energy_floor,
         },
-        "av1": {
-            "gpu_decoder": ["-hwaccel", "cuvid", "-c:v", "av1_cuvid"],
-            "gpu_encoder": "av1_nvenc",
-            "cpu_encoder": "libaom-av1"
-        }
+        probabilities=track,
+        sidecar_format=args.sidecar_format,
+    )
+    live_latencies = [record["latency"] for record in part_records
+                      if not record["final"] and record["latency"] is not None]
+    summary = {
+        "parts": part_records,
+        "input_duration": decoded_end,
+        "output_duration": out_cursor,
+        "latency_bound": latency_bound,
+        "max_latency": max(live_latencies) if live_latencies else None,
+        "mean_latency": (sum(live_latencies) / len(live_latencies)) if live_latencies else None,
     }
+    print(f"Follow done: {len(part_records)} part(s), {out_cursor:.1f}s output from {decoded_end:.1f}s input.")
+    if live_latencies:
+        print(f"Speech-to-playlist latency while recording: max {summary['max_latency']:.1f}s, "
+              f"mean {summary['mean_latency']:.1f}s (expected <= {latency_bound:.0f}s plus VAD and render time)")
+    return summary
 
-    codec_key = codec_name.lower()
-    if codec_key not in codec_map:
-        print(f"Warning: Unrecognized codec '{codec_name}'. Defaulting to software x264.")
-        vcodec = "libx264"
-        decoder_args = []
-    else:
-        entry = codec_map[codec_key]
-        vcodec = entry["gpu_encoder"] if use_gpu else entry["cpu_encoder"]
-        decoder_args = entry["gpu_decoder"] if use_gpu and use_gpu_decode else []
+FOLDER_JOB_DECODE_WEIGHT = 0.25  # Decoding an input second costs ~1/4 of encoding an output second
+FOLDER_JOB_SEGMENT_COST = 0.05  # Per-segment filtergraph overhead, in encode-seconds
 
-    print(f"Detected input codec: {codec_name}")
-    print(f"Selected encoder: {vcodec}")
-    if decoder_args:
-        print(f"Selected decoder args: {' '.join(decoder_args)}")
+def estimate_video_job_cost(video_path, silence_intervals_master, analyzed_duration, args):
+    """
+    Estimate the relative cost of rendering one folder-mode video from its probe record and the
+    shared segments: every input frame is decoded, every output frame is encoded at the input
+    resolution, and each segment adds filtergraph overhead. Units are 1080p encode-seconds.
+    Returns a dict with duration, pixels, segments, output_duration and cost.
+    """
+    media = probe_media(video_path)
+    video_duration = max(0, (media["duration"] or 0.0) - args.offset)
+    if args.process_duration:
+        video_duration = min(video_duration, args.process_duration)
+    silence_intervals = list(silence_intervals_master)
+    if abs(analyzed_duration - video_duration) > 1.0:
+        silence_intervals = truncate_intervals_to_duration(silence_intervals, video_duration)
+    segments = calculate_segments(silence_intervals, video_duration)
+    timeline = build_segment_timeline(segments, max_speed=MAX_VIDEO_SPEED)
+    output_duration = timeline[-1]["out_end"] if timeline else 0.0
+    pixels = (media["width"] or 1920) * (media["height"] or 1080)
+    scale = pixels / (1920 * 1080)
+    cost = (scale * (video_duration * FOLDER_JOB_DECODE_WEIGHT + output_duration)
+            + len(segments) * FOLDER_JOB_SEGMENT_COST)
+    return {
+        "duration": video_duration,
+        "pixels": pixels,
+        "segments": len(segments),
+        "output_duration": output_duration,
+        "cost": cost,
+    }
 
-    # Write filtergraph to a temp file to avoid "Argument list too long" on long videos
-    import tempfile
-    fg_file = tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False, prefix="vs_filtergraph_")
-    fg_file.write(filtergraph)
-    fg_file.close()
-    fg_path = fg_file.name
+def simulate_makespan(job_costs, workers):
+    """
+    Makespan of list-scheduling jobs in the given order onto `workers` slots (each job starts on
+    the first slot to become free).
+    """
+    import heapq
 
-    cmd = ["ffmpeg", "-y"]
-    cmd += decoder_args
-    if offset and offset > 0:
-        cmd += ["-ss", str(offset)]
-    if process_duration:
-        cmd += ["-t", str(process_duration)]
-    cmd += [
-        "-i", input_file,
-        "-i", png_path,  # Add PNG as second input
-        "-filter_complex_script", fg_path,
-        "-map", "[vout]",
-        "-map", "[aout]",
-        "-c:v", vcodec,
-        "-crf", "23" if not use_gpu else "18",
-        "-c:a", "aac",
-        "-b:a", "128k",
-        "-progress", "pipe:1",
-        "-nostats",
-        output_file
-    ]
-    print("Running FFmpeg processing command:")
-    print(" ".join(cmd))
-    print(f"Filtergraph written to: {fg_path} ({len(filtergraph)} chars)")
-    try:
-        # progress_segments passed as parameter
-        progress_map = None
-        progress_map_index = 0
-        if progress_segments:
-            out_cursor = 0.0
-            progress_map = []
-            for seg_start, seg_end, seg_type in progress_segments:
-                seg_start = float(seg_start)
-                seg_end = float(seg_end)
-                in_duration = max(0.0, seg_end - seg_start)
-                speed = 1.0
-                if seg_type == "silent":
-                    speed = compute_silent_speed(in_duration)
-                out_duration = 0.0 if speed <= 0 else in_duration / speed
-                progress_map.append(
-                    {
-                        "out_start": out_cursor,
-                        "out_end": out_cursor + out_duration,
-                        "in_start": seg_start,
-                        "in_end": seg_end,
-                        "speed": speed,
-                    }
-                )
-                out_cursor += out_duration
+    finish_times = [0.0] * max(1, workers)
+    for cost in job_costs:
+        heapq.heapreplace(finish_times, finish_times[0] + cost)
+    return max(finish_times)
 
-        def map_out_time_to_input_time(out_time_seconds):
-            nonlocal progress_map_index
-            if not progress_map:
-                return out_time_seconds
-            while (
-                progress_map_index < len(progress_map)
-                and out_time_seconds > progress_map[progress_map_index]["out_end"] + 1e-6
-            ):
-                progress_map_index += 1
-            if progress_map_index >= len(progress_map):
-                return video_duration
-            seg = progress_map[progress_map_index]
-            rel_out = max(0.0, min(out_time_seconds - seg["out_start"], seg["out_end"] - seg["out_start"]))
-            return min(video_duration, seg["in_start"] + rel_out * seg["speed"])
+def partition_cpus(workers):
+    """
+    Split the CPUs this process may run on into `workers` disjoint, near-equal sets.
+    Returns a list of CPU sets, or None when affinity is unsupported or there are fewer CPUs than workers.
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    if len(cpus) < workers:
+        return None
+    base, extra = divmod(len(cpus), workers)
+    sets = []
+    start = 0
+    for idx in range(workers):
+        size = base + (1 if idx < extra else 0)
+        sets.append(set(cpus[start:start + size]))
+        start += size
+    return sets
+
+def cpu_pinning_method():
+    """
+    How a child can be pinned to a CPU set: "taskset" (wraps the command, so every thread is pinned),
+    "setaffinity" (os.sched_setaffinity on the running child, missing threads it already started) or None.
+    """
+    if shutil.which("taskset"):
+        return "taskset"
+    if hasattr(os, "sched_setaffinity"):
+        return "setaffinity"
+    return None
+
+def available_cpu_count():
+    """CPUs this process may run on (its affinity mask where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+PROGRESS_BOARD_REFRESH_SECONDS = 1.0  # Live table redraw interval on a terminal
+PROGRESS_BOARD_LINE_SECONDS = 10.0  # Interval between plain progress lines when stdout isn't a terminal
+
+def format_eta(seconds):
+    """Compact H:MM:SS / M:SS rendering of an ETA, or "?" when unknown."""
+    if seconds is None:
+        return "?"
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+class ParallelProgressBoard:
+    """
+    Consolidated progress for parallel folder mode, fed by each job's FFmpeg -progress blocks
+    (see run_ffmpeg_processing's on_progress). Shows per-job input position, fps, speed and ETA,
+    plus the overall ETA and aggregate realtime factor.
+
+    On a terminal with rich installed it is a live table; otherwise it prints one machine-readable
+    line per running job and one summary line every PROGRESS_BOARD_LINE_SECONDS:
+        progress job=NAME pos=S duration=S fps=F speed=Xx eta=S
+        progress total done=K jobs=N running=R rate=Xx eta=S elapsed=S
+    Use as a context manager; the display stops when the block exits.
+    """
 
-        if tqdm is None or not show_progress:
-            if tqdm is None and show_progress:
-                print("[warn] tqdm is not installed; running without progress bar.")
-            proc = subprocess.Popen(
-                cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
+    def __init__(self, durations, live=None):
+        import time
+
+        self._time = time.monotonic
+        self.durations = dict(durations)  # job name -> input seconds to render
+        self.jobs = {}  # job name -> progress state, for started jobs
+        self.done = 0
+        self.lock = threading.Lock()
+        self.started = self._time()
+        self.live = (sys.stdout.isatty() and Console is not None) if live is None else live
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+    def start_job(self, name):
+        with self.lock:
+            self.jobs[name] = {"started": self._time(), "pos": 0.0, "fps": None, "speed": None, "status": "running"}
+
+    def finish_job(self, name, status):
+        with self.lock:
+            job = self.jobs.setdefault(name, {"started": self._time(), "pos": 0.0, "fps": None, "speed": None})
+            job["status"] = status
+            if status == "success":
+                job["pos"] = self.durations.get(name, job["pos"])
+            else:
+                self.durations[name] = job["pos"]  # Nothing more will be rendered for it
+            self.done += 1
+
+    def progress_callback(self, name):
+        """An on_progress callback recording blocks for job `name`."""
+        def on_progress(block):
+            with self.lock:
+                job = self.jobs.get(name)
+                if job is None:
+                    return
+                if block.get("input_time") is not None:
+                    job["pos"] = block["input_time"]
+                for key in ("fps", "speed"):
+                    if block.get(key) is not None:
+                        job[key] = block[key]
+        return on_progress
+
+    def snapshot(self):
+        """Per-job rows and overall totals as plain dicts (ETAs in seconds, None when unknown)."""
+        now = self._time()
+        with self.lock:
+            rows = []
+            rendered = 0.0
+            for name, job in self.jobs.items():
+                rendered += job["pos"]
+                if job["status"] != "running":
+                    continue
+                duration = self.durations.get(name)
+                rate = job["pos"] / (now - job["started"]) if now > job["started"] else 0.0
+                eta = (duration - job["pos"]) / rate if duration is not None and rate > 0 else None
+                rows.append({"job": name, "pos": job["pos"], "duration": duration, "fps": job["fps"],
+                             "speed": job["speed"], "eta": eta})
+            elapsed = now - self.started
+            rate = rendered / elapsed if elapsed > 0 else 0.0
+            remaining = sum(self.durations.values()) - rendered
+            totals = {"done": self.done, "jobs": len(self.durations), "running": len(rows),
+                      "rate": rate, "eta": max(0.0, remaining) / rate if rate > 0 else None,
+                      "elapsed": elapsed}
+        return rows, totals
+
+    def format_lines(self):
+        rows, totals = self.snapshot()
+        def num(value, fmt):
+            return "NA" if value is None else format(value, fmt)
+        lines = [
+            f"progress job={row['job']} pos={row['pos']:.1f} duration={num(row['duration'], '.1f')} "
+            f"fps={num(row['fps'], '.1f')} speed={num(row['speed'], '.2f')}x eta={num(row['eta'], '.0f')}"
+            for row in rows
+        ]
+        lines.append(
+            f"progress total done={totals['done']} jobs={totals['jobs']} running={totals['running']} "
+            f"rate={totals['rate']:.2f}x eta={num(totals['eta'], '.0f')} elapsed={totals['elapsed']:.0f}"
+        )
+        return lines
+
+    def render_table(self):
+        rows, totals = self.snapshot()
+        table = Table(
+            title=(f"{totals['done']}/{totals['jobs']} done, {totals['running']} running, "
+                   f"{totals['rate']:.2f}x realtime, ETA {format_eta(totals['eta'])}"),
+            box=box.SIMPLE,
+        )
+        for column in ("Video", "Input position", "FPS", "Speed", "ETA"):
+            table.add_column(column, justify="left" if column == "Video" else "right")
+        for row in rows:
+            position = f"{row['pos']:.0f}s"
+            if row["duration"]:
+                position += f" / {row['duration']:.0f}s ({row['pos'] / row['duration']:.0%})"
+            table.add_row(
+                row["job"],
+                position,
+                "" if row["fps"] is None else f"{row['fps']:.0f}",
+                "" if row["speed"] is None else f"{row['speed']:.2f}x",
+                format_eta(row["eta"]),
             )
-            while True:
-                line = proc.stdout.readline()
-                if not line:
-                    break
-                if show_progress and (line.startswith("out_time_ms=") or line.startswith("out_time=")):
-                    print(line.strip())
-            proc.wait()
-        else:
-            with tqdm(total=video_duration, unit="s", desc="Processing", dynamic_ncols=True) as pbar:
-                proc = subprocess.Popen(
-                    cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, bufsize=1
-                )
-                while True:
-                    line = proc.stdout.readline()
-                    if not line:
-                        break
-                    if line.startswith("out_time_ms="):
-                        try:
-                            value = line.strip().split("=")[1]
-                            if value != "N/A":
-                                ms = int(value)
-                                seconds = ms / 1_000_000
-                                input_seconds = map_out_time_to_input_time(seconds)
-                                pbar.n = min(input_seconds, video_duration)
-                                pbar.refresh()
-                        except (ValueError, IndexError):
-                            pass
-                    elif line.startswith("out_time="):
-                        try:
-                            t = line.strip().split("=")[1]
-                            if t != "N/A":
-                                h, m, s = t.split(":")
-                                seconds = int(h) * 3600 + int(m) * 60 + float(s)
-                                input_seconds = map_out_time_to_input_time(seconds)
-                                pbar.n = min(input_seconds, video_duration)
-                                pbar.refresh()
-                        except (ValueError, IndexError):
-                            pass
-
-                proc.wait()
-                pbar.n = video_duration
-                pbar.refresh()
+        return table
 
-        if proc.returncode == 0:
-            print("FFmpeg processing completed successfully.")
+    def _run(self):
+        if self.live:
+            from rich.live import Live
+
+            with Live(self.render_table(), refresh_per_second=4, transient=True) as live:
+                while not self._stop.wait(PROGRESS_BOARD_REFRESH_SECONDS):
+                    live.update(self.render_table())
         else:
-            print("Error running FFmpeg processing. See FFmpeg output above.")
-            print(proc.stderr.read())
-            raise subprocess.CalledProcessError(proc.returncode, cmd)
-    except Exception as e:
-        print("Error during FFmpeg processing:", e)
-        raise
-    finally:
-        # Clean up filtergraph temp file
-        try:
-            os.unlink(fg_path)
-        except OSError:
-            pass
+            while not self._stop.wait(PROGRESS_BOARD_LINE_SECONDS):
+                for line in self.format_lines():
+                    print(line, flush=True)
+
+PARALLEL_AUTO_GPU_CEILING = 4  # NVENC session headroom on consumer GPUs
+PARALLEL_AUTO_INTERVAL = 15.0  # Seconds of throughput measured per adjustment decision
+PARALLEL_AUTO_PLATEAU = 0.05  # An extra job must raise aggregate throughput by at least 5%
+PARALLEL_AUTO_MAX_LOAD = 1.5  # 1-minute load average per CPU above which jobs are removed
+PARALLEL_AUTO_MIN_MEM_FRACTION = 0.10  # MemAvailable share below which jobs are removed
+
+def parallel_auto_ceiling(use_gpu=False):
+    """Most jobs --parallel auto may run at once: one per CPU (at least 2), capped for NVENC with --gpu."""
+    ceiling = max(2, available_cpu_count())
+    if use_gpu:
+        ceiling = min(ceiling, PARALLEL_AUTO_GPU_CEILING)
+    return ceiling
+
+def read_memory_info():
+    """(MemAvailable, MemTotal) in bytes from /proc/meminfo, or None where it isn't available."""
+    try:
+        with open("/proc/meminfo") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+        return int(fields["MemAvailable"].split()[0]) * 1024, int(fields["MemTotal"].split()[0]) * 1024
+    except (OSError, KeyError, ValueError):
+        return None
+
+def read_load_per_cpu():
+    """1-minute load average divided by the usable CPU count, or None where it isn't available."""
+    try:
+        return os.getloadavg()[0] / available_cpu_count()
+    except (AttributeError, OSError):
+        return None
 
-def process_single_video(video_path, output_dir, silence_intervals_master, analyzed_duration, args, png_path, show_progress=True):
-    """Process a single video file. Thread-safe: no shared mutable state."""
+def iter_adaptive_parallel(jobs, run_job, ceiling, log=print, interval=PARALLEL_AUTO_INTERVAL):
+    """
+    Run run_job(job, target, on_progress) for every job with an adaptively chosen number in flight,
+    yielding each result as it completes.
+
+    Starts with one job. After each interval while jobs are still queued, the aggregate
+    realtime factor (input seconds rendered per wall-clock second, summed over jobs from their
+    -progress out_time) decides the next step. Memory pressure or load above
+    PARALLEL_AUTO_MAX_LOAD per CPU removes a job. A job added without a PARALLEL_AUTO_PLATEAU gain
+    is taken back and the target is then held. Otherwise another job is added, up to ceiling.
+    Running jobs are never interrupted; a lower target takes effect as they finish.
+    Every adjustment is passed to log with its reason.
+    """
+    import time
+    from collections import deque
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+    lock = threading.Lock()
+    rendered = {"seconds": 0.0}
+    speeds = {}
+
+    def make_progress_callback(job):
+        last = {"input_time": 0.0}
+
+        def on_progress(block):
+            input_time = block.get("input_time")
+            with lock:
+                if input_time is not None and input_time > last["input_time"]:
+                    rendered["seconds"] += input_time - last["input_time"]
+                    last["input_time"] = input_time
+                if block.get("speed") is not None:
+                    speeds[job] = block["speed"]
+        return on_progress
+
+    pending = deque(jobs)
+    in_flight = {}
+    target = 1
+    history = {}  # target -> best aggregate realtime factor measured at it
+    last_increase_from = None
+    settled = False
+
+    def adjust(new_target, reason):
+        nonlocal target
+        log(f"[parallel auto] {target} -> {new_target} job(s): {reason}")
+        target = new_target
+
+    window_start = time.monotonic()
+    window_rendered = 0.0
+    with ThreadPoolExecutor(max_workers=ceiling) as executor:
+        def top_up():
+            while pending and len(in_flight) < target:
+                job = pending.popleft()
+                in_flight[executor.submit(run_job, job, target, make_progress_callback(job))] = job
+
+        top_up()
+        while in_flight:
+            done, _ = wait(list(in_flight), timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                speeds.pop(in_flight.pop(future), None)
+                yield future.result()
+            top_up()
+            if not pending:
+                continue  # Draining: nothing left to adjust
+
+            now = time.monotonic()
+            if now - window_start < interval:
+                continue
+            with lock:
+                total_rendered = rendered["seconds"]
+                job_speeds = sorted(speeds.values(), reverse=True)
+            throughput = (total_rendered - window_rendered) / (now - window_start)
+            window_start, window_rendered = now, total_rendered
+
+            load = read_load_per_cpu()
+            memory = read_memory_info()
+            observed = (f"aggregate {throughput:.2f}x realtime"
+                        + (f", load {load:.2f}/CPU" if load is not None else "")
+                        + (f", per-job speed {', '.join(f'{v:.2f}x' for v in job_speeds)}" if job_speeds else ""))
+            history[target] = max(throughput, history.get(target, 0.0))
+
+            if memory and memory[0] < memory[1] * PARALLEL_AUTO_MIN_MEM_FRACTION and target > 1:
+                adjust(target - 1, f"MemAvailable {memory[0] / 2**30:.1f} GiB is below "
+                                   f"{PARALLEL_AUTO_MIN_MEM_FRACTION:.0%} of RAM; {observed}")
+                settled = True
+            elif load is not None and load > PARALLEL_AUTO_MAX_LOAD and target > 1:
+                adjust(target - 1, f"load above {PARALLEL_AUTO_MAX_LOAD:.1f}/CPU; {observed}")
+                settled = True
+            elif last_increase_from is not None:
+                baseline = history.get(last_increase_from, 0.0)
+                if throughput < baseline * (1 + PARALLEL_AUTO_PLATEAU):
+                    adjust(last_increase_from, f"throughput plateaued ({observed} vs "
+                                               f"{baseline:.2f}x with {last_increase_from}); holding")
+                    settled = True
+                last_increase_from = None
+            elif not settled and target < ceiling and pending:
+                last_increase_from = target
+                adjust(target + 1, f"probing for more throughput; {observed}")
+            top_up()
+
+def process_single_video(video_path, output_dir, silence_intervals_master, analyzed_duration, args, png_path, show_progress=True, threads=None, cpu_set=None, on_progress=None):
+    """
+    Process a single video file. Thread-safe: no shared mutable state.
+    threads, cpu_set and on_progress are passed to run_ffmpeg_processing.
+    """
     video_name = os.path.basename(video_path)
     output_path = os.path.join(output_dir, video_name)
 
@@ -1142,59 +4662,87 @@ def process_single_video(video_path, output_dir, silence_intervals_master, analy
             print(f"Skipping (output exists): {video_name}")
         return {"status": "skipped", "file": video_name}
 
-    if show_progress:
-        print(f"\nProcessing: {video_name}")
-    try:
-        full_duration = get_video_duration(video_path)
-        video_duration = max(0, full_duration - args.offset)
-        if args.process_duration:
-            video_duration = min(video_duration, args.process_duration)
-
-        silence_intervals = list(silence_intervals_master)
+    with metrics_scope(video_name):
+        if show_progress:
+            print(f"\nProcessing: {video_name}")
+        try:
+            full_duration = get_video_duration(video_path)
+            video_duration = max(0, full_duration - args.offset)
+            if args.process_duration:
+                video_duration = min(video_duration, args.process_duration)
 
-        duration_diff = abs(analyzed_duration - video_duration)
-        if duration_diff > 1.0:
-            print(f"  Warning: Sidecar analyzed {analyzed_duration:.1f}s but "
-                  f"'{video_name}' is {video_duration:.1f}s (diff: {duration_diff:.1f}s). "
-                  f"Truncating intervals.", file=sys.stderr)
-            silence_intervals = truncate_intervals_to_duration(
-                silence_intervals, video_duration
-            )
+            silence_intervals = list(silence_intervals_master)
 
-        segments = calculate_segments(silence_intervals, video_duration)
+            duration_diff = abs(analyzed_duration - video_duration)
+            if duration_diff > 1.0:
+                print(f"  Warning: Sidecar analyzed {analyzed_duration:.1f}s but "
+                      f"'{video_name}' is {video_duration:.1f}s (diff: {duration_diff:.1f}s). "
+                      f"Truncating intervals.", file=sys.stderr)
+                silence_intervals = truncate_intervals_to_duration(
+                    silence_intervals, video_duration
+                )
 
-        filtergraph = build_filtergraph(
-            segments,
-            args.indicator,
-            use_gpu_decode=False,
-            png_input_index=1,
-            png_path=png_path
-        )
+            segments = calculate_segments(silence_intervals, video_duration)
+            metrics_count("input_seconds", video_duration)
+
+            filtergraph = build_render_filtergraph(
+                video_path,
+                segments,
+                args.indicator,
+                timeline=args.timeline,
+                ff_fps=args.ff_fps,
+                use_gpu_decode=False,
+                png_input_index=1,
+                png_path=png_path
+            )
 
-        codec_name = get_video_codec(video_path)
-        run_ffmpeg_processing(
-            video_path,
-            output_path,
-            filtergraph,
-            video_duration,
-            codec_name,
-            use_gpu=args.gpu,
-            offset=args.offset,
-            process_duration=args.process_duration,
-            png_path=png_path,
-            use_gpu_decode=False,
-            progress_segments=segments,
-            show_progress=show_progress,
-        )
-        return {"status": "success", "file": video_name}
-    except Exception as e:
-        print(f"  Error processing '{video_name}': {e}", file=sys.stderr)
-        return {"status": "error", "file": video_name, "error": str(e)}
+            codec_name = get_video_codec(video_path)
+            run_ffmpeg_processing(
+                video_path,
+                output_path,
+                filtergraph,
+                video_duration,
+                codec_name,
+                use_gpu=args.gpu,
+                offset=args.offset,
+                process_duration=args.process_duration,
+                png_path=png_path,
+                use_gpu_decode=False,
+                progress_segments=segments,
+                show_progress=show_progress,
+                threads=threads,
+                cpu_set=cpu_set,
+                on_progress=on_progress,
+            )
+            return {"status": "success", "file": video_name}
+        except Exception as e:
+            print(f"  Error processing '{video_name}': {e}", file=sys.stderr)
+            return {"status": "error", "file": video_name, "error": str(e)}
 
 
 def main():
     args = parse_args()
 
+    # --- Sidecar conversion: standalone, no video needed ---
+    if args.convert_sidecar:
+        if not os.path.isfile(args.convert_sidecar):
+            print(f"Error: Sidecar '{args.convert_sidecar}' does not exist.", file=sys.stderr)
+            sys.exit(1)
+        try:
+            dst_path = convert_vad_sidecar(args.convert_sidecar)
+        except (ValueError, KeyError) as e:
+            print(f"Error: Cannot convert {args.convert_sidecar}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"Wrote: {dst_path}")
+        sys.exit(0)
+
+    if args.metrics_json:
+        import atexit
+
+        start_metrics()
+        mode = "follow" if args.follow else "detect" if args.detect else "folder" if args.folder else "single"
+        atexit.register(write_metrics_json, args.metrics_json, mode)
+
     # --- Argument validation matrix ---
     # --detect + --vad-json is invalid (detect writes sidecar, vad-json reads one)
     if args.detect and args.vad_json:
@@ -1207,6 +4755,10 @@ def main():
         sys.exit(1)
 
     # --parallel validation
+    parallel_auto = args.parallel == "auto"
+    if parallel_auto:
+        # Upper bound for the adaptive controller; the remaining checks see it as a fixed N
+        args.parallel = parallel_auto_ceiling(args.gpu)
     if args.parallel < 1:
         print("Error: --parallel must be >= 1.", file=sys.stderr)
         sys.exit(1)
@@ -1217,6 +4769,63 @@ def main():
               f"Consumer GPUs support 8-12 concurrent sessions. Consider --parallel 2-4.",
               file=sys.stderr)
 
+    if args.vad_workers < 1:
+        print("Error: --vad-workers must be >= 1.", file=sys.stderr)
+        sys.exit(1)
+    if args.silence_shards < 1:
+        print("Error: --silence-shards must be >= 1.", file=sys.stderr)
+        sys.exit(1)
+
+    # --retune re-segments stored VAD probabilities: needs a sidecar to read
+    if args.retune and not (args.vad_json or args.detect):
+        print("Error: --retune requires --vad-json or --detect.", file=sys.stderr)
+        sys.exit(1)
+    if args.retune and args.detect and not args.vad:
+        print("Error: --retune requires VAD (cannot be combined with --no-vad).", file=sys.stderr)
+        sys.exit(1)
+    if args.resume and not (args.detect and args.vad):
+        print("Error: --resume requires --detect with VAD.", file=sys.stderr)
+        sys.exit(1)
+    if args.resume and args.retune:
+        print("Error: --resume and --retune cannot be used together.", file=sys.stderr)
+        sys.exit(1)
+
+    if args.smart_render_workers is not None and args.smart_render_workers < 1:
+        print("Error: --smart-render-workers must be >= 1.", file=sys.stderr)
+        sys.exit(1)
+    if args.smart_render and (args.folder or args.detect or args.follow):
+        print("[info] --smart-render is only used for single-file rendering; ignoring.", file=sys.stderr)
+    elif args.smart_render_workers is not None and not args.smart_render:
+        print("[info] --smart-render-workers is only used with --smart-render; ignoring.", file=sys.stderr)
+
+    # --chunks validation
+    if args.chunks < 1:
+        print("Error: --chunks must be >= 1.", file=sys.stderr)
+        sys.exit(1)
+    if args.chunks > 1 and (args.folder or args.detect):
+        print("[info] --chunks is only used for single-file rendering; ignoring.", file=sys.stderr)
+    if args.chunks > 4 and args.gpu:
+        print(f"Warning: --chunks {args.chunks} with --gpu may exceed NVENC session limits. "
+              f"Consumer GPUs support 8-12 concurrent sessions. Consider --chunks 2-4.",
+              file=sys.stderr)
+
+    # --follow renders a growing input live: its own mode, VAD only
+    if args.follow:
+        if args.folder or args.detect or args.vad_json:
+            print("Error: --follow cannot be combined with --folder, --detect or --vad-json.", file=sys.stderr)
+            sys.exit(1)
+        if not args.vad:
+            print("Error: --follow requires VAD (cannot be combined with --no-vad).", file=sys.stderr)
+            sys.exit(1)
+        if args.process_duration:
+            print("Error: --follow processes the input until it stops growing; "
+                  "--process-duration is not supported.", file=sys.stderr)
+            sys.exit(1)
+        if args.follow_interval <= 0 or args.follow_idle <= 0 or args.follow_part_seconds <= 0:
+            print("Error: --follow-interval, --follow-idle and --follow-part-seconds must be > 0.",
+                  file=sys.stderr)
+            sys.exit(1)
+
     # Mode-specific required args
     if args.folder:
         # Folder mode validation
@@ -1237,6 +4846,14 @@ def main():
         if not args.input:
             print("Error: --detect requires -i/--input.", file=sys.stderr)
             sys.exit(1)
+    elif args.follow:
+        # Follow: needs -i and -o (output directory for the HLS playlist and parts)
+        if not args.input:
+            print("Error: --follow requires -i/--input.", file=sys.stderr)
+            sys.exit(1)
+        if not args.output:
+            print("Error: --follow requires -o/--output (output directory).", file=sys.stderr)
+            sys.exit(1)
     elif args.vad_json:
         # Process from sidecar: needs -i and -o
         if not args.input:
@@ -1266,28 +4883,128 @@ def main():
         print(f"Error: Input file '{args.input}' does not exist.", file=sys.stderr)
         sys.exit(1)
 
+    # --- Follow mode: render a growing recording as HLS and exit ---
+    if args.follow:
+        # Software filters are always in the filtergraph (see single-file mode below)
+        args.gpu_decode = False
+        png_path = os.path.join(os.path.dirname(__file__), "fastforward.png")
+        try:
+            run_follow_mode(args.input, args.output, args, png_path=png_path)
+        except (RuntimeError, ValueError) as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
     # --- Detect-only mode: write sidecar and exit ---
+    if args.detect and args.retune:
+        # Rewrite the input's sidecar from its stored probabilities (no decoding or inference)
+        base = os.path.splitext(args.input)[0]
+        extensions = [".vad.bin", ".vad.json"] if args.sidecar_format == "bin" else [".vad.json", ".vad.bin"]
+        candidates = [base + extension for extension in extensions]
+        existing = [path for path in candidates if os.path.isfile(path)]
+        if not existing:
+            print(f"Error: --retune needs an existing sidecar: {candidates[0]}", file=sys.stderr)
+            sys.exit(1)
+        sidecar_path = existing[0]
+        speech_segments, silence_intervals, video_duration, sidecar = retune_vad_metadata(
+            sidecar_path, args.vad_threshold,
+            min_speech_duration_ms=args.vad_min_speech_ms,
+            min_silence_duration_ms=args.vad_min_silence_ms,
+            speech_pad_ms=args.vad_speech_pad_ms,
+            merge_gap_seconds=args.vad_merge_gap,
+            pad_seconds=args.vad_pad,
+        )
+        stored_params = sidecar["detection"]["params"]
+        params = {
+            "vad_threshold": args.vad_threshold,
+            "offset": stored_params.get("offset", 0.0),
+            "process_duration": stored_params.get("process_duration"),
+            "min_speech_ms": args.vad_min_speech_ms,
+            "min_silence_ms": args.vad_min_silence_ms,
+            "speech_pad_ms": args.vad_speech_pad_ms,
+            "merge_gap": args.vad_merge_gap,
+            "pad": args.vad_pad,
+            "energy_floor_db": stored_params.get("energy_floor_db"),
+        }
+        write_vad_metadata(
+            args.input, speech_segments, silence_intervals, video_duration,
+            sidecar["detection"]["backend"], params,
+            probabilities=decode_probability_track(sidecar["probabilities"]),
+            sidecar_path=sidecar_path,
+            sidecar_format="bin" if is_vad_binary(sidecar_path) else "json",
+        )
+        speech_total = sum(e - s for s, e in speech_segments)
+        speech_pct = (speech_total / video_duration * 100) if video_duration > 0 else 0
+        print(f"Retuned: {sidecar_path} ({speech_pct:.1f}% speech, "
+              f"{len(silence_intervals)} silence intervals, "
+              f"{video_duration:.1f}s analyzed)")
+        sys.exit(0)
+
     if args.detect:
+        # With --resume, an existing sidecar is updated in place (keeping its format)
+        sidecar_path = None
+        sidecar_format = args.sidecar_format
         if args.process_duration:
             video_duration = args.process_duration
         else:
             full_duration = get_video_duration(args.input)
             video_duration = max(0, full_duration - args.offset)
+        metrics_count("input_seconds", video_duration)
 
         if args.vad:
+            resume_from = None
+            if args.resume:
+                base = os.path.splitext(args.input)[0]
+                existing = [path for path in (base + ".vad.bin", base + ".vad.json") if os.path.isfile(path)]
+                if existing:
+                    sidecar_path = existing[0]
+                    sidecar_format = "bin" if sidecar_path.endswith(".vad.bin") else "json"
+                    previous = read_vad_sidecar(existing[0])
+                    previous_params = previous["detection"].get("params", {})
+                    if "probabilities" not in previous:
+                        print(f"[info] {existing[0]} has no stored VAD probabilities; running full detection.",
+                              file=sys.stderr)
+                    elif (previous_params.get("offset", 0.0) != args.offset
+                          or previous_params.get("process_duration") != args.process_duration):
+                        print(f"[info] {existing[0]} covers a different --offset/--process-duration; "
+                              f"running full detection.", file=sys.stderr)
+                    elif previous_params.get("energy_floor_db") != args.vad_energy_floor:
+                        print(f"[info] {existing[0]} was detected with a different --vad-energy-floor; "
+                              f"running full detection.", file=sys.stderr)
+                    else:
+                        resume_from = decode_probability_track(previous["probabilities"])
+                        if resume_from["complete_windows"] is None:
+                            print(f"[info] {existing[0]} predates resumable detection; running full detection.",
+                                  file=sys.stderr)
+                            resume_from = None
+                        elif not args.quiet:
+                            resumed_at = resume_from["complete_windows"] * resume_from["chunk_seconds"]
+                            print(f"Resuming detection at {resumed_at:.1f}s from {existing[0]}")
             # Silero VAD detection
+            vad_stats = {}
             try:
-                speech_segments_raw = detect_speech_segments_silero(
+                speech_segments_raw, probabilities = detect_speech_segments_silero(
                     args.input,
                     vad_threshold=args.vad_threshold,
                     offset=args.offset,
                     process_duration=args.process_duration,
+                    workers=args.vad_workers,
+                    use_server=not args.no_vad_server,
+                    backend=args.vad_backend,
+                    min_speech_duration_ms=args.vad_min_speech_ms,
+                    min_silence_duration_ms=args.vad_min_silence_ms,
+                    speech_pad_ms=args.vad_speech_pad_ms,
+                    return_probs=True,
+                    resume_from=resume_from,
+                    energy_floor_db=args.vad_energy_floor,
+                    stats=vad_stats,
                 )
-            except RuntimeError as e:
+            except (RuntimeError, ValueError) as e:
                 print(str(e), file=sys.stderr)
                 sys.exit(1)
             speech_segments = normalize_speech_segments(
                 speech_segments_raw, max_end=video_duration,
+                merge_gap_seconds=args.vad_merge_gap, pad_seconds=args.vad_pad,
             )
             silence_intervals = speech_segments_to_silence_intervals(
                 speech_segments, total_duration=video_duration
@@ -1297,18 +5014,35 @@ def main():
                 "vad_threshold": args.vad_threshold,
                 "offset": args.offset,
                 "process_duration": args.process_duration,
+                "min_speech_ms": args.vad_min_speech_ms,
+                "min_silence_ms": args.vad_min_silence_ms,
+                "speech_pad_ms": args.vad_speech_pad_ms,
+                "merge_gap": args.vad_merge_gap,
+                "pad": args.vad_pad,
+                "energy_floor_db": args.vad_energy_floor,
             }
+            if args.vad_energy_floor is not None and vad_stats and not args.quiet:
+                print(format_energy_gate_stats(vad_stats))
         else:
-            # FFmpeg silencedetect detection
-            silencedetect_stderr = run_silencedetect(
-                args.input, args.threshold, args.duration,
-                offset=args.offset, process_duration=args.process_duration,
-            )
-            silence_intervals = parse_silencedetect_output(silencedetect_stderr)
+            probabilities = None
+            # Silence detection (FFmpeg silencedetect or the in-process energy backend)
+            try:
+                with metrics_stage("silence_detection"):
+                    silence_intervals = detect_silence_intervals(
+                        args.input, args.threshold, args.duration,
+                        offset=args.offset, process_duration=args.process_duration,
+                        total_duration=video_duration, show_progress=not args.quiet,
+                        backend=args.silence_backend,
+                        shards=args.silence_shards,
+                    )
+                    metrics_count("silence_audio_seconds", video_duration)
+            except RuntimeError as e:
+                print(str(e), file=sys.stderr)
+                sys.exit(1)
             speech_segments = silence_intervals_to_speech_segments(
                 silence_intervals, video_duration
             )
-            backend = "silencedetect"
+            backend = "silencedetect" if args.silence_backend == "ffmpeg" else "energy"
             params = {
                 "silence_threshold": args.threshold,
                 "silence_duration": args.duration,
@@ -1318,7 +5052,8 @@ def main():
 
         sidecar_path = write_vad_metadata(
             args.input, speech_segments, silence_intervals,
-            video_duration, backend, params
+            video_duration, backend, params, probabilities=probabilities,
+            sidecar_path=sidecar_path, sidecar_format=sidecar_format,
         )
         # Always print detect summary (even with --quiet — this IS the result)
         speech_total = sum(e - s for s, e in speech_segments)
@@ -1360,18 +5095,29 @@ def main():
 
             if args.vad:
                 # Silero VAD detection
+                vad_stats = {}
                 try:
-                    speech_segments_raw = detect_speech_segments_silero(
+                    speech_segments_raw, probabilities = detect_speech_segments_silero(
                         master_path,
                         vad_threshold=args.vad_threshold,
                         offset=args.offset,
                         process_duration=args.process_duration,
+                        workers=args.vad_workers,
+                        use_server=not args.no_vad_server,
+                        backend=args.vad_backend,
+                        min_speech_duration_ms=args.vad_min_speech_ms,
+                        min_silence_duration_ms=args.vad_min_silence_ms,
+                        speech_pad_ms=args.vad_speech_pad_ms,
+                        return_probs=True,
+                        energy_floor_db=args.vad_energy_floor,
+                        stats=vad_stats,
                     )
                 except RuntimeError as e:
                     print(str(e), file=sys.stderr)
                     sys.exit(1)
                 speech_segments = normalize_speech_segments(
                     speech_segments_raw, max_end=detect_duration,
+                    merge_gap_seconds=args.vad_merge_gap, pad_seconds=args.vad_pad,
                 )
                 silence_intervals_detected = speech_segments_to_silence_intervals(
                     speech_segments, total_duration=detect_duration
@@ -1381,18 +5127,35 @@ def main():
                     "vad_threshold": args.vad_threshold,
                     "offset": args.offset,
                     "process_duration": args.process_duration,
+                    "min_speech_ms": args.vad_min_speech_ms,
+                    "min_silence_ms": args.vad_min_silence_ms,
+                    "speech_pad_ms": args.vad_speech_pad_ms,
+                    "merge_gap": args.vad_merge_gap,
+                    "pad": args.vad_pad,
+                    "energy_floor_db": args.vad_energy_floor,
                 }
+                if args.vad_energy_floor is not None and vad_stats and not args.quiet:
+                    print(format_energy_gate_stats(vad_stats))
             else:
-                # FFmpeg silencedetect detection
-                silencedetect_stderr = run_silencedetect(
-                    master_path, args.threshold, args.duration,
-                    offset=args.offset, process_duration=args.process_duration,
-                )
-                silence_intervals_detected = parse_silencedetect_output(silencedetect_stderr)
+                probabilities = None
+                # Silence detection (FFmpeg silencedetect or the in-process energy backend)
+                try:
+                    with metrics_stage("silence_detection"):
+                        silence_intervals_detected = detect_silence_intervals(
+                            master_path, args.threshold, args.duration,
+                            offset=args.offset, process_duration=args.process_duration,
+                            total_duration=detect_duration, show_progress=not args.quiet,
+                            backend=args.silence_backend,
+                            shards=args.silence_shards,
+                        )
+                        metrics_count("silence_audio_seconds", detect_duration)
+                except RuntimeError as e:
+                    print(str(e), file=sys.stderr)
+                    sys.exit(1)
                 speech_segments = silence_intervals_to_speech_segments(
                     silence_intervals_detected, detect_duration
                 )
-                backend = "silencedetect"
+                backend = "silencedetect" if args.silence_backend == "ffmpeg" else "energy"
                 params = {
                     "silence_threshold": args.threshold,
                     "silence_duration": args.duration,
@@ -1402,7 +5165,8 @@ def main():
 
             sidecar_path = write_vad_metadata(
                 master_path, speech_segments, silence_intervals_detected,
-                detect_duration, backend, params
+                detect_duration, backend, params, probabilities=probabilities,
+                sidecar_format=args.sidecar_format,
             )
             speech_total = sum(e - s for s, e in speech_segments)
             speech_pct = (speech_total / detect_duration * 100) if detect_duration > 0 else 0
@@ -1418,7 +5182,17 @@ def main():
             sidecar_path = discover_sidecar(args.folder)
 
         # Load sidecar once (shared across all videos)
-        silence_intervals_master, analyzed_duration = load_vad_metadata(sidecar_path)
+        if args.retune:
+            _, silence_intervals_master, analyzed_duration, _ = retune_vad_metadata(
+                sidecar_path, args.vad_threshold,
+                min_speech_duration_ms=args.vad_min_speech_ms,
+                min_silence_duration_ms=args.vad_min_silence_ms,
+                speech_pad_ms=args.vad_speech_pad_ms,
+                merge_gap_seconds=args.vad_merge_gap,
+                pad_seconds=args.vad_pad,
+            )
+        else:
+            silence_intervals_master, analyzed_duration = load_vad_metadata(sidecar_path)
 
         # Discover videos
         videos = discover_videos(args.folder, args.extensions)
@@ -1440,7 +5214,9 @@ def main():
         show_progress = (args.parallel == 1)
         total = len(videos)
 
-        if args.parallel > 1:
+        if parallel_auto:
+            print(f"Processing {total} video(s) with --parallel auto (up to {args.parallel} at once)")
+        elif args.parallel > 1:
             print(f"Processing {total} video(s) with --parallel {args.parallel}")
 
         success_count = 0
@@ -1463,31 +5239,131 @@ def main():
                     fail_count += 1
                     failed_files.append(result["file"])
         else:
-            # Parallel mode
+            # Parallel mode: longest-first dispatch, each FFmpeg gets an equal share of the CPUs
+            import queue
+            import time
             from concurrent.futures import ThreadPoolExecutor, as_completed
+
+            costs = {}
+            durations = {}
+            for vp in videos:
+                costs[vp] = 0.0
+                durations[os.path.basename(vp)] = 0.0
+                output_exists = os.path.isfile(os.path.join(output_dir, os.path.basename(vp)))
+                if output_exists and not args.overwrite:
+                    continue
+                try:
+                    estimate = estimate_video_job_cost(vp, silence_intervals_master, analyzed_duration, args)
+                except (RuntimeError, OSError):
+                    continue  # process_single_video reports the failure
+                costs[vp] = estimate["cost"]
+                durations[os.path.basename(vp)] = estimate["duration"]
+            ordered = sorted(videos, key=lambda vp: costs[vp], reverse=True)
+            threads = max(1, available_cpu_count() // args.parallel)
+            cpu_sets = None
+            if args.cpu_affinity and parallel_auto:
+                print("[info] --cpu-affinity needs a fixed --parallel N; ignoring with --parallel auto.",
+                      file=sys.stderr)
+            elif args.cpu_affinity:
+                cpu_sets = partition_cpus(args.parallel) if cpu_pinning_method() else None
+                if cpu_sets is None:
+                    print("[info] --cpu-affinity is unavailable here (no OS support or fewer CPUs than jobs); ignoring.",
+                          file=sys.stderr)
+            pinning = ""
+            if cpu_sets:
+                pinning = ", pinned to disjoint CPU sets"
+                if cpu_pinning_method() == "setaffinity":
+                    pinning += " after spawn (taskset not found; threads started before pinning are not)"
+            slots = queue.Queue()
+            for slot in range(args.parallel):
+                slots.put(slot)
+            if parallel_auto:
+                print(f"Scheduler: longest-first, adaptive job count (1 to {args.parallel}), "
+                      f"FFmpeg threads split evenly across running jobs")
+            elif not args.quiet:
+                estimated = simulate_makespan([costs[vp] for vp in ordered], args.parallel)
+                naive = simulate_makespan([costs[vp] for vp in videos], args.parallel)
+                saving = (1 - estimated / naive) * 100 if naive > 0 else 0.0
+                print(f"Scheduler: longest-first, {threads} FFmpeg thread(s) per job"
+                      f"{pinning}; estimated makespan "
+                      f"{estimated:.0f} vs {naive:.0f} in filename order ({saving:.0f}% shorter, "
+                      f"1080p encode-seconds)")
+
+            elapsed = {}
+            # Jobs actually running at once (the target passed in as `running` may not be reached).
+            active_jobs = 0
+            peak_jobs = 0
+            active_lock = threading.Lock()
+
+            board = None if args.quiet else ParallelProgressBoard(durations)
+
+            def _run_job(vp, running=args.parallel, on_progress=None):
+                nonlocal active_jobs, peak_jobs
+                slot = slots.get()
+                with active_lock:
+                    active_jobs += 1
+                    peak_jobs = max(peak_jobs, active_jobs)
+                started = time.monotonic()
+                name = os.path.basename(vp)
+                callbacks = [on_progress] if on_progress else []
+                if board:
+                    board.start_job(name)
+                    callbacks.append(board.progress_callback(name))
+
+                def _on_progress(block):
+                    for callback in callbacks:
+                        callback(block)
+
+                result = {"status": "error", "file": name}
+                try:
+                    result = process_single_video(
+                        vp, output_dir, silence_intervals_master, analyzed_duration, args, png_path, False,
+                        threads=max(1, available_cpu_count() // running),
+                        cpu_set=cpu_sets[slot] if cpu_sets else None,
+                        on_progress=_on_progress if callbacks else None,
+                    )
+                    return result
+                finally:
+                    elapsed[vp] = time.monotonic() - started
+                    if board:
+                        board.finish_job(name, result["status"])
+                    with active_lock:
+                        active_jobs -= 1
+                    slots.put(slot)
+
             completed = 0
-            with ThreadPoolExecutor(max_workers=args.parallel) as executor:
-                futures = {
-                    executor.submit(
-                        process_single_video, vp, output_dir,
-                        silence_intervals_master, analyzed_duration,
-                        args, png_path, False,
-                    ): vp
-                    for vp in videos
-                }
-                for future in as_completed(futures):
-                    result = future.result()
-                    completed += 1
-                    if result["status"] == "success":
-                        success_count += 1
-                        print(f"  [{completed}/{total}] Completed: {result['file']}")
-                    elif result["status"] == "skipped":
-                        skip_count += 1
-                        print(f"  [{completed}/{total}] Skipped: {result['file']}")
-                    else:
-                        fail_count += 1
-                        failed_files.append(result["file"])
-                        print(f"  [{completed}/{total}] Failed: {result['file']} — {result.get('error', 'unknown')}")
+
+            def _report(result):
+                nonlocal completed, success_count, skip_count, fail_count
+                completed += 1
+                if result["status"] == "success":
+                    success_count += 1
+                    print(f"  [{completed}/{total}] Completed: {result['file']}")
+                elif result["status"] == "skipped":
+                    skip_count += 1
+                    print(f"  [{completed}/{total}] Skipped: {result['file']}")
+                else:
+                    fail_count += 1
+                    failed_files.append(result["file"])
+                    print(f"  [{completed}/{total}] Failed: {result['file']} — {result.get('error', 'unknown')}")
+
+            run_started = time.monotonic()
+            with board or contextlib.nullcontext():
+                if parallel_auto:
+                    for result in iter_adaptive_parallel(ordered, _run_job, args.parallel):
+                        _report(result)
+                else:
+                    with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+                        futures = {executor.submit(_run_job, vp): vp for vp in ordered}
+                        for future in as_completed(futures):
+                            _report(future.result())
+            makespan = time.monotonic() - run_started
+            if parallel_auto:
+                print(f"Makespan: {makespan:.1f}s with --parallel auto (peak {peak_jobs} job(s))")
+            else:
+                naive_makespan = simulate_makespan([elapsed.get(vp, 0.0) for vp in videos], args.parallel)
+                print(f"Makespan: {makespan:.1f}s longest-first; filename order with the same job times: "
+                      f"~{naive_makespan:.1f}s")
 
         # Print summary (always, even with --quiet)
         print(f"\nDone. {success_count}/{total} videos processed"
@@ -1524,14 +5400,30 @@ def main():
 
         if args.vad_json:
             # Load silence intervals from sidecar file (skip detection)
-            if not args.quiet:
-                print(f"Loading VAD metadata from {args.vad_json} (skipping detection)")
-            silence_intervals, analyzed_duration = load_vad_metadata(args.vad_json)
             actual_duration = get_video_duration(args.input)
             if args.offset:
                 actual_duration = max(0, actual_duration - args.offset)
             if args.process_duration:
                 actual_duration = min(actual_duration, args.process_duration)
+            if args.retune:
+                if not args.quiet:
+                    print(f"Retuning VAD from probabilities in {args.vad_json} "
+                          f"(threshold={args.vad_threshold}, skipping inference)")
+                _, silence_intervals, analyzed_duration, _ = retune_vad_metadata(
+                    args.vad_json, args.vad_threshold,
+                    min_speech_duration_ms=args.vad_min_speech_ms,
+                    min_silence_duration_ms=args.vad_min_silence_ms,
+                    speech_pad_ms=args.vad_speech_pad_ms,
+                    merge_gap_seconds=args.vad_merge_gap,
+                    pad_seconds=args.vad_pad,
+                )
+            else:
+                if not args.quiet:
+                    print(f"Loading VAD metadata from {args.vad_json} (skipping detection)")
+                # Only the intervals inside the processed range are read (windowed on .vad.bin).
+                silence_intervals, analyzed_duration = load_vad_metadata(
+                    args.vad_json, window=(0.0, actual_duration)
+                )
             duration_diff = abs(analyzed_duration - actual_duration)
             if duration_diff > 1.0:
                 print(f"Warning: Sidecar analyzed {analyzed_duration:.1f}s but video is "
@@ -1545,19 +5437,32 @@ def main():
         elif args.vad:
             if not args.quiet:
                 print(f"\nUsing VAD (Silero) threshold={args.vad_threshold}")
+            vad_stats = {}
             try:
                 speech_segments_raw = detect_speech_segments_silero(
                     args.input,
                     vad_threshold=args.vad_threshold,
                     offset=args.offset,
                     process_duration=args.process_duration,
+                    workers=args.vad_workers,
+                    use_server=not args.no_vad_server,
+                    backend=args.vad_backend,
+                    min_speech_duration_ms=args.vad_min_speech_ms,
+                    min_silence_duration_ms=args.vad_min_silence_ms,
+                    speech_pad_ms=args.vad_speech_pad_ms,
+                    energy_floor_db=args.vad_energy_floor,
+                    stats=vad_stats,
                 )
             except RuntimeError as e:
                 print(str(e), file=sys.stderr)
                 sys.exit(1)
+            if args.vad_energy_floor is not None and vad_stats and not args.quiet:
+                print(format_energy_gate_stats(vad_stats))
             speech_segments = normalize_speech_segments(
                 speech_segments_raw,
                 max_end=video_duration,
+                merge_gap_seconds=args.vad_merge_gap,
+                pad_seconds=args.vad_pad,
             )
             silence_intervals = speech_segments_to_silence_intervals(
                 speech_segments, total_duration=video_duration
@@ -1572,21 +5477,29 @@ def main():
                 for interval in silence_intervals:
                     print(interval)
         else:
-            # FFmpeg silencedetect
-            if not args.quiet:
-                print("\nRunning FFmpeg silencedetect...")
-            silencedetect_stderr = run_silencedetect(
-                args.input,
-                args.threshold,
-                args.duration,
-                offset=args.offset,
-                process_duration=args.process_duration,
-            )
+            # FFmpeg silencedetect, or the in-process energy detector with the same semantics
             if not args.quiet:
-                print("FFmpeg silencedetect output:")
-                print(silencedetect_stderr)
-
-            silence_intervals = parse_silencedetect_output(silencedetect_stderr)
+                if args.silence_backend == "energy":
+                    print(f"\nRunning energy silence detection (threshold={args.threshold}dB, d={args.duration}s)...")
+                else:
+                    print("\nRunning FFmpeg silencedetect...")
+            try:
+                with metrics_stage("silence_detection"):
+                    silence_intervals = detect_silence_intervals(
+                        args.input,
+                        args.threshold,
+                        args.duration,
+                        offset=args.offset,
+                        process_duration=args.process_duration,
+                        total_duration=video_duration,
+                        show_progress=not args.quiet,
+                        backend=args.silence_backend,
+                        shards=args.silence_shards,
+                    )
+                    metrics_count("silence_audio_seconds", video_duration)
+            except RuntimeError as e:
+                print(str(e), file=sys.stderr)
+                sys.exit(1)
             if not args.quiet:
                 print("Parsed silence intervals (start, end):")
                 for interval in silence_intervals:
@@ -1594,6 +5507,7 @@ def main():
 
         # Silence intervals and segments are relative to the processed region (start at 0).
         segments = calculate_segments(silence_intervals, video_duration)
+        metrics_count("input_seconds", video_duration)
         if not args.quiet:
             print("Segments (start, end, type):")
             for seg in segments:
@@ -1633,10 +5547,58 @@ def main():
                     f"out_dur={longest_silent['out_dur']:.2f}s"
                 )
 
+        if args.smart_render:
+            codec_name = get_video_codec(args.input)
+            if codec_name.lower() in SMART_RENDER_BSF:
+                if not args.quiet:
+                    print(f"Input video codec detected: {codec_name}")
+                run_smart_rendering(
+                    args.input,
+                    args.output,
+                    segments,
+                    codec_name,
+                    workers=args.smart_render_workers or (
+                        min(available_cpu_count(), PARALLEL_AUTO_GPU_CEILING) if args.gpu else available_cpu_count()
+                    ),
+                    indicator=args.indicator,
+                    use_gpu=args.gpu,
+                    offset=args.offset,
+                    png_path=png_path,
+                    use_gpu_decode=args.gpu_decode,
+                    timeline=args.timeline,
+                    ff_fps=args.ff_fps,
+                )
+                return
+            print(f"[info] --smart-render does not support codec '{codec_name}'; "
+                  f"re-encoding the whole timeline.", file=sys.stderr)
+
+        if args.chunks > 1:
+            codec_name = get_video_codec(args.input)
+            if not args.quiet:
+                print(f"Input video codec detected: {codec_name}")
+            run_chunked_processing(
+                args.input,
+                args.output,
+                segments,
+                codec_name,
+                args.chunks,
+                indicator=args.indicator,
+                use_gpu=args.gpu,
+                offset=args.offset,
+                png_path=png_path,
+                use_gpu_decode=args.gpu_decode,
+                timeline=args.timeline,
+                ff_fps=args.ff_fps,
+            )
+            return
+
         # Task 3.2: Build FFmpeg filtergraph
-        filtergraph = build_filtergraph(
+        filtergraph = build_render_filtergraph(
+            args.input,
             segments,
             args.indicator,
+            timeline=args.timeline,
+            ff_fps=args.ff_fps,
             use_gpu_decode=args.gpu_decode,
             png_input_index=1,
             png_path=png_path